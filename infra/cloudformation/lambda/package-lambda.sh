@@ -14,6 +14,13 @@ STACK_NAME="kelifax-lambda-stack-${ENVIRONMENT}"
 echo "📦 Packaging Lambda function for $ENVIRONMENT environment..."
 echo "📝 Using timestamped zip file: $ZIP_NAME"
 
+# Check cold-start import time against the budget before packaging
+echo "⏱ Checking cold-start import budget..."
+if ! python3 ../../tools/import_benchmark.py api -n 10 --top 0; then
+  echo "❌ Import time is over budget (see infra/tools/import-budget.json) - aborting"
+  exit 1
+fi
+
 # Create temporary directory
 TEMP_DIR=$(mktemp -d)
 echo "🗂 Created temporary directory: $TEMP_DIR"
@@ -0,0 +1,77 @@
+import re
+
+# ==== CACHE POLICY ====
+# Origin-response handler: CloudFront caches the response it gets back from
+# this function, so the Cache-Control set here applies to both the edge cache
+# (s-maxage) and browsers (max-age).
+
+ONE_YEAR = 31536000
+ONE_DAY = 86400
+ONE_HOUR = 3600
+
+NO_STORE = 'private, no-store, max-age=0'
+
+# Ordered (name, URI pattern, Cache-Control) rules; the first match wins.
+# URIs without a file extension (and *.html) are Astro pages.
+CACHE_RULES = [
+    # Admin pages and the Cognito callback must never be cached
+    ('admin', re.compile(r'^/(admin(/|$|\.html$)|callback(/|$))'), NO_STORE),
+    # Astro build output: file names contain a content hash
+    ('hashed-asset', re.compile(r'^/_astro/'), f'public, max-age={ONE_YEAR}, immutable'),
+    # Approved logos served from the resources bucket (/{env}/logos/approved/<file>)
+    ('approved-logo', re.compile(r'^/(dev|prod)/logos/approved/[^/]+$'),
+     f'public, max-age={ONE_DAY}, stale-while-revalidate={ONE_DAY * 7}'),
+    # Logos shipped in public/logos/ (not hashed, so not immutable)
+    ('public-logo', re.compile(r'^/logos/[^/]+\.png$'),
+     f'public, max-age={ONE_DAY}, stale-while-revalidate={ONE_DAY * 7}'),
+    ('html', re.compile(r'(^|/)[^/.]*$|\.html$'),
+     f'public, max-age=0, s-maxage=300, stale-while-revalidate={ONE_DAY}'),
+    # Remaining public/ files (favicon.svg, manifest.json, robots.txt, resource-loader.js)
+    ('static', re.compile(r'.'), f'public, max-age={ONE_HOUR}, stale-while-revalidate={ONE_DAY}'),
+]
+
+# Error responses keep whatever the origin sent (only admin is forced to no-store)
+CACHEABLE_STATUSES = {'200', '203', '204', '206', '301', '304'}
+
+# ============================================
+
+
+def match_cache_rule(uri):
+    """
+    Find the cache rule for a request URI
+
+    Returns:
+        tuple: (rule name, Cache-Control value)
+    """
+    for name, pattern, cache_control in CACHE_RULES:
+        if pattern.search(uri):
+            return name, cache_control
+    return None, None
+
+
+def lambda_handler(event, context):
+    """
+    Lambda@Edge origin-response function that sets Cache-Control from CACHE_RULES
+    """
+    cf = event['Records'][0]['cf']
+    request = cf['request']
+    response = cf['response']
+
+    rule, cache_control = match_cache_rule(request['uri'])
+    if rule is None:
+        return response
+    if rule != 'admin' and str(response.get('status')) not in CACHEABLE_STATUSES:
+        return response
+
+    headers = response.setdefault('headers', {})
+    headers['cache-control'] = [{'key': 'Cache-Control', 'value': cache_control}]
+    if rule == 'admin':
+        # Drop validators and Expires so nothing downstream treats the page as cacheable
+        for name in ('expires', 'etag', 'last-modified'):
+            headers.pop(name, None)
+    else:
+        headers.pop('expires', None)
+        headers.pop('pragma', None)
+
+    print(f"Cache rule {rule} for {request['uri']} (status {response.get('status')})")
+    return response
@@ -1,7 +1,9 @@
 import json
-import urllib.request
+import http.client
+import ssl
+import threading
+import time
 import urllib.parse
-import urllib.error
 from urllib.parse import parse_qs
 
 # ==== CONFIGURATION (from environment variables) ====
@@ -15,8 +17,77 @@ cookie_name = f'kelifax-{env}-rNA8Zxg8YINdQIhHBQvyVYDdTS'
 # Add API domain configuration for cross-subdomain cookie sharing
 api_domain = '.kelifax.com'
 
+# Token endpoint timeout (seconds, per connect/read)
+token_timeout = 5
+
+# Pooled token-endpoint connections idle longer than this (seconds) are
+# reopened instead of reused; the server has likely closed them by then
+token_connection_max_idle = 4
+
 # ============================================
 
+# Keep-alive connection to the Cognito token endpoint, reused across warm invocations.
+# The SSL context (loading the CA bundle takes tens of ms) is only created on
+# the first token exchange, not at import on every viewer-request container.
+_ssl_context = None
+_token_connection = None
+_token_connection_lock = threading.Lock()
+
+# Errors meaning a pooled connection had been closed by the server (safe to
+# retry when no response came back). RemoteDisconnected is a ConnectionResetError;
+# a closed TLS connection raises SSLEOFError or SSLZeroReturnError instead.
+_STALE_CONNECTION_ERRORS = (
+    ConnectionResetError, BrokenPipeError, ssl.SSLEOFError, ssl.SSLZeroReturnError
+)
+
+
+class TimedHTTPSConnection(http.client.HTTPSConnection):
+    """
+    HTTPSConnection that records how long the TCP connect and TLS handshake took
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connect_ms = 0.0
+        self.tls_ms = 0.0
+        self.last_used = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        http.client.HTTPConnection.connect(self)
+        connected = time.perf_counter()
+        self.sock = self._context.wrap_socket(self.sock, server_hostname=self._tunnel_host or self.host)
+        self.connect_ms = (connected - started) * 1000
+        self.tls_ms = (time.perf_counter() - connected) * 1000
+
+
+def get_token_connection(hostname):
+    """
+    Get the pooled connection to the token endpoint (created on first use)
+    """
+    global _token_connection, _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    if _token_connection is None or _token_connection.host_key != hostname:
+        if _token_connection is not None:
+            _token_connection.close()
+        _token_connection = TimedHTTPSConnection(hostname, timeout=token_timeout, context=_ssl_context)
+        _token_connection.host_key = hostname
+    elif _token_connection.sock is not None and time.monotonic() - _token_connection.last_used > token_connection_max_idle:
+        _token_connection.close()
+    return _token_connection
+
+
+def is_stale_connection_error(err):
+    """
+    True if err means the server had already closed the pooled connection
+    (including a status line that ended before its first byte)
+    """
+    if isinstance(err, _STALE_CONNECTION_ERRORS):
+        return True
+    # http.client reports an empty status line as "''"
+    return isinstance(err, http.client.BadStatusLine) and err.line in ('', "''")
+
 def lambda_handler(event, context):
     """
     Lambda@Edge function for Cognito authentication
@@ -143,44 +214,63 @@ def lambda_handler(event, context):
 
 def exchange_code_for_tokens(post_data, hostname):
     """
-    Exchange authorization code for tokens using urllib (no external dependencies)
+    Exchange authorization code for tokens over a pooled keep-alive HTTPS connection
+    (http.client only, no external dependencies)
+    
+    The connection (and its TLS session) is kept between warm invocations, and
+    reopened after token_connection_max_idle seconds without use. If a reused
+    connection turns out to have been closed by the server before any response
+    arrived, the request is retried once on a fresh one. Timeouts and
+    errors after the response started are never retried: the authorization
+    code is single-use and the viewer request has a 5 s limit.
     """
-    try:
-        # Create request
-        req = urllib.request.Request(
-            f'https://{hostname}/oauth2/token',
-            data=post_data.encode('utf-8'),
-            headers={
-                'Content-Type': 'application/x-www-form-urlencoded',
-                'Content-Length': len(post_data.encode('utf-8'))
-            },
-            method='POST'
-        )
-        
-        print(f'Token exchange response status: Making request to {hostname}')
-        # print(f'Token exchange request options: {post_data}')  # Debug: Request details
+    body = post_data.encode('utf-8')
+    request_headers = {
+        'Content-Type': 'application/x-www-form-urlencoded',
+        'Content-Length': str(len(body)),
+        'Connection': 'keep-alive'
+    }
 
-        # Make the request
-        with urllib.request.urlopen(req, timeout=5) as response:
-            print(f'Token exchange response status: {response.getcode()}')
-            # print(f'Token exchange response headers: {dict(response.headers)}')  # Debug: Response headers
-            
-            data = response.read().decode('utf-8')
-            # print(f'Token exchange raw response: {data}')  # Debug: Raw response
-            
+    with _token_connection_lock:
+        for attempt in (1, 2):
+            connection = get_token_connection(hostname)
+            reused = connection.sock is not None
+            connection.connect_ms = connection.tls_ms = 0.0
+
+            print(f'Token exchange: making request to {hostname} (reused connection: {reused})')
+            started = time.perf_counter()
+            response = None
             try:
-                parsed_data = json.loads(data)
-                # print(f'Token exchange parsed response: {json.dumps(parsed_data, default=str)}')  # Debug: Parsed response
-                return parsed_data
-            except json.JSONDecodeError as err:
-                print(f'Failed to parse token response: {err}')
+                connection.request('POST', '/oauth2/token', body=body, headers=request_headers)
+                response = connection.getresponse()
+                data = response.read().decode('utf-8')
+            except (http.client.HTTPException, OSError) as err:
+                connection.close()
+                stale_connection = is_stale_connection_error(err) and response is None
+                if reused and attempt == 1 and stale_connection:
+                    print(f'Pooled connection was closed ({err!r}) - reconnecting')
+                    continue
+                print(f'Token exchange failed: {err!r}')
                 return None
-                
-    except urllib.error.HTTPError as err:
-        print(f'Token exchange request error: {err}')
+
+            total_ms = (time.perf_counter() - started) * 1000
+            print(f'Token exchange timing: connect={connection.connect_ms:.1f}ms tls={connection.tls_ms:.1f}ms '
+                  f'response={total_ms - connection.connect_ms - connection.tls_ms:.1f}ms total={total_ms:.1f}ms')
+
+            if response.will_close:
+                connection.close()
+            connection.last_used = time.monotonic()
+            break
+
+    print(f'Token exchange response status: {response.status}')
+    if response.status != 200:
+        print(f'Token exchange request error: HTTP {response.status} {response.reason}')
         return None
-    except Exception as err:
-        print(f'Token exchange failed: {err}')
+
+    try:
+        return json.loads(data)
+    except json.JSONDecodeError as err:
+        print(f'Failed to parse token response: {err}')
         return None
 
 # --- Helper: redirect user to Cognito login ---
@@ -60,6 +60,13 @@ if [ ! -f "${LAMBDA_DIR}/lambda_function.py" ]; then
     exit 1
 fi
 
+# Check cold-start import time against the budget before packaging
+print_status "Checking cold-start import budget"
+if ! python3 ../../tools/import_benchmark.py cognito-edge -n 10 --top 0; then
+    print_error "Import time is over budget (see infra/tools/import-budget.json)"
+    exit 1
+fi
+
 # Create temporary directory for packaging
 TEMP_DIR=$(mktemp -d)
 PACKAGE_DIR="${TEMP_DIR}/package"
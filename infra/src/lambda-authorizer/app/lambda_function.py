@@ -4,50 +4,200 @@ import urllib.request
 import urllib.parse
 import boto3
 import os
+import sys
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from botocore.config import Config
 from urllib.parse import parse_qs
 
 # ==== CONFIGURATION ====
 region = 'us-east-1'
 
+# Cognito settings almost never change: keep them for the life of the container,
+# refreshing in the background once they are older than CONFIG_TTL_SECONDS
+CONFIG_TTL_SECONDS = int(os.environ.get('CONFIG_CACHE_TTL', '900'))
+
+# Parameter name suffix under /kelifax/{env}/ -> config key
+COGNITO_PARAMETERS = {
+    'cognito-user-pool-id': 'cognito_user_pool_id',
+    'client_id': 'client_id',
+    'cognito_domain': 'cognito_domain'
+}
+
+# Verify ID token signatures against the user pool's JWKS (requires PyJWT[crypto])
+VERIFY_JWT_SIGNATURE = os.environ.get('VERIFY_JWT_SIGNATURE', 'true').lower() == 'true'
+
+# Parsed signing keys are reused for JWKS_CACHE_TTL seconds; an unknown kid
+# (key rotation) triggers an early refresh at most every JWKS_MIN_REFRESH_SECONDS
+JWKS_CACHE_TTL_SECONDS = int(os.environ.get('JWKS_CACHE_TTL', '3600'))
+JWKS_MIN_REFRESH_SECONDS = int(os.environ.get('JWKS_MIN_REFRESH_INTERVAL', '60'))
+JWKS_FETCH_TIMEOUT_SECONDS = 2
+
+# Verified tokens -> policy context, reused until the token's exp (LRU, bounded by count and size)
+TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get('TOKEN_CACHE_MAX_ENTRIES', '512'))
+TOKEN_CACHE_MAX_BYTES = int(os.environ.get('TOKEN_CACHE_MAX_BYTES', str(512 * 1024)))
+
+# The authorizer has a 5 s timeout, so fail fast instead of retrying for long
+SSM_CLIENT_CONFIG = Config(connect_timeout=1, read_timeout=2, retries={'max_attempts': 2, 'mode': 'standard'})
+
+_ssm_client = None
+_config_cache = {'config': None, 'loaded_at': 0.0}
+_config_lock = threading.Lock()
+_config_refreshing = False
+
+# kid -> RSA public key, already parsed from the JWK
+_jwks_cache = {'url': None, 'keys': {}, 'loaded_at': 0.0, 'last_fetch': 0.0}
+_jwks_lock = threading.Lock()
+
+# sha256(config + token) -> (exp, principal_id, context, approximate size in bytes)
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+_token_cache_stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'entries': 0, 'bytes': 0}
+
+
+def get_ssm_client():
+    """SSM client created once per container"""
+    global _ssm_client
+    if _ssm_client is None:
+        _ssm_client = boto3.client('ssm', region_name=region, config=SSM_CLIENT_CONFIG)
+    return _ssm_client
+
+
+def get_environment():
+    """Deployment environment (dev or prod)"""
+    environment = os.environ.get('ENVIRONMENT', 'dev')
+    if environment not in ['dev', 'prod']:
+        environment = 'dev'  # Default to dev
+    return environment
+
+
+def load_cognito_config():
+    """
+    Load Cognito configuration from Parameter Store with one GetParameters call
+    """
+    environment = get_environment()
+    print(f'Loading Cognito configuration for environment: {environment}')
+
+    names = {f'/kelifax/{environment}/{suffix}': key for suffix, key in COGNITO_PARAMETERS.items()}
+    response = get_ssm_client().get_parameters(Names=list(names))
+
+    if response.get('InvalidParameters'):
+        raise Exception(f"Missing parameters: {', '.join(response['InvalidParameters'])}")
+
+    config = {names[parameter['Name']]: parameter['Value'] for parameter in response['Parameters']}
+    config['environment'] = environment
+    return config
+
+
+def _refresh_cognito_config():
+    global _config_refreshing
+    try:
+        config = load_cognito_config()
+        with _config_lock:
+            _config_cache['config'] = config
+            _config_cache['loaded_at'] = time.monotonic()
+    except Exception as e:
+        # Keep serving the cached config; the next stale read retries
+        print(f'Background Cognito config refresh failed: {e}')
+    finally:
+        _config_refreshing = False
+
+
 def get_cognito_config():
     """
     Get Cognito configuration from Parameter Store based on environment
+    
+    Cached per container. Once older than CONFIG_TTL_SECONDS the cached value
+    is still returned while a background thread reloads it, so only the first
+    invocation of a container waits for SSM.
     """
-    try:
-        # Determine environment from environment variable or function name
-        environment = os.environ.get('ENVIRONMENT', 'dev')
-        if environment not in ['dev', 'prod']:
-            environment = 'dev'  # Default to dev
-        
-        print(f'Loading Cognito configuration for environment: {environment}')
-        
-        ssm = boto3.client('ssm', region_name=region)
-        
-        # Get parameters from Parameter Store
-        cognito_user_pool_id = ssm.get_parameter(
-            Name=f'/kelifax/{environment}/cognito-user-pool-id'
-        )['Parameter']['Value']
-        
-        client_id = ssm.get_parameter(
-            Name=f'/kelifax/{environment}/client_id'
-        )['Parameter']['Value']
-        
-        cognito_domain = ssm.get_parameter(
-            Name=f'/kelifax/{environment}/cognito_domain'
-        )['Parameter']['Value']
+    global _config_refreshing
+    config = _config_cache['config']
+    if config is not None:
+        if time.monotonic() - _config_cache['loaded_at'] >= CONFIG_TTL_SECONDS:
+            with _config_lock:
+                start_refresh = not _config_refreshing
+                _config_refreshing = True
+            if start_refresh:
+                threading.Thread(target=_refresh_cognito_config, name='cognito-config-refresh', daemon=True).start()
+        return config
 
-        
-        return {
-            'cognito_user_pool_id': cognito_user_pool_id,
-            'client_id': client_id,
-            'cognito_domain': cognito_domain,
-            'environment': environment
-        }
-        
+    try:
+        config = load_cognito_config()
     except Exception as e:
         print(f'Failed to load Cognito configuration from Parameter Store: {e}')
         raise Exception('Configuration error')
 
+    with _config_lock:
+        _config_cache['config'] = config
+        _config_cache['loaded_at'] = time.monotonic()
+    return config
+
+def token_cache_key(id_token, cognito_user_pool_id, client_id):
+    """Cache key for a token; includes the config so a changed pool/client never reuses old results"""
+    return hashlib.sha256(f'{cognito_user_pool_id}|{client_id}|{id_token}'.encode('utf-8')).digest()
+
+
+def _token_entry_size(key, principal_id, context):
+    """Approximate memory held by one cache entry"""
+    size = sys.getsizeof(key) + sys.getsizeof(principal_id) + sys.getsizeof(context)
+    for name, value in context.items():
+        size += sys.getsizeof(name) + sys.getsizeof(value)
+    return size + 128  # tuple, float and OrderedDict link overhead
+
+
+def get_cached_authorization(key):
+    """
+    Look up a previously verified token
+    
+    Returns:
+        tuple: (principal_id, context) or None if not cached or expired
+    """
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is None:
+            _token_cache_stats['misses'] += 1
+            return None
+        if entry[0] <= time.time():
+            del _token_cache[key]
+            _token_cache_stats['expired'] += 1
+            _token_cache_stats['misses'] += 1
+            _token_cache_stats['entries'] -= 1
+            _token_cache_stats['bytes'] -= entry[3]
+            return None
+        _token_cache.move_to_end(key)
+        _token_cache_stats['hits'] += 1
+        return entry[1], entry[2]
+
+
+def cache_authorization(key, exp, principal_id, context):
+    """Remember a verified token's policy context until exp, evicting least recently used entries"""
+    if not isinstance(exp, (int, float)) or exp <= time.time():
+        return
+    size = _token_entry_size(key, principal_id, context)
+    with _token_cache_lock:
+        previous = _token_cache.pop(key, None)
+        if previous is not None:
+            _token_cache_stats['entries'] -= 1
+            _token_cache_stats['bytes'] -= previous[3]
+        _token_cache[key] = (exp, principal_id, context, size)
+        _token_cache_stats['entries'] += 1
+        _token_cache_stats['bytes'] += size
+        while _token_cache and (len(_token_cache) > TOKEN_CACHE_MAX_ENTRIES
+                                or _token_cache_stats['bytes'] > TOKEN_CACHE_MAX_BYTES):
+            _, evicted = _token_cache.popitem(last=False)
+            _token_cache_stats['evictions'] += 1
+            _token_cache_stats['entries'] -= 1
+            _token_cache_stats['bytes'] -= evicted[3]
+
+
+def get_token_cache_stats():
+    """Token cache counters for this container (hits, misses, expired, evictions, entries, bytes)"""
+    with _token_cache_lock:
+        return dict(_token_cache_stats)
+
 def lambda_handler(event, context):
     """
     API Gateway Lambda Authorizer that validates Cognito tokens from cookies
@@ -108,11 +258,22 @@ def lambda_handler(event, context):
             policy['context'] = {**default_context, 'authError': 'No token found'}
             return policy
         
+        # Same token already verified by this container: skip decode and checks
+        cache_key = token_cache_key(id_token, cognito_user_pool_id, client_id)
+        cached = get_cached_authorization(cache_key)
+        if cached:
+            print(f'Token cache hit - allowing access ({get_token_cache_stats()})')
+            policy = generate_policy(cached[0], 'Allow', event['methodArn'])
+            policy['context'] = dict(cached[1])
+            return policy
+        
         # Validate the ID token
         try:
-            # For simplicity, we'll do basic JWT decode without signature verification
-            # In production, you might want to verify the JWT signature against Cognito's public keys
-            decoded_token = jwt.decode(id_token, options={"verify_signature": False})
+            if VERIFY_JWT_SIGNATURE:
+                # Signature, aud, iss and exp checked against Cognito's public keys
+                decoded_token = verify_jwt_signature(id_token, cognito_user_pool_id, client_id)
+            else:
+                decoded_token = jwt.decode(id_token, options={"verify_signature": False})
             
             # Basic token validation
             token_use = decoded_token.get('token_use')
@@ -164,9 +325,22 @@ def lambda_handler(event, context):
                 'authError': ''
             }
             
-            print('Authorization successful - allowing access')
+            cache_authorization(cache_key, exp, user_id, policy['context'])
+            print(f'Authorization successful - allowing access (token cache: {get_token_cache_stats()})')
             return policy
             
+        except (jwt.ExpiredSignatureError, jwt.InvalidAudienceError, jwt.InvalidIssuerError) as e:
+            print(f'Invalid token: {e}')
+            if isinstance(e, jwt.ExpiredSignatureError):
+                auth_error = 'Token expired'
+            elif isinstance(e, jwt.InvalidAudienceError):
+                auth_error = 'Invalid token audience'
+            else:
+                auth_error = 'Invalid token issuer'
+            # ALWAYS ALLOW - let main Lambda handle invalid tokens with proper CORS
+            policy = generate_policy('unauthenticated', 'Allow', event['methodArn'])
+            policy['context'] = {**default_context, 'authError': auth_error}
+            return policy
         except jwt.InvalidTokenError as e:
             print(f'Invalid token: {e}')
             # ALWAYS ALLOW - let main Lambda handle invalid tokens with proper CORS
@@ -223,44 +397,101 @@ def generate_policy(principal_id, effect, resource):
     print(f'Generated policy: Effect={effect}, Resource={api_gateway_arn}')
     return policy
 
+def get_jwks_url(cognito_user_pool_id):
+    """JWKS URL of the user pool (JWKS_URL overrides it, e.g. for a local key server)"""
+    return os.environ.get('JWKS_URL') or (
+        f'https://cognito-idp.{region}.amazonaws.com/{cognito_user_pool_id}/.well-known/jwks.json'
+    )
+
+
+def fetch_jwks(jwks_url):
+    """
+    Download a JWKS and parse its RSA keys
+    
+    Returns:
+        dict: kid -> public key object usable with jwt.decode
+    """
+    with urllib.request.urlopen(jwks_url, timeout=JWKS_FETCH_TIMEOUT_SECONDS) as response:
+        jwks = json.loads(response.read().decode('utf-8'))
+
+    keys = {}
+    for jwk in jwks.get('keys', []):
+        if jwk.get('kty') != 'RSA' or not jwk.get('kid'):
+            continue
+        try:
+            keys[jwk['kid']] = jwt.algorithms.RSAAlgorithm.from_jwk(jwk)
+        except Exception as e:
+            print(f"Skipping unusable JWK {jwk.get('kid')}: {e}")
+    return keys
+
+
+def get_signing_key(kid, jwks_url):
+    """
+    Get the parsed public key for a token's kid
+    
+    Keys are cached per container. The JWKS is downloaded again when the
+    cache is older than JWKS_CACHE_TTL_SECONDS, or when the kid is unknown
+    (key rotation), but never more often than JWKS_MIN_REFRESH_SECONDS so
+    tokens with made-up kids can't make every call fetch the JWKS.
+    
+    Returns:
+        Public key, or None if the kid is not in the JWKS
+    """
+    now = time.monotonic()
+    cache = _jwks_cache
+    same_url = cache['url'] == jwks_url
+    key = cache['keys'].get(kid) if same_url else None
+    fresh = same_url and now - cache['loaded_at'] < JWKS_CACHE_TTL_SECONDS
+
+    if key is not None and fresh:
+        return key
+    if same_url and now - cache['last_fetch'] < JWKS_MIN_REFRESH_SECONDS:
+        # Fetched moment ago: use what we have rather than hammer the endpoint
+        return key
+
+    with _jwks_lock:
+        # Another thread may have refreshed while we waited
+        if cache['url'] == jwks_url and cache['last_fetch'] > now:
+            return cache['keys'].get(kid)
+
+        cache['last_fetch'] = time.monotonic()
+        try:
+            keys = fetch_jwks(jwks_url)
+        except Exception as e:
+            # Keep verifying with the keys we have if the endpoint is unreachable
+            print(f'Failed to fetch JWKS from {jwks_url}: {e}')
+            return key
+
+        cache.update(url=jwks_url, keys=keys, loaded_at=cache['last_fetch'])
+        print(f'Loaded {len(keys)} signing key(s) from JWKS')
+        return keys.get(kid)
+
+
 def verify_jwt_signature(token, cognito_user_pool_id, client_id):
     """
-    Optional: Verify JWT signature against Cognito's public keys
-    Uncomment and use this for production environments
+    Verify an ID token's RS256 signature, audience, issuer and expiry
+    
+    The signing keys come from the cached JWKS, so a warm container only
+    spends local CPU on verification.
+    
+    Returns:
+        dict: Decoded token claims
+    
+    Raises:
+        jwt.InvalidTokenError: Token is invalid (bad signature, unknown key, expired, wrong audience/issuer)
     """
-    try:
-        # Construct JWKS URL
-        jwks_url = f'https://cognito-idp.{region}.amazonaws.com/{cognito_user_pool_id}/.well-known/jwks.json'
-        
-        # Fetch JWKS from Cognito
-        with urllib.request.urlopen(jwks_url) as response:
-            jwks = json.loads(response.read().decode('utf-8'))
-        
-        # Get token header to find the key ID
-        unverified_header = jwt.get_unverified_header(token)
-        kid = unverified_header.get('kid')
-        
-        # Find the matching key
-        key = None
-        for jwk in jwks['keys']:
-            if jwk['kid'] == kid:
-                key = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(jwk))
-                break
-        
-        if not key:
-            raise Exception('Unable to find matching key')
-        
-        # Verify and decode token
-        decoded_token = jwt.decode(
-            token,
-            key,
-            algorithms=['RS256'],
-            audience=client_id,
-            issuer=f'https://cognito-idp.{region}.amazonaws.com/{cognito_user_pool_id}'
-        )
-        
-        return decoded_token
-        
-    except Exception as e:
-        print(f'JWT signature verification failed: {e}')
-        raise
+    kid = jwt.get_unverified_header(token).get('kid')
+    if not kid:
+        raise jwt.InvalidTokenError('Token header has no kid')
+
+    key = get_signing_key(kid, get_jwks_url(cognito_user_pool_id))
+    if key is None:
+        raise jwt.InvalidTokenError(f'Unable to find matching key for kid {kid}')
+
+    return jwt.decode(
+        token,
+        key,
+        algorithms=['RS256'],
+        audience=client_id,
+        issuer=f'https://cognito-idp.{region}.amazonaws.com/{cognito_user_pool_id}'
+    )
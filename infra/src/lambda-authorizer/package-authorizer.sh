@@ -59,6 +59,13 @@ if [ ! -f "${LAMBDA_DIR}/lambda_function.py" ]; then
     exit 1
 fi
 
+# Check cold-start import time against the budget before packaging
+print_status "Checking cold-start import budget"
+if ! python3 ../../tools/import_benchmark.py authorizer -n 10 --top 0; then
+    print_error "Import time is over budget (see infra/tools/import-budget.json)"
+    exit 1
+fi
+
 # Create temporary directory for packaging
 TEMP_DIR=$(mktemp -d)
 PACKAGE_DIR="${TEMP_DIR}/package"
@@ -74,13 +81,17 @@ print_status "Copied lambda function to package directory"
 if [ -f "${REQUIREMENTS_FILE}" ] && [ -s "${REQUIREMENTS_FILE}" ]; then
     print_status "Installing dependencies from ${REQUIREMENTS_FILE}"
     
+    # cryptography (PyJWT[crypto]) ships compiled code, so fetch wheels built for
+    # the Lambda runtime (Python 3.12, x86_64 Linux) rather than for this machine
+    PIP_PLATFORM_FLAGS="--platform manylinux2014_x86_64 --implementation cp --python-version 3.12 --only-binary=:all:"
+
     # Try different pip commands in order of preference
     if command -v pip3 &> /dev/null; then
-        pip3 install -r "${REQUIREMENTS_FILE}" -t "${PACKAGE_DIR}/" --quiet
+        pip3 install -r "${REQUIREMENTS_FILE}" -t "${PACKAGE_DIR}/" ${PIP_PLATFORM_FLAGS} --quiet
     elif command -v python3 &> /dev/null; then
-        python3 -m pip install -r "${REQUIREMENTS_FILE}" -t "${PACKAGE_DIR}/" --quiet
+        python3 -m pip install -r "${REQUIREMENTS_FILE}" -t "${PACKAGE_DIR}/" ${PIP_PLATFORM_FLAGS} --quiet
     elif command -v pip &> /dev/null; then
-        pip install -r "${REQUIREMENTS_FILE}" -t "${PACKAGE_DIR}/" --quiet
+        pip install -r "${REQUIREMENTS_FILE}" -t "${PACKAGE_DIR}/" ${PIP_PLATFORM_FLAGS} --quiet
     else
         print_error "No pip command found. Please install pip or python3-pip"
         exit 1
@@ -90,7 +101,7 @@ if [ -f "${REQUIREMENTS_FILE}" ] && [ -s "${REQUIREMENTS_FILE}" ]; then
     
     # Show what was installed
     print_status "Installed packages:"
-    ls -la "${PACKAGE_DIR}" | grep -E "(PyJWT|jwt)" || echo "  PyJWT library and dependencies"
+    ls -la "${PACKAGE_DIR}" | grep -E "(PyJWT|jwt|cryptography)" || echo "  PyJWT library and dependencies"
 else
     print_warning "No requirements.txt found or file is empty. Skipping dependency installation."
 fi
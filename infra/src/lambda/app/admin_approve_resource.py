@@ -1,8 +1,11 @@
 import json
-import boto3
-import os
 from datetime import datetime
-from app.utils import get_parameter
+from app.aws_clients import get_client
+from app.catalog_snapshot import rebuild_catalog_snapshot
+from app.listing_cache import bump_catalog_version
+from app.search_index import update_search_index
+from app.logo_store import move_logo
+from app.resource_model import Resource
 
 def handle_approve_resource(event, headers, table_name):
     """Handle resource approval - update status to approved and move logo"""
@@ -33,7 +36,7 @@ def handle_approve_resource(event, headers, table_name):
     # Generate resource slug for validation (second authentication)
     validated_resource_slug = generate_resource_slug(resource_slug)
     
-    dynamodb = boto3.client('dynamodb')
+    dynamodb = get_client('dynamodb')
     
     try:
         # Get existing resource
@@ -85,7 +88,15 @@ def handle_approve_resource(event, headers, table_name):
         logo_filename = item.get('logoImage', {}).get('S', '')
         
         if logo_filename:
-            logo_moved = move_logo_to_approved(logo_filename)
+            logo_moved = move_logo(logo_filename, 'pending', 'approved')
+        
+        # Add the resource to the public catalog snapshot
+        approved_resource = Resource.from_wire(item)
+        approved_resource.status = 'approved'
+        catalog_updated = rebuild_catalog_snapshot(table_name, resource_slug, approved_resource)
+        search_index_updated = update_search_index(table_name, resource_slug, approved_resource)
+        # Invalidate the listing pages cached by every container
+        bump_catalog_version()
         
         return {
             'statusCode': 200,
@@ -97,7 +108,9 @@ def handle_approve_resource(event, headers, table_name):
                     'resourceSlug': resource_slug,
                     'resourceStatus': 'approved',
                     'approvedAt': approval_timestamp,
-                    'logoMoved': logo_moved
+                    'logoMoved': logo_moved,
+                    'catalogUpdated': catalog_updated,
+                    'searchIndexUpdated': search_index_updated
                 }
             })
         }
@@ -121,95 +134,3 @@ def generate_resource_slug(resource_name):
     slug = resource_name.lower()
     slug = re.sub(r'[\s_]+', '-', slug)  # Replace spaces and underscores with hyphens
     return slug
-
-
-def get_bucket_config():
-    """
-    Get S3 bucket configuration from parameter store based on environment
-    
-    Returns:
-        tuple: (bucket_name, prefix) or (None, None) if error
-        
-    Example return values:
-        - Dev: ('kelifax-resources', 'dev/')  
-        - Prod: ('kelifax-resources', 'prod/')
-    """
-    try:
-        # Get environment from OS environment variable
-        environment = os.environ.get('ENVIRONMENT', 'dev').lower()
-        
-        # Determine parameter name based on environment
-        if environment == 'prod':
-            parameter_name = '/kelifax/prod/bucketResources'
-        else:
-            parameter_name = '/kelifax/dev/bucketResources'
-        
-        # Get bucket URL from parameter store
-        bucket_url = get_parameter(parameter_name)
-        
-        if not bucket_url:
-            print(f"No bucket URL found for parameter {parameter_name}")
-            return None, None
-            
-        # Parse S3 URL: s3://kelifax-resources/dev/ -> bucket_name='kelifax-resources', prefix='dev/'
-        if bucket_url.startswith('s3://'):
-            parts = bucket_url[5:].split('/', 1)  # Remove 's3://' and split
-            bucket_name = parts[0]
-            prefix = parts[1] if len(parts) > 1 else ''
-            return bucket_name, prefix
-        else:
-            print(f"Invalid S3 URL format: {bucket_url}")
-            return None, None
-            
-    except Exception as e:
-        print(f"Error getting bucket configuration: {e}")
-        return None, None
-
-
-def move_logo_to_approved(logo_filename):
-    """
-    Move logo file from logos/pending/ to logos/approved/
-    
-    Args:
-        logo_filename (str): The logo filename (e.g., "Amazing_Dev_Tool.png")
-        
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    try:
-        bucket_name, prefix = get_bucket_config()
-        
-        if not bucket_name:
-            print("Could not get bucket configuration")
-            return False
-            
-        s3_client = boto3.client('s3')
-        
-        # Construct source and destination keys
-        source_key = f"{prefix}logos/pending/{logo_filename}"
-        dest_key = f"{prefix}logos/approved/{logo_filename}"
-        
-        # Check if source file exists
-        try:
-            s3_client.head_object(Bucket=bucket_name, Key=source_key)
-        except s3_client.exceptions.NoSuchKey:
-            print(f"Source logo file not found: {source_key}")
-            return False
-        
-        # Copy file to approved location
-        copy_source = {'Bucket': bucket_name, 'Key': source_key}
-        s3_client.copy_object(
-            CopySource=copy_source,
-            Bucket=bucket_name,
-            Key=dest_key
-        )
-        
-        # Delete original file from pending location
-        s3_client.delete_object(Bucket=bucket_name, Key=source_key)
-        
-        print(f"Successfully moved logo from {source_key} to {dest_key}")
-        return True
-        
-    except Exception as e:
-        print(f"Error moving logo file {logo_filename}: {e}")
-        return False
\ No newline at end of file
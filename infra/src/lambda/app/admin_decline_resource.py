@@ -1,8 +1,7 @@
 import json
-import boto3
-import os
 from datetime import datetime
-from app.utils import get_parameter
+from app.aws_clients import get_client
+from app.logo_store import delete_logo
 
 def handle_decline_resource(event, headers, table_name):
     """Handle resource decline - update status to rejected and remove logo"""
@@ -36,7 +35,7 @@ def handle_decline_resource(event, headers, table_name):
     # Generate resource slug for validation (second authentication)
     validated_resource_slug = generate_resource_slug(resource_slug)
     
-    dynamodb = boto3.client('dynamodb')
+    dynamodb = get_client('dynamodb')
     
     try:
         # Get existing resource
@@ -77,7 +76,7 @@ def handle_decline_resource(event, headers, table_name):
         logo_filename = item.get('logoImage', {}).get('S', '')
         
         if logo_filename:
-            logo_removed = remove_pending_logo(logo_filename)
+            logo_removed = delete_logo(logo_filename, 'pending')
         
         # Update DynamoDB item to rejected status
         update_expression = 'SET resourceStatus = :status, rejectedAt = :rejected_at, rejectionReason = :reason'
@@ -134,86 +133,3 @@ def generate_resource_slug(resource_name):
     slug = resource_name.lower()
     slug = re.sub(r'[\s_]+', '-', slug)  # Replace spaces and underscores with hyphens
     return slug
-
-
-def get_bucket_config():
-    """
-    Get S3 bucket configuration from parameter store based on environment
-    
-    Returns:
-        tuple: (bucket_name, prefix) or (None, None) if error
-        
-    Example return values:
-        - Dev: ('kelifax-resources', 'dev/')  
-        - Prod: ('kelifax-resources', 'prod/')
-    """
-    try:
-        # Get environment from OS environment variable
-        environment = os.environ.get('ENVIRONMENT', 'dev').lower()
-        
-        # Determine parameter name based on environment
-        if environment == 'prod':
-            parameter_name = '/kelifax/prod/bucketResources'
-        else:
-            parameter_name = '/kelifax/dev/bucketResources'
-        
-        # Get bucket URL from parameter store
-        bucket_url = get_parameter(parameter_name)
-        
-        if not bucket_url:
-            print(f"No bucket URL found for parameter {parameter_name}")
-            return None, None
-            
-        # Parse S3 URL: s3://kelifax-resources/dev/ -> bucket_name='kelifax-resources', prefix='dev/'
-        if bucket_url.startswith('s3://'):
-            parts = bucket_url[5:].split('/', 1)  # Remove 's3://' and split
-            bucket_name = parts[0]
-            prefix = parts[1] if len(parts) > 1 else ''
-            return bucket_name, prefix
-        else:
-            print(f"Invalid S3 URL format: {bucket_url}")
-            return None, None
-            
-    except Exception as e:
-        print(f"Error getting bucket configuration: {e}")
-        return None, None
-
-
-def remove_pending_logo(logo_filename):
-    """
-    Remove logo file from logos/pending/ folder
-    
-    Args:
-        logo_filename (str): The logo filename (e.g., "Amazing_Dev_Tool.png")
-        
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    try:
-        bucket_name, prefix = get_bucket_config()
-        
-        if not bucket_name:
-            print("Could not get bucket configuration")
-            return False
-            
-        s3_client = boto3.client('s3')
-        
-        # Construct source key
-        source_key = f"{prefix}logos/pending/{logo_filename}"
-        
-        # Check if source file exists
-        try:
-            s3_client.head_object(Bucket=bucket_name, Key=source_key)
-        except s3_client.exceptions.NoSuchKey:
-            print(f"Pending logo file not found: {source_key}")
-            return False
-        
-        # Delete file from pending location
-        s3_client.delete_object(Bucket=bucket_name, Key=source_key)
-        
-        print(f"Successfully removed logo from {source_key}")
-        return True
-        
-    except Exception as e:
-        print(f"Error removing logo file {logo_filename}: {e}")
-        return False
\ No newline at end of file
@@ -1,30 +1,14 @@
-import boto3
 import json
-
-def parse_learning_resources(learning_resources_str):
-    """
-    Parse pipe-separated JSON learning resources string
-    Returns list of dictionaries
-    """
-    if not learning_resources_str:
-        return []
-    
-    try:
-        resources = []
-        for resource_json in learning_resources_str.split('|'):
-            if resource_json.strip():
-                resources.append(json.loads(resource_json))
-        return resources
-    except json.JSONDecodeError:
-        return []
+from datetime import datetime
+from app.aws_clients import get_client
+from app.resource_model import Resource
 
 def handle_admin_get_resource(event, headers, table_name):
     # Debug logging
     print(f"admin_get_resource called with event: {json.dumps(event)}")
     
-    # Initialize DynamoDB client
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table(table_name)
+    # Shared low-level DynamoDB client (items are decoded by Resource.from_wire)
+    dynamodb = get_client('dynamodb')
 
     # Parse the request body to get the slug
     body = json.loads(event.get('body', '{}'))
@@ -43,7 +27,7 @@ def handle_admin_get_resource(event, headers, table_name):
     try:
         # Query DynamoDB for the resource
         print(f"Looking for resource with slug: '{resource_slug}'")
-        response = table.get_item(Key={'resourceSlug': resource_slug})
+        response = dynamodb.get_item(TableName=table_name, Key={'resourceSlug': {'S': resource_slug}})
         item = response.get('Item')
         
         print(f"DynamoDB response: {response}")
@@ -60,38 +44,21 @@ def handle_admin_get_resource(event, headers, table_name):
             }
 
         # Transform DynamoDB item to frontend format
-        resource_data = {
-            'slug': item.get('resourceSlug', ''),
-            'title': item.get('resourceName', ''),
-            'name': item.get('resourceName', ''),
-            'url': item.get('resourceUrl', ''),
-            'description': item.get('usagePurpose', ''),
-            'category': item.get('category', ''),
-            'tags': item.get('tags', '').split(',') if item.get('tags') else [],
-            'featured': item.get('featured', False),
-            'image': item.get('logoImage', ''),
-            'keyFeatures': item.get('keyFeatures', '').split('|') if item.get('keyFeatures') else [],
-            'useCases': item.get('useCases', '').split('|') if item.get('useCases') else [],
-            'learningResources': parse_learning_resources(item.get('learningResources', '')),
-            'submittedAt': item.get('submittedAt', ''),
-            'approvedAt': item.get('approvedAt', ''),
-            'viewCount': int(item.get('viewCount', 0)),
-            'status': item.get('resourceStatus', 'submitted')
-        }
+        resource = Resource.from_wire(item)
+        resource_data = resource.admin_detail()
 
         # Update view count (optional - can be done asynchronously)
         try:
-            from datetime import datetime
-            current_view_count = int(item.get('viewCount', 0))
-            table.update_item(
-                Key={'resourceSlug': resource_slug},
+            dynamodb.update_item(
+                TableName=table_name,
+                Key={'resourceSlug': {'S': resource_slug}},
                 UpdateExpression='ADD viewCount :inc SET lastViewed = :timestamp',
                 ExpressionAttributeValues={
-                    ':inc': 1,
-                    ':timestamp': datetime.utcnow().isoformat() + 'Z'
+                    ':inc': {'N': '1'},
+                    ':timestamp': {'S': datetime.utcnow().isoformat() + 'Z'}
                 }
             )
-            resource_data['viewCount'] = current_view_count + 1
+            resource_data['viewCount'] = resource.view_count + 1
         except Exception as view_error:
             # Don't fail the request if view count update fails
             pass
@@ -1,10 +1,82 @@
 import json
-import boto3
+from app.aws_clients import get_client
+from app.catalog_snapshot import decode_page_token, encode_page_token
+from app.resource_model import SUBMISSION_SUMMARY_PROJECTION, Resource, key_from_wire, key_to_wire
+
+# Pending queue page size (the list view only carries summaries)
+DEFAULT_BATCH_SIZE = 25
+MAX_BATCH_SIZE = 100
+# A category page filters resourceStatus after Limit, so it may take a few
+# queries to fill; stop after this many and hand back a page token
+MAX_QUERIES_PER_PAGE = 5
+
+STATUS_GSI_NAME = 'ResourceStatusIndex'      # resourceStatus + createdAt
+CATEGORY_GSI_NAME = 'CategoryIndex'  # category + createdAt
+
+
+def build_pending_query(table_name, category, created_after, created_before):
+    """
+    Build the index query for pending resources, oldest first
+
+    The createdAt range goes into the key condition of either index. Without
+    a category the status index is queried directly; with one, CategoryIndex
+    narrows the read to that category and resourceStatus becomes a filter.
+
+    Returns:
+        dict: Query parameters (without Limit or ExclusiveStartKey)
+    """
+    names = {'#createdAt': 'createdAt'}
+    values = {}
+    if category:
+        key_condition = '#category = :category'
+        names['#category'] = 'category'
+        values[':category'] = {'S': category}
+    else:
+        key_condition = '#resourceStatus = :resourceStatus'
+
+    names['#resourceStatus'] = 'resourceStatus'
+    values[':resourceStatus'] = {'S': 'pending'}
+
+    if created_after and created_before:
+        key_condition += ' AND #createdAt BETWEEN :createdAfter AND :createdBefore'
+        values[':createdAfter'] = {'S': created_after}
+        values[':createdBefore'] = {'S': created_before}
+    elif created_after:
+        key_condition += ' AND #createdAt >= :createdAfter'
+        values[':createdAfter'] = {'S': created_after}
+    elif created_before:
+        key_condition += ' AND #createdAt <= :createdBefore'
+        values[':createdBefore'] = {'S': created_before}
+    else:
+        del names['#createdAt']
+
+    query = {
+        'TableName': table_name,
+        'IndexName': CATEGORY_GSI_NAME if category else STATUS_GSI_NAME,
+        'KeyConditionExpression': key_condition,
+        'ExpressionAttributeNames': names,
+        'ExpressionAttributeValues': values,
+        'ScanIndexForward': True,  # Oldest submission first
+        'ProjectionExpression': SUBMISSION_SUMMARY_PROJECTION
+    }
+    if category:
+        query['FilterExpression'] = '#resourceStatus = :resourceStatus'
+    return query
+
 
 def handle_get_submitted_resources(event, headers, table_name):
-    """Handle getting submitted resources for admin - only pending resources"""
+    """
+    Handle getting submitted resources for admin - only pending resources
+
+    Served from ResourceStatusIndex (or CategoryIndex when a category is
+    given) one page at a time with summary attributes only; the admin UI
+    fetches a submission's details from /admin/get-resource when opened.
+
+    Optional body parameters: batchSize, pageToken, category, createdAfter
+    and createdBefore (ISO timestamps compared against createdAt).
+    """
     try:
-        body = json.loads(event.get('body', '{}'))
+        body = json.loads(event.get('body') or '{}')
     except json.JSONDecodeError:
         return {
             'statusCode': 400,
@@ -14,58 +86,72 @@ def handle_get_submitted_resources(event, headers, table_name):
                 'message': 'Invalid JSON in request body'
             })
         }
-    
-    # This function only returns pending resources
-    status_filter = 'pending'
-    
-    # Scan DynamoDB for items with the specified status
-    dynamodb = boto3.client('dynamodb')
-    
+
     try:
-        response = dynamodb.scan(
-            TableName=table_name,
-            FilterExpression='#resourceStatus = :resourceStatus',
-            ExpressionAttributeNames={'#resourceStatus': 'resourceStatus'},
-            ExpressionAttributeValues={':resourceStatus': {'S': status_filter}}
-        )
-        
-        # Format the resources from DynamoDB
-        formatted_resources = []
-        for item in response.get('Items', []):
-            # Parse tags from string to array
-            tags_str = item.get('tags', {}).get('S', '')
-            tags = [tag.strip() for tag in tags_str.split(',')] if tags_str else []
-            
-            formatted_resource = {
-                'resourceSlug': item.get('resourceSlug', {}).get('S', ''),
-                'resourceStatus': item.get('resourceStatus', {}).get('S', ''),
-                'title': item.get('resourceName', {}).get('S', ''),
-                'description': item.get('usagePurpose', {}).get('S', ''),
-                'url': item.get('resourceUrl', {}).get('S', ''),
-                'tags': tags,
-                'category': item.get('category', {}).get('S', ''),
-                'featured': item.get('featured', {}).get('BOOL', False),
-                'submissionTimestamp': item.get('submittedAt', {}).get('S', ''),
-                'submitterEmail': item.get('submitterEmail', {}).get('S', ''),
-                'submitterName': f"{item.get('submitterFirstName', {}).get('S', '')} {item.get('submitterLastName', {}).get('S', '')}".strip(),
-                'submitterCompany': item.get('submitterCompany', {}).get('S', ''),
-                'logoImage': item.get('logoImage', {}).get('S', ''),
-                'keyFeatures': item.get('keyFeatures', {}).get('S', ''),
-                'useCases': item.get('useCases', {}).get('S', ''),
-                'learningResources': item.get('learningResources', {}).get('S', '')
+        batch_size = max(1, min(int(body.get('batchSize', DEFAULT_BATCH_SIZE)), MAX_BATCH_SIZE))
+    except (TypeError, ValueError):
+        batch_size = DEFAULT_BATCH_SIZE
+    category = body.get('category') or None
+    if category == 'all':
+        category = None
+    page_token = body.get('pageToken')
+
+    query = build_pending_query(table_name, category, body.get('createdAfter'), body.get('createdBefore'))
+    if page_token:
+        exclusive_start_key = decode_page_token(page_token)
+        if not exclusive_start_key:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': json.dumps({
+                    'success': False,
+                    'message': 'Invalid pageToken'
+                })
             }
-            formatted_resources.append(formatted_resource)
-        
+        query['ExclusiveStartKey'] = key_to_wire(exclusive_start_key)
+
+    dynamodb = get_client('dynamodb')
+
+    try:
+        formatted_resources = []
+        last_evaluated_key = None
+        queries = 0
+        # Limit counts items read before the filter, so asking for the
+        # remaining slots never returns more than fit and the
+        # LastEvaluatedKey is always the right place to resume
+        while True:
+            query['Limit'] = batch_size - len(formatted_resources)
+            response = dynamodb.query(**query)
+            queries += 1
+            formatted_resources.extend(
+                Resource.from_wire(item).submission_summary() for item in response.get('Items', [])
+            )
+            last_evaluated_key = response.get('LastEvaluatedKey')
+            if not last_evaluated_key or len(formatted_resources) >= batch_size or queries >= MAX_QUERIES_PER_PAGE:
+                break
+            query['ExclusiveStartKey'] = last_evaluated_key
+
+        print(f"Pending queue page: {len(formatted_resources)} resources from {query['IndexName']} in {queries} queries")
+
+        next_page_token = encode_page_token(key_from_wire(last_evaluated_key)) if last_evaluated_key else None
+
         return {
             'statusCode': 200,
             'headers': headers,
             'body': json.dumps({
                 'success': True,
                 'data': formatted_resources,
-                'count': len(formatted_resources)
+                'count': len(formatted_resources),
+                'pagination': {
+                    'hasMore': next_page_token is not None,
+                    'nextPageToken': next_page_token,
+                    'batchSize': batch_size,
+                    'count': len(formatted_resources),
+                    'category': category or 'all'
+                }
             })
         }
-        
+
     except Exception as e:
         return {
             'statusCode': 500,
@@ -0,0 +1,62 @@
+import json
+from app.autocomplete_index import MAX_SUGGESTIONS, complete, get_autocomplete_index
+from app.catalog_snapshot import get_catalog_snapshot
+from app.listing_cache import get_catalog_version
+from app.timing import span
+
+DEFAULT_LIMIT = 8
+MAX_PREFIX_LENGTH = 100
+
+
+def handle_autocomplete(event, headers):
+    """
+    Type-ahead suggestions for the search box
+
+    Body (or query string): {"query": "fig", "limit": 8}. Returns resource
+    names, tags and categories starting with the query (or, for names, with
+    any word of the name), most popular first. Suggestions come from the
+    catalog snapshot; while there is none the list is empty.
+    """
+    body = {}
+    if event.get('body'):
+        try:
+            body = json.loads(event['body'])
+        except json.JSONDecodeError:
+            print("Invalid JSON in request body")
+    query_params = event.get('queryStringParameters') or {}
+
+    query = str(body.get('query', query_params.get('query')) or '')[:MAX_PREFIX_LENGTH]
+    try:
+        limit = max(1, min(int(body.get('limit', query_params.get('limit', DEFAULT_LIMIT))), MAX_SUGGESTIONS))
+    except (TypeError, ValueError):
+        limit = DEFAULT_LIMIT
+
+    try:
+        with span('index'):
+            index = get_autocomplete_index(get_catalog_snapshot(get_catalog_version()))
+        with span('complete'):
+            suggestions = complete(index, query, limit) if index else []
+
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': json.dumps({
+                'success': True,
+                'data': {
+                    'query': query,
+                    'suggestions': suggestions
+                }
+            })
+        }
+
+    except Exception as e:
+        print(f"Error in handle_autocomplete: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': json.dumps({
+                'success': False,
+                'message': 'Failed to get suggestions',
+                'error': str(e)
+            })
+        }
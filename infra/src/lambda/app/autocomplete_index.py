@@ -0,0 +1,170 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left
+
+# Type-ahead index for /autocomplete, built per container from the in-memory
+# approved-catalog snapshot (see catalog_snapshot), so it costs no reads of
+# its own. Every completion (resource name, and each later word of it so
+# "code" finds "Visual Studio Code"; tag; category) is a row in one array
+# sorted by its lowercase key, so a prefix is a bisect range. Short prefixes
+# match most of the array, so their top completions are precomputed.
+# Prefixes up to this length answer from precomputed top lists
+PRECOMPUTED_PREFIX_LENGTH = 2
+MAX_SUGGESTIONS = 20
+
+# A resource weighs viewCount + 1, plus this when featured; a tag or category
+# weighs the sum of the resources carrying it
+FEATURED_BONUS = 10
+
+# Index and the snapshot (version, builtAt) it was built from
+_index = None
+_index_source = None
+_index_lock = threading.Lock()
+
+
+def normalize(text):
+    """Lowercase and collapse whitespace"""
+    return ' '.join(text.lower().split())
+
+
+def build_autocomplete_index(snapshot):
+    """
+    Build the sorted completion arrays from a catalog snapshot
+
+    Returns:
+        dict: keys (sorted), rows (weight, order, text, kind, slug) aligned with keys,
+              and precomputed top rows for short prefixes
+    """
+    entries = []
+    tag_weights = {}
+    category_weights = {}
+    for resource, view_count in zip(snapshot['resources'], snapshot['viewCounts']):
+        slug = resource.get('slug')
+        title = resource.get('title')
+        if not (slug and title):
+            continue
+        weight = (view_count or 0) + 1 + (FEATURED_BONUS if resource.get('featured') else 0)
+        words = normalize(title).split(' ')
+        # The full name plus every later word start
+        for start in range(len(words)):
+            entries.append((' '.join(words[start:]), weight, title, 'resource', slug))
+        for tag in resource.get('tags', []):
+            key = normalize(tag)
+            display, total = tag_weights.get(key, (tag, 0))
+            tag_weights[key] = (display, total + weight)
+        category = resource.get('category')
+        if category:
+            key = normalize(category)
+            display, total = category_weights.get(key, (category, 0))
+            category_weights[key] = (display, total + weight)
+
+    for key, (display, weight) in tag_weights.items():
+        entries.append((key, weight, display, 'tag', None))
+    for key, (display, weight) in category_weights.items():
+        entries.append((key, weight, display, 'category', None))
+
+    entries.sort(key=lambda entry: entry[0])
+    keys = [entry[0] for entry in entries]
+    # Equal weights rank alphabetically (lower order first)
+    rows = [(weight, -order, text, kind, slug) for order, (_, weight, text, kind, slug) in enumerate(entries)]
+
+    precomputed = {}
+    for length in range(1, PRECOMPUTED_PREFIX_LENGTH + 1):
+        groups = {}
+        for key, row in zip(keys, rows):
+            if len(key) >= length:
+                groups.setdefault(key[:length], []).append(row)
+        for prefix, group in groups.items():
+            precomputed[prefix] = _top_rows(group, MAX_SUGGESTIONS)
+
+    return {'keys': keys, 'rows': rows, 'precomputed': precomputed}
+
+
+def _top_rows(rows, limit):
+    """
+    Best rows by weight, one per completion (a name matched by several of its
+    words counts once); a heap yields rows best first so only the top few are
+    ordered
+    """
+    heap = [(-row[0], -row[1], position) for position, row in enumerate(rows)]
+    heapq.heapify(heap)
+    seen = set()
+    top = []
+    while heap and len(top) < limit:
+        row = rows[heapq.heappop(heap)[2]]
+        identity = (row[3], row[4] or row[2].lower())
+        if identity not in seen:
+            seen.add(identity)
+            top.append(row)
+    return top
+
+
+def complete(index, prefix, limit):
+    """
+    Top completions for a prefix, most popular first
+
+    Returns:
+        list: dicts with text, type, slug (resources only) and weight
+    """
+    prefix = normalize(prefix)
+    if not prefix:
+        return []
+    limit = min(limit, MAX_SUGGESTIONS)
+
+    if len(prefix) <= PRECOMPUTED_PREFIX_LENGTH:
+        rows = index['precomputed'].get(prefix, [])[:limit]
+    else:
+        keys = index['keys']
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + '\uffff', start)
+        rows = _top_rows(index['rows'][start:end], limit)
+
+    suggestions = []
+    for weight, _, text, kind, slug in rows:
+        suggestion = {'text': text, 'type': kind, 'weight': weight}
+        if slug:
+            suggestion['slug'] = slug
+        suggestions.append(suggestion)
+    return suggestions
+
+
+def get_autocomplete_index(snapshot):
+    """
+    Get this container's autocomplete index for a catalog snapshot
+
+    The index is rebuilt when the snapshot changes. One request builds it;
+    requests arriving meanwhile keep using the previous index instead of
+    waiting for the build. Without a snapshot (missing, stale or
+    invalidated) the index is dropped, so removed resources are never
+    suggested from it.
+
+    Args:
+        snapshot (dict or None): Current catalog snapshot
+
+    Returns:
+        dict or None: Autocomplete index (None while there is no snapshot)
+    """
+    global _index, _index_source
+    if snapshot is None:
+        if _index is not None:
+            with _index_lock:
+                _index = None
+                _index_source = None
+        return None
+
+    source = (snapshot['version'], snapshot['builtAt'])
+    if _index is not None and _index_source == source:
+        return _index
+    if not _index_lock.acquire(blocking=_index is None):
+        return _index
+    try:
+        if _index is None or _index_source != source:
+            started = time.perf_counter()
+            _index = build_autocomplete_index(snapshot)
+            _index_source = source
+            print(f"Built autocomplete index for catalog snapshot {snapshot['version']}: "
+                  f"{len(_index['keys'])} completions in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return _index
+    finally:
+        _index_lock.release()
@@ -0,0 +1,120 @@
+import os
+import threading
+import boto3
+from botocore.config import Config
+from app.timing import instrument_client
+
+DEFAULT_REGION = 'us-east-1'
+
+# Shared connection settings: a pool large enough for concurrent work inside one
+# invocation, TCP keep-alive so warm containers reuse their TLS connections,
+# and standard-mode retries for throttling
+CLIENT_CONFIG = Config(
+    max_pool_connections=int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', '25')),
+    tcp_keepalive=True,
+    retries={'max_attempts': 3, 'mode': 'standard'}
+)
+
+_lock = threading.Lock()
+_session = None
+_clients = {}
+
+# Injected resources are shared by all threads; created ones are per thread
+# because boto3 resource objects are not thread safe
+_injected_resources = {}
+_thread_local = threading.local()
+
+
+def _get_session():
+    global _session
+    if _session is None:
+        _session = boto3.session.Session(region_name=os.environ.get('AWS_REGION', DEFAULT_REGION))
+    return _session
+
+
+def get_client(service_name):
+    """
+    Get the process-wide low-level client for an AWS service
+
+    Clients are created on first use and reused across warm invocations.
+    boto3 clients are thread safe, so one instance is shared by all threads.
+
+    Args:
+        service_name (str): AWS service name (e.g., 'dynamodb', 's3', 'ssm')
+
+    Returns:
+        botocore client (or the stand-in registered with set_client)
+    """
+    client = _clients.get(service_name)
+    if client is None:
+        with _lock:
+            client = _clients.get(service_name)
+            if client is None:
+                client = instrument_client(_get_session().client(service_name, config=CLIENT_CONFIG))
+                _clients[service_name] = client
+    return client
+
+
+def get_resource(service_name):
+    """
+    Get the boto3 resource for an AWS service (one per thread, reused across invocations)
+
+    Args:
+        service_name (str): AWS service name (e.g., 'dynamodb')
+
+    Returns:
+        boto3 service resource (or the stand-in registered with set_resource)
+    """
+    resource = _injected_resources.get(service_name)
+    if resource is not None:
+        return resource
+
+    resources = getattr(_thread_local, 'resources', None)
+    if resources is None:
+        resources = _thread_local.resources = {}
+
+    resource = resources.get(service_name)
+    if resource is None:
+        # Session objects are not thread safe either, so create under the lock
+        with _lock:
+            resource = _get_session().resource(service_name, config=CLIENT_CONFIG)
+        instrument_client(resource.meta.client)
+        resources[service_name] = resource
+    return resource
+
+
+def get_table(table_name):
+    """Get a cached DynamoDB Table resource for the current thread"""
+    tables = getattr(_thread_local, 'tables', None)
+    if tables is None:
+        tables = _thread_local.tables = {}
+
+    dynamodb = get_resource('dynamodb')
+    table = tables.get(table_name)
+    # Rebuild if the dynamodb resource was swapped since the table was cached
+    if table is None or table[0] is not dynamodb:
+        table = (dynamodb, dynamodb.Table(table_name))
+        tables[table_name] = table
+    return table[1]
+
+
+def set_client(service_name, client):
+    """Register a client (e.g. a local stand-in) to be returned by get_client"""
+    with _lock:
+        _clients[service_name] = client
+
+
+def set_resource(service_name, resource):
+    """Register a resource (e.g. a local stand-in) to be returned by get_resource"""
+    with _lock:
+        _injected_resources[service_name] = resource
+
+
+def reset_clients():
+    """Drop all cached and injected clients/resources so the next call recreates them"""
+    global _session
+    with _lock:
+        _clients.clear()
+        _injected_resources.clear()
+        _session = None
+    _thread_local.__dict__.clear()
@@ -0,0 +1,145 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from app.lambda_function import dispatch, resolve_route
+from app.timing import run_untimed, span
+
+MAX_BATCH_ITEMS = 25
+MAX_WORKERS = int(os.environ.get('BATCH_MAX_WORKERS', '8'))
+
+# Shared across warm invocations so pool threads keep their cached table resources
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='batch')
+
+
+def build_sub_event(event, item):
+    """
+    Build the proxy event for one batch item
+
+    The item inherits the outer request's headers and authorizer context;
+    If-None-Match comes only from the item's own ifNoneMatch.
+    """
+    sub_headers = {
+        name: value for name, value in (event.get('headers') or {}).items()
+        if name.lower() not in ('if-none-match', 'content-length', 'accept-encoding')
+    }
+    if item.get('ifNoneMatch'):
+        sub_headers['If-None-Match'] = item['ifNoneMatch']
+
+    return {
+        **event,
+        'path': item['path'],
+        'resource': item['path'],
+        'httpMethod': 'POST',
+        'headers': sub_headers,
+        'multiValueHeaders': None,
+        'queryStringParameters': None,
+        'multiValueQueryStringParameters': None,
+        'body': json.dumps(item.get('body') or {}),
+        'isBase64Encoded': False
+    }
+
+
+def run_item(event, item, headers, table_name):
+    """Run one batch item through the router and return (status, body JSON string, etag)"""
+    try:
+        # Each item gets its own header dict because handlers add ETag to it
+        response = dispatch('POST', item['path'], build_sub_event(event, item), dict(headers), table_name,
+                            sub_request=True)
+    except Exception as e:
+        print(f"Batch item {item['path']} failed: {str(e)}")
+        return 500, json.dumps({'success': False, 'message': 'Internal server error', 'error': str(e)}), None
+
+    etag = (response.get('headers') or {}).get('ETag')
+    return response.get('statusCode', 200), response.get('body') or 'null', etag
+
+
+def validate_items(items):
+    """
+    Check the batch item list
+
+    Returns:
+        str: Error message, or None when the list is valid
+    """
+    if not isinstance(items, list) or not items:
+        return 'requests must be a non-empty array'
+    if len(items) > MAX_BATCH_ITEMS:
+        return f'A batch can contain at most {MAX_BATCH_ITEMS} requests'
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            return f'requests[{index}] must be an object with a path'
+        if item.get('body') is not None and not isinstance(item['body'], dict):
+            return f'requests[{index}].body must be an object'
+    return None
+
+
+def handle_batch(event, headers, table_name):
+    """
+    Run several public read requests in one invocation
+
+    Request body:
+        {"requests": [{"id": "list", "path": "/resources", "body": {"batchSize": 10}},
+                      {"id": "a", "path": "/get-resource", "body": {"slug": "figma"}, "ifNoneMatch": "\"...\""}]}
+
+    Items run concurrently; each result carries its own status code, and a
+    failing item does not fail the batch:
+        {"success": true, "data": {"results": [{"id": "list", "status": 200, "etag": "...", "body": {...}}, ...]}}
+    """
+    try:
+        body = json.loads(event.get('body') or '{}')
+    except json.JSONDecodeError:
+        body = None
+
+    items = body.get('requests') if isinstance(body, dict) else None
+    error = validate_items(items)
+    if error:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({
+                'success': False,
+                'message': error
+            })
+        }
+
+    results = [None] * len(items)
+    pending = []
+    for index, item in enumerate(items):
+        route = resolve_route('POST', item['path'])
+        if not route or not route.batchable:
+            results[index] = (400, json.dumps({
+                'success': False,
+                'message': f"Endpoint not available in a batch: {item['path']}"
+            }), None)
+        else:
+            pending.append(index)
+
+    # Items are timed as one batch_item phase (wall clock for all of them);
+    # their own spans would add up past the request total when run in parallel
+    with span('batch_item'):
+        if len(pending) == 1:
+            index = pending[0]
+            results[index] = run_untimed(run_item, event, items[index], headers, table_name)
+        elif pending:
+            futures = {
+                index: _executor.submit(run_untimed, run_item, event, items[index], headers, table_name)
+                for index in pending
+            }
+            for index, future in futures.items():
+                results[index] = future.result()
+
+    # Item bodies are already JSON, so splice them in instead of re-encoding
+    with span('serialize'):
+        parts = []
+        for index, (status, item_body, etag) in enumerate(results):
+            item_id = items[index].get('id', index)
+            parts.append(
+                f'{{"id": {json.dumps(item_id)}, "status": {status}, '
+                f'"etag": {json.dumps(etag)}, "body": {item_body}}}'
+            )
+        response_body = '{"success": true, "data": {"results": [' + ', '.join(parts) + ']}}'
+
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': response_body
+    }
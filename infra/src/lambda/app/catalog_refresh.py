@@ -0,0 +1,85 @@
+import json
+import os
+import urllib.request
+from app.catalog_snapshot import get_catalog_snapshot, rebuild_catalog_snapshot
+from app.listing_cache import bump_catalog_version
+from app.search_index import rebuild_search_index
+
+# Scheduled job (its own Lambda function) that rebuilds the approved-catalog
+# snapshot and the search index from DynamoDB. Admin approve/delete keep both
+# current; this picks up edits made outside the admin API and keeps them from
+# going stale. Public reads never rebuild either.
+#
+# The same function backs a CloudFormation custom resource, so a deploy runs
+# one refresh right away instead of waiting for the first scheduled run.
+
+
+def refresh_catalog(table_name):
+    """
+    Rebuild the catalog snapshot and the search index
+
+    Publishes a new catalog version when the listings changed, so containers
+    drop listing pages cached from the old snapshot.
+
+    Returns:
+        dict: Job result
+    """
+    previous = get_catalog_snapshot()
+    snapshot_rebuilt = rebuild_catalog_snapshot(table_name)
+
+    search_index_rebuilt = False
+    try:
+        search_index_rebuilt = rebuild_search_index(table_name)['etag'] is not None
+    except Exception as e:
+        print(f"Error rebuilding search index: {e}")
+
+    result = {'snapshotRebuilt': snapshot_rebuilt, 'searchIndexRebuilt': search_index_rebuilt}
+    snapshot = get_catalog_snapshot() if snapshot_rebuilt else None
+    if snapshot:
+        changed = previous is None or previous['version'] != snapshot['version']
+        if changed:
+            bump_catalog_version()
+        result.update(version=snapshot['version'], count=len(snapshot['resources']), changed=changed)
+    print(f"Catalog refresh: {result}")
+    return result
+
+
+def send_custom_resource_response(event, context, status, data=None, reason=''):
+    """Report the outcome of a custom resource request to CloudFormation"""
+    body = json.dumps({
+        'Status': status,
+        'Reason': reason or f'See CloudWatch log stream {context.log_stream_name}',
+        'PhysicalResourceId': event.get('PhysicalResourceId') or context.log_stream_name,
+        'StackId': event['StackId'],
+        'RequestId': event['RequestId'],
+        'LogicalResourceId': event['LogicalResourceId'],
+        'Data': data or {}
+    }).encode('utf-8')
+    request = urllib.request.Request(
+        event['ResponseURL'], data=body, method='PUT',
+        headers={'Content-Type': '', 'Content-Length': str(len(body))}
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        print(f"Custom resource response: {status} (HTTP {response.status})")
+
+
+def lambda_handler(event, context):
+    """
+    Entry point of the catalog refresh: the EventBridge schedule, or the
+    deploy-time custom resource (Create and Update refresh, Delete does nothing)
+
+    A failed refresh is reported as success to CloudFormation so it doesn't
+    roll back the deploy; the schedule retries it.
+    """
+    table_name = os.environ.get('DYNAMODB_TABLE', 'kelifax-resources')
+    if 'RequestType' not in event:
+        return refresh_catalog(table_name)
+
+    result = {}
+    try:
+        if event['RequestType'] in ('Create', 'Update'):
+            result = refresh_catalog(table_name)
+    except Exception as e:
+        print(f"Error refreshing catalog on deploy: {e}")
+    send_custom_resource_response(event, context, 'SUCCESS', {key: str(value) for key, value in result.items()})
+    return result
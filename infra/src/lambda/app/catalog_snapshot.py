@@ -0,0 +1,320 @@
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from botocore.exceptions import ClientError
+from app.aws_clients import get_client
+from app.logo_store import get_bucket_config, is_missing_key_error
+from app.resource_model import SUMMARY_PROJECTION, Resource
+
+# Snapshot of every approved resource summary, newest first, stored gzipped in
+# the resources bucket ({prefix}catalog/approved-resources.json.gz). Admin
+# approve/delete rebuild it, and so does the scheduled catalog refresh
+# (app.catalog_refresh) that picks up edits made outside the admin API.
+# /resources serves pages from the copy kept in memory and falls back to
+# DynamoDB when it is missing or stale; public reads never rebuild it.
+SNAPSHOT_LOCATION = 'catalog/approved-resources.json.gz'
+SNAPSHOT_FORMAT = 1
+
+# How often a container revalidates its copy (conditional GET, usually a 304)
+SNAPSHOT_CHECK_INTERVAL = int(os.environ.get('CATALOG_SNAPSHOT_CHECK_INTERVAL', '30'))
+# Snapshots older than this are not served (catches edits made outside the admin API)
+SNAPSHOT_MAX_AGE = int(os.environ.get('CATALOG_SNAPSHOT_MAX_AGE', '86400'))
+
+STATUS_GSI_NAME = 'ResourceStatusIndex'      # resourceStatus + createdAt
+
+# Listing summary plus viewCount (stored beside the summaries for autocomplete ranking)
+SNAPSHOT_PROJECTION = SUMMARY_PROJECTION + ', viewCount'
+
+# Loaded snapshot (None until the first check), when it was last revalidated
+# and the catalog version (see listing_cache) seen at that time
+_snapshot = None
+_checked_at = None
+_checked_version = None
+_snapshot_lock = threading.Lock()
+
+
+def encode_page_token(last_key):
+    """Encode a LastEvaluatedKey-shaped dict as a pageToken"""
+    return base64.b64encode(json.dumps(last_key).encode()).decode()
+
+
+def decode_page_token(page_token):
+    """Decode a pageToken into a LastEvaluatedKey-shaped dict (None if invalid)"""
+    try:
+        return json.loads(base64.b64decode(page_token).decode())
+    except Exception as e:
+        print(f"Invalid pagination token: {e}")
+        return None
+
+
+def _snapshot_key():
+    bucket_name, prefix = get_bucket_config()
+    if not bucket_name:
+        return None, None
+    return bucket_name, f"{prefix}{SNAPSHOT_LOCATION}"
+
+
+def _index_snapshot(document, s3_etag):
+    """
+    Build the in-memory form of a snapshot document
+
+    Entries are ordered newest first (createdAt, then slug, descending). Each
+    view ('all' or a category) is a list of entry positions plus a slug ->
+    position map so page tokens resolve in O(1).
+    """
+    entries = document['resources']
+    views = {'all': list(range(len(entries)))}
+    for position, entry in enumerate(entries):
+        views.setdefault(('category', entry['category']), []).append(position)
+
+    return {
+        'version': document['version'],
+        'builtAt': document['builtAt'],
+        'etag': s3_etag,
+        'resources': [entry['resource'] for entry in entries],
+        'createdAt': [entry['createdAt'] for entry in entries],
+        'slugs': [entry['resource']['slug'] for entry in entries],
+        'categories': [entry['category'] for entry in entries],
+        # Popularity for autocomplete; older snapshots have none
+        'viewCounts': document.get('viewCounts') or [0] * len(entries),
+        'views': views,
+        'positions': {
+            view: {entries[position]['resource']['slug']: index for index, position in enumerate(positions)}
+            for view, positions in views.items()
+        }
+    }
+
+
+def _load_snapshot():
+    """
+    Revalidate the cached snapshot against S3 (conditional GET)
+
+    Returns:
+        dict or None: The current snapshot, or None if there is none
+    """
+    bucket_name, key = _snapshot_key()
+    if not bucket_name:
+        return None
+
+    request = {'Bucket': bucket_name, 'Key': key}
+    if _snapshot:
+        request['IfNoneMatch'] = _snapshot['etag']
+    try:
+        response = get_client('s3').get_object(**request)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('304', 'NotModified'):
+            return _snapshot
+        if is_missing_key_error(e):
+            print(f"No catalog snapshot at s3://{bucket_name}/{key}")
+            return None
+        raise
+
+    document = json.loads(gzip.decompress(response['Body'].read()))
+    if document.get('format') != SNAPSHOT_FORMAT:
+        print(f"Ignoring catalog snapshot with format {document.get('format')}")
+        return None
+    snapshot = _index_snapshot(document, response.get('ETag'))
+    print(f"Loaded catalog snapshot {snapshot['version']} ({len(snapshot['resources'])} resources)")
+    return snapshot
+
+
+def get_catalog_snapshot(catalog_version=None):
+    """
+    Get the approved-catalog snapshot for serving /resources
+
+    The in-memory copy is revalidated at most every SNAPSHOT_CHECK_INTERVAL
+    seconds, or right away when catalog_version changed since the last check.
+    If S3 can't be reached the previous copy keeps being served.
+
+    Args:
+        catalog_version (str): Current catalog version, if known
+
+    Returns:
+        dict or None: Snapshot, or None when it is missing or older than SNAPSHOT_MAX_AGE
+    """
+    global _snapshot, _checked_at, _checked_version
+
+    def needs_check():
+        return (_checked_at is None
+                or time.monotonic() - _checked_at >= SNAPSHOT_CHECK_INTERVAL
+                or (catalog_version is not None and catalog_version != _checked_version))
+
+    if needs_check():
+        with _snapshot_lock:
+            if needs_check():
+                try:
+                    _snapshot = _load_snapshot()
+                except Exception as e:
+                    print(f"Error loading catalog snapshot: {e}")
+                _checked_at = time.monotonic()
+                _checked_version = catalog_version
+
+    snapshot = _snapshot
+    if snapshot is None or time.time() - snapshot['builtAt'] > SNAPSHOT_MAX_AGE:
+        return None
+    return snapshot
+
+
+def read_approved_resources(table_name, projection=SUMMARY_PROJECTION):
+    """Read every approved resource from ResourceStatusIndex (paginated)"""
+    dynamodb = get_client('dynamodb')
+    request = {
+        'TableName': table_name,
+        'IndexName': STATUS_GSI_NAME,
+        'KeyConditionExpression': 'resourceStatus = :status',
+        'ExpressionAttributeValues': {':status': {'S': 'approved'}},
+        'ProjectionExpression': projection
+    }
+    resources = []
+    while True:
+        response = dynamodb.query(**request)
+        resources.extend(Resource.from_wire(item) for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return resources
+        request['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def rebuild_catalog_snapshot(table_name, changed_slug=None, changed_resource=None):
+    """
+    Rebuild the approved-catalog snapshot from DynamoDB and store it in S3
+
+    GSI reads are eventually consistent, so the admin action that triggered
+    the rebuild passes the resource it just changed: changed_slug is dropped
+    from the query result and changed_resource (a Resource) is added back if
+    it is approved.
+
+    If the rebuild fails the stored snapshot is deleted, so readers fall back
+    to DynamoDB instead of serving outdated listings.
+
+    Returns:
+        bool: True if the snapshot was written
+    """
+    global _snapshot, _checked_at
+    try:
+        bucket_name, key = _snapshot_key()
+        if not bucket_name:
+            print("Could not get bucket configuration for the catalog snapshot")
+            return False
+
+        resources = read_approved_resources(table_name, SNAPSHOT_PROJECTION)
+        if changed_slug:
+            resources = [resource for resource in resources if resource.slug != changed_slug]
+        if changed_resource and changed_resource.status == 'approved':
+            resources.append(changed_resource)
+
+        # Only list resources that have the required fields
+        resources = [resource for resource in resources if resource.slug and resource.name and resource.created_at]
+        # Same order as the index queries (createdAt descending), ties broken by slug
+        resources.sort(key=lambda resource: (resource.created_at, resource.slug), reverse=True)
+        entries = [
+            {'resource': resource.summary(), 'category': resource.category, 'createdAt': resource.created_at}
+            for resource in resources
+        ]
+
+        resources_json = json.dumps(entries, separators=(',', ':'))
+        version = hashlib.sha256(resources_json.encode('utf-8')).hexdigest()[:16]
+        document = {
+            'format': SNAPSHOT_FORMAT,
+            'version': version,
+            'builtAt': int(time.time()),
+            'builtAtIso': datetime.utcnow().isoformat() + 'Z',
+            'count': len(entries),
+            'resources': entries,
+            # Kept out of the version hash: views alone don't change any listing
+            'viewCounts': [resource.view_count for resource in resources]
+        }
+        body = gzip.compress(json.dumps(document, separators=(',', ':')).encode('utf-8'))
+        response = get_client('s3').put_object(
+            Bucket=bucket_name,
+            Key=key,
+            Body=body,
+            ContentType='application/json',
+            ContentEncoding='gzip'
+        )
+
+        snapshot = _index_snapshot(document, response.get('ETag'))
+        with _snapshot_lock:
+            _snapshot = snapshot
+            _checked_at = time.monotonic()
+        print(f"Rebuilt catalog snapshot {version}: {len(entries)} resources, {len(body)} bytes")
+        return True
+
+    except Exception as e:
+        print(f"Error rebuilding catalog snapshot: {e}")
+        invalidate_catalog_snapshot()
+        return False
+
+
+def invalidate_catalog_snapshot():
+    """Delete the stored snapshot and drop the in-memory copy"""
+    global _snapshot, _checked_at
+    with _snapshot_lock:
+        _snapshot = None
+        _checked_at = None
+    try:
+        bucket_name, key = _snapshot_key()
+        if bucket_name:
+            get_client('s3').delete_object(Bucket=bucket_name, Key=key)
+    except Exception as e:
+        print(f"Error deleting catalog snapshot: {e}")
+
+
+def resolve_slugs(snapshot, slugs):
+    """
+    Listing entries for the given slugs, in order, skipping any that are not
+    in the snapshot (no longer approved)
+
+    Returns:
+        list: Resource summary dicts
+    """
+    positions = snapshot['positions']['all']
+    return [snapshot['resources'][positions[slug]] for slug in slugs if slug in positions]
+
+
+def get_snapshot_page(snapshot, category, batch_size, page_token=None):
+    """
+    Slice one page of approved resources out of a snapshot
+
+    Page tokens have the same shape as the DynamoDB LastEvaluatedKey of the
+    matching index query, so tokens stay valid whether a page comes from the
+    snapshot or from the DynamoDB fallback. A token whose resource has since
+    been removed resumes at the first resource created before it.
+
+    Returns:
+        tuple: (list of resource dicts, next page token or None)
+    """
+    # A non-positive size would slice backwards (or never end the pages)
+    batch_size = max(1, batch_size)
+    view = 'all' if category == 'all' else ('category', category)
+    positions = snapshot['views'].get(view, [])
+
+    start = 0
+    last_key = decode_page_token(page_token) if page_token else None
+    if last_key:
+        index = snapshot['positions'].get(view, {}).get(last_key.get('resourceSlug'))
+        if index is not None:
+            start = index + 1
+        else:
+            created_at = last_key.get('createdAt', '')
+            start = next(
+                (index for index, position in enumerate(positions) if snapshot['createdAt'][position] < created_at),
+                len(positions)
+            )
+
+    page = positions[start:start + batch_size]
+    next_page_token = None
+    if start + batch_size < len(positions) and page:
+        last = page[-1]
+        last_key = {'resourceSlug': snapshot['slugs'][last], 'createdAt': snapshot['createdAt'][last]}
+        if category == 'all':
+            last_key['resourceStatus'] = 'approved'
+        else:
+            last_key['category'] = snapshot['categories'][last]
+        next_page_token = encode_page_token(last_key)
+
+    return [snapshot['resources'][position] for position in page], next_page_token
@@ -0,0 +1,108 @@
+import base64
+import gzip
+import os
+
+# Brotli is optional: only offered when the package is bundled with the Lambda
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent as-is (compression would not pay for itself)
+MIN_COMPRESS_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', '1024'))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def parse_accept_encoding(accept_encoding):
+    """
+    Parse an Accept-Encoding header into {coding: q-value}
+
+    Example: 'gzip, br;q=0.8, *;q=0' -> {'gzip': 1.0, 'br': 0.8, '*': 0.0}
+    """
+    codings = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def choose_encoding(accept_encoding):
+    """
+    Pick the best supported content coding for a request
+
+    Returns:
+        str: 'br', 'gzip' or None when the client accepts neither
+    """
+    if not accept_encoding:
+        return None
+
+    codings = parse_accept_encoding(accept_encoding)
+    wildcard = codings.get('*', 0.0)
+    supported = ['br', 'gzip'] if brotli else ['gzip']
+
+    best, best_q = None, 0.0
+    for coding in supported:
+        q = codings.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress_response(response, accept_encoding):
+    """
+    Compress an API Gateway proxy response body in place when worthwhile
+
+    The body is compressed with the negotiated coding if it is at least
+    MIN_COMPRESS_BYTES, then returned base64-encoded with isBase64Encoded,
+    Content-Encoding and Vary set. Responses that are already base64 or
+    would not shrink are left untouched.
+
+    Args:
+        response (dict): Proxy response with statusCode, headers and body
+        accept_encoding (str): The request's Accept-Encoding header
+
+    Returns:
+        dict: The same response object
+    """
+    body = response.get('body')
+    if not body or response.get('isBase64Encoded'):
+        return response
+
+    headers = response.setdefault('headers', {})
+    # Responses vary by Accept-Encoding whether or not this one ends up compressed
+    vary = headers.get('Vary')
+    if not vary:
+        headers['Vary'] = 'Accept-Encoding'
+    elif 'accept-encoding' not in vary.lower():
+        headers['Vary'] = f'{vary}, Accept-Encoding'
+
+    raw = body.encode('utf-8') if isinstance(body, str) else body
+    if len(raw) < MIN_COMPRESS_BYTES:
+        return response
+
+    encoding = choose_encoding(accept_encoding)
+    if encoding == 'br':
+        compressed = brotli.compress(raw, quality=BROTLI_QUALITY)
+    elif encoding == 'gzip':
+        compressed = gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+    else:
+        return response
+
+    if len(compressed) >= len(raw):
+        return response
+
+    headers['Content-Encoding'] = encoding
+    response['body'] = base64.b64encode(compressed).decode('ascii')
+    response['isBase64Encoded'] = True
+    return response
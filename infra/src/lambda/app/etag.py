@@ -0,0 +1,66 @@
+import hashlib
+from app.utils import get_header
+
+
+def compute_etag(*parts):
+    """
+    Build a strong ETag from one or more content parts (str or bytes)
+
+    Example: compute_etag(body) -> '"3f2a...c9"'
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8') if isinstance(part, str) else part)
+        digest.update(b'\0')
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(event, etag):
+    """Check whether the request's If-None-Match header matches etag"""
+    if_none_match = get_header(event, 'If-None-Match')
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        # If-None-Match uses weak comparison, so ignore a W/ prefix
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified_response(headers, etag):
+    """Build a 304 Not Modified response carrying the ETag"""
+    return {
+        'statusCode': 304,
+        'headers': {**headers, 'ETag': etag},
+        'body': ''
+    }
+
+
+def apply_etag(response, event):
+    """
+    Add an ETag to a successful response and turn it into a 304 when the
+    client already has it
+
+    Handlers that can compute a cheaper ETag (e.g. from a catalog version)
+    set the header themselves; otherwise it is hashed from the body.
+
+    Returns:
+        dict: The response (possibly replaced by a 304)
+    """
+    if response.get('statusCode') != 200 or response.get('isBase64Encoded'):
+        return response
+
+    headers = response.setdefault('headers', {})
+    etag = headers.get('ETag')
+    if not etag:
+        etag = compute_etag(response.get('body') or '')
+        headers['ETag'] = etag
+
+    if etag_matches(event, etag):
+        return not_modified_response(headers, etag)
+    return response
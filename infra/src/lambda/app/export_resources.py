@@ -0,0 +1,310 @@
+import base64
+import gzip
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from app.aws_clients import get_client
+from app.compression import GZIP_LEVEL, parse_accept_encoding
+from app.etag import compute_etag, etag_matches, not_modified_response
+from app.listing_cache import get_catalog_version
+from app.logo_store import get_bucket_config, is_missing_key_error
+from app.resource_model import Resource
+from app.utils import get_header
+
+# /export returns every approved resource (the public detail view) as
+# gzip-compressed NDJSON, one resource per line, newest first. The export is
+# built once per catalog version (see listing_cache), stored in S3 and kept
+# in memory, so requests never rescan the table; only the first request
+# after an admin change (or after EXPORT_MAX_AGE, for view counts and edits
+# made outside the admin API) rebuilds it. The table is read with a parallel
+# segmented scan so a rebuild costs about one page of latency per segment.
+EXPORT_SCAN_SEGMENTS = int(os.environ.get('EXPORT_SCAN_SEGMENTS', '4'))
+
+# Lambda proxy responses are limited to 6 MB and binary bodies grow by a
+# third when base64-encoded; bigger exports are stored in S3 and the client
+# is redirected (303) to a presigned URL instead
+EXPORT_INLINE_MAX_BYTES = int(os.environ.get('EXPORT_INLINE_MAX_BYTES', str(4 * 1024 * 1024)))
+EXPORT_LOCATION = 'exports/approved-resources.ndjson.gz'
+EXPORT_URL_EXPIRES = int(os.environ.get('EXPORT_URL_EXPIRES', '900'))
+EXPORT_MAX_AGE = int(os.environ.get('EXPORT_MAX_AGE', '3600'))
+
+# Shared across warm invocations, one thread per scan segment
+_executor = ThreadPoolExecutor(max_workers=EXPORT_SCAN_SEGMENTS, thread_name_prefix='export-scan')
+
+# Current export (body kept only when it is small enough to return inline)
+_export = None
+_export_lock = threading.Lock()
+
+
+def _scan_segment(table_name, segment, total_segments):
+    """
+    Read every approved item of one scan segment (paginated)
+
+    Returns:
+        tuple: (list of Resource, pages read, items read)
+    """
+    dynamodb = get_client('dynamodb')
+    request = {
+        'TableName': table_name,
+        'FilterExpression': '#resourceStatus = :resourceStatus',
+        'ExpressionAttributeNames': {'#resourceStatus': 'resourceStatus'},
+        'ExpressionAttributeValues': {':resourceStatus': {'S': 'approved'}},
+        'Segment': segment,
+        'TotalSegments': total_segments
+    }
+    resources = []
+    pages = 0
+    items_read = 0
+    while True:
+        response = dynamodb.scan(**request)
+        pages += 1
+        items_read += response.get('ScannedCount', 0)
+        resources.extend(Resource.from_wire(item) for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return resources, pages, items_read
+        request['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def scan_approved_resources(table_name, total_segments=EXPORT_SCAN_SEGMENTS):
+    """
+    Read every approved resource with a parallel segmented scan
+
+    Args:
+        table_name (str): DynamoDB table name
+        total_segments (int): Number of scan segments read concurrently
+
+    Returns:
+        list: Resource objects, newest first (createdAt, then slug, descending)
+    """
+    started = time.perf_counter()
+    results = list(_executor.map(
+        lambda segment: _scan_segment(table_name, segment, total_segments),
+        range(total_segments)
+    ))
+
+    resources = [resource for segment_resources, _, _ in results for resource in segment_resources]
+    # Same order as the listing (createdAt descending), ties broken by slug
+    resources.sort(key=lambda resource: (resource.created_at, resource.slug), reverse=True)
+
+    pages = sum(result[1] for result in results)
+    items_read = sum(result[2] for result in results)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"Export scan: {total_segments} segments, {pages} pages, {items_read} items read, "
+          f"{len(resources)} approved in {elapsed_ms:.0f} ms")
+    return resources
+
+
+def build_export(resources):
+    """
+    Serialize resources as gzip-compressed NDJSON
+
+    The gzip header carries no timestamp, so the same catalog always gives
+    the same bytes (and the same ETag).
+
+    Returns:
+        tuple: (gzip bytes, number of resources written)
+    """
+    buffer = io.BytesIO()
+    count = 0
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=GZIP_LEVEL, mtime=0) as stream:
+        for resource in resources:
+            # Only export resources that have the required fields
+            if not (resource.slug and resource.name):
+                continue
+            stream.write(json.dumps(resource.detail(), separators=(',', ':')).encode('utf-8'))
+            stream.write(b'\n')
+            count += 1
+    return buffer.getvalue(), count
+
+
+def _export_key():
+    bucket_name, prefix = get_bucket_config()
+    if not bucket_name:
+        return None, None
+    return bucket_name, f"{prefix}{EXPORT_LOCATION}"
+
+
+def _is_current(export, catalog_version):
+    return (export is not None
+            and export['catalogVersion'] == catalog_version
+            and time.time() - export['builtAt'] <= EXPORT_MAX_AGE)
+
+
+def _load_stored_export(catalog_version):
+    """
+    Use the export stored in S3 if it was built for this catalog version
+
+    Returns:
+        dict or None: Export, or None when there is no current stored export
+    """
+    bucket_name, key = _export_key()
+    if not bucket_name:
+        return None
+    s3_client = get_client('s3')
+    try:
+        head = s3_client.head_object(Bucket=bucket_name, Key=key)
+    except ClientError as e:
+        if is_missing_key_error(e):
+            return None
+        raise
+
+    metadata = head.get('Metadata') or {}
+    export = {
+        'catalogVersion': metadata.get('catalog-version'),
+        'builtAt': int(metadata.get('built-at') or 0),
+        'count': int(metadata.get('count') or 0),
+        'bytes': head.get('ContentLength', 0),
+        'etag': metadata.get('export-etag'),
+        'data': None
+    }
+    if not export['etag'] or not _is_current(export, catalog_version):
+        return None
+    if export['bytes'] <= EXPORT_INLINE_MAX_BYTES:
+        export['data'] = s3_client.get_object(Bucket=bucket_name, Key=key)['Body'].read()
+        export['bytes'] = len(export['data'])
+    print(f"Loaded stored export for catalog version {catalog_version} ({export['bytes']} bytes)")
+    return export
+
+
+def _build_and_store_export(table_name, catalog_version):
+    """
+    Scan the table, build the export and store it in S3 (when a bucket is configured)
+
+    Returns:
+        dict: Export
+    """
+    data, count = build_export(scan_approved_resources(table_name))
+    export = {
+        'catalogVersion': catalog_version,
+        'builtAt': int(time.time()),
+        'count': count,
+        'bytes': len(data),
+        'etag': compute_etag(data),
+        'data': data
+    }
+    bucket_name, key = _export_key()
+    if bucket_name:
+        get_client('s3').put_object(
+            Bucket=bucket_name,
+            Key=key,
+            Body=data,
+            ContentType='application/x-ndjson',
+            ContentEncoding='gzip',
+            Metadata={
+                'catalog-version': str(catalog_version),
+                'built-at': str(export['builtAt']),
+                'count': str(count),
+                'export-etag': export['etag']
+            }
+        )
+        print(f"Stored export at s3://{bucket_name}/{key} ({len(data)} bytes)")
+    elif len(data) > EXPORT_INLINE_MAX_BYTES:
+        raise RuntimeError('Export is too large to return and could not be stored')
+
+    if len(data) > EXPORT_INLINE_MAX_BYTES:
+        export['data'] = None
+    return export
+
+
+def get_current_export(table_name, catalog_version):
+    """
+    Get the export for the current catalog version
+
+    Served from memory, else from the stored export if it matches, else
+    rebuilt (once per container at a time) and stored.
+
+    Returns:
+        dict: catalogVersion, builtAt, count, bytes, etag and data (gzip bytes,
+              None when the export is only available from S3)
+    """
+    global _export
+    export = _export
+    if _is_current(export, catalog_version):
+        return export
+    with _export_lock:
+        if not _is_current(_export, catalog_version):
+            stored = _load_stored_export(catalog_version)
+            _export = stored or _build_and_store_export(table_name, catalog_version)
+        return _export
+
+
+def export_url():
+    """Presigned GET URL for the stored export"""
+    bucket_name, key = _export_key()
+    return get_client('s3').generate_presigned_url(
+        'get_object',
+        Params={'Bucket': bucket_name, 'Key': key},
+        ExpiresIn=EXPORT_URL_EXPIRES
+    )
+
+
+def accepts_gzip(accept_encoding):
+    """Check whether an Accept-Encoding header allows a gzip content coding"""
+    codings = parse_accept_encoding(accept_encoding or '')
+    return codings.get('gzip', codings.get('*', 0.0)) > 0
+
+
+def handle_export_resources(event, headers, table_name):
+    """
+    Export every approved resource as gzip-compressed NDJSON
+
+    Small exports are returned in the response body: with Content-Encoding:
+    gzip when the client accepts it (fetch decodes it transparently), as an
+    application/gzip file otherwise. Exports over EXPORT_INLINE_MAX_BYTES are
+    answered with a 303 to a presigned URL of the stored export, which fetch
+    follows on its own. If-None-Match with the current ETag gets a 304.
+    """
+    try:
+        export = get_current_export(table_name, get_catalog_version())
+        etag = export['etag']
+        print(f"Exporting {export['count']} approved resources ({export['bytes']} bytes gzipped)")
+
+        if etag_matches(event, etag):
+            return not_modified_response(headers, etag)
+
+        if export['data'] is None:
+            url = export_url()
+            return {
+                'statusCode': 303,
+                'headers': {**headers, 'Location': url, 'ETag': etag},
+                'body': json.dumps({
+                    'success': True,
+                    'data': {
+                        'url': url,
+                        'expiresIn': EXPORT_URL_EXPIRES,
+                        'count': export['count'],
+                        'bytes': export['bytes']
+                    }
+                })
+            }
+
+        export_headers = {**headers, 'ETag': etag, 'Vary': 'Accept-Encoding'}
+        if accepts_gzip(get_header(event, 'Accept-Encoding')):
+            export_headers['Content-Type'] = 'application/x-ndjson'
+            export_headers['Content-Encoding'] = 'gzip'
+        else:
+            export_headers['Content-Type'] = 'application/gzip'
+            export_headers['Content-Disposition'] = 'attachment; filename="approved-resources.ndjson.gz"'
+
+        return {
+            'statusCode': 200,
+            'headers': export_headers,
+            'body': base64.b64encode(export['data']).decode('ascii'),
+            'isBase64Encoded': True
+        }
+
+    except Exception as e:
+        print(f"Error in handle_export_resources: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': json.dumps({
+                'success': False,
+                'message': 'Failed to export resources',
+                'error': str(e)
+            })
+        }
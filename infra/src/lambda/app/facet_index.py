@@ -0,0 +1,228 @@
+import threading
+from app.catalog_snapshot import decode_page_token, encode_page_token
+
+# Facet index over the approved-catalog snapshot. Every facet value (a
+# category, a tag, featured / not featured) is a bitmap stored as a Python
+# int: bit i is set when snapshot entry i (newest first) has that value.
+# Filters are combined with | and &, counts are int.bit_count(), all in C over
+# a few machine words per 64 resources, so a filter plus every facet count
+# takes microseconds and the index is rebuilt only when the snapshot version
+# changes.
+#
+# The bitmaps are dense, not compressed (run-length or roaring): the Lambda
+# package has no bitmap library, and a pure-Python compressed format would
+# turn every AND into an interpreted loop. An int is only as wide as its
+# highest set bit, so the index takes at most (facet values + 3) * resources / 8
+# bytes, about 2.5 MB for 10,000 resources and 2,000 tags, and far less in
+# practice because most tags sit on a few resources. Each query allocates a
+# handful of catalog-wide ints (the combined filters), never one per facet value.
+
+# Facet index for the snapshot version it was built from
+_facet_index = None
+_facet_lock = threading.Lock()
+
+
+def normalize_tag(tag):
+    """Tags match case-insensitively"""
+    return tag.strip().lower()
+
+
+def build_facet_index(snapshot):
+    """
+    Build the category, tag and featured bitmaps for a snapshot
+
+    Returns:
+        dict: version, size, all (every bit set) and the categories, tags,
+              featured and not_featured bitmaps
+    """
+    categories = {}
+    tags = {}
+    featured = 0
+    for position, resource in enumerate(snapshot['resources']):
+        bit = 1 << position
+        category = snapshot['categories'][position]
+        categories[category] = categories.get(category, 0) | bit
+        for tag in resource.get('tags', []):
+            tag = normalize_tag(tag)
+            tags[tag] = tags.get(tag, 0) | bit
+        if resource.get('featured'):
+            featured |= bit
+
+    size = len(snapshot['resources'])
+    everything = (1 << size) - 1
+    return {
+        'version': snapshot['version'],
+        'size': size,
+        'all': everything,
+        'categories': categories,
+        'tags': tags,
+        'featured': featured,
+        'not_featured': everything & ~featured
+    }
+
+
+def get_facet_index(snapshot):
+    """Get the facet index for a snapshot, building it once per snapshot version"""
+    global _facet_index
+    index = _facet_index
+    if index is not None and index['version'] == snapshot['version']:
+        return index
+    with _facet_lock:
+        if _facet_index is None or _facet_index['version'] != snapshot['version']:
+            _facet_index = build_facet_index(snapshot)
+            print(f"Built facet index for catalog snapshot {snapshot['version']}: "
+                  f"{len(_facet_index['categories'])} categories, {len(_facet_index['tags'])} tags")
+        return _facet_index
+
+
+def parse_filters(filters):
+    """
+    Normalize a filters object from a request
+
+    Accepts {'categories': [...], 'tags': [...], 'tagMode': 'all' | 'any', 'featured': bool}.
+    Categories are ORed; tags are ANDed ('all', the default) or ORed ('any');
+    the facets are ANDed together.
+
+    Returns:
+        dict: Normalized filters (sorted lists, so equal filters compare equal)
+
+    Raises:
+        ValueError: If the filters are malformed
+    """
+    if not isinstance(filters, dict):
+        raise ValueError('filters must be an object')
+
+    def string_list(name):
+        value = filters.get(name) or []
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            raise ValueError(f'filters.{name} must be a list of strings')
+        return value
+
+    tag_mode = filters.get('tagMode', 'all')
+    if tag_mode not in ('all', 'any'):
+        raise ValueError("filters.tagMode must be 'all' or 'any'")
+    featured = filters.get('featured')
+    if featured is not None and not isinstance(featured, bool):
+        raise ValueError('filters.featured must be true, false or null')
+
+    return {
+        'categories': sorted(set(category for category in string_list('categories') if category and category != 'all')),
+        'tags': sorted(set(normalize_tag(tag) for tag in string_list('tags') if tag.strip())),
+        'tagMode': tag_mode,
+        'featured': featured
+    }
+
+
+def _category_bitmap(index, filters):
+    if not filters['categories']:
+        return index['all']
+    bitmap = 0
+    for category in filters['categories']:
+        bitmap |= index['categories'].get(category, 0)
+    return bitmap
+
+
+def _tag_bitmap(index, filters):
+    if not filters['tags']:
+        return index['all']
+    tag_bitmaps = [index['tags'].get(tag, 0) for tag in filters['tags']]
+    bitmap = tag_bitmaps[0]
+    for tag_bitmap in tag_bitmaps[1:]:
+        bitmap = bitmap & tag_bitmap if filters['tagMode'] == 'all' else bitmap | tag_bitmap
+    return bitmap
+
+
+def _featured_bitmap(index, filters):
+    if filters['featured'] is None:
+        return index['all']
+    if filters['featured']:
+        return index['featured']
+    return index['not_featured']
+
+
+def query_facets(index, filters):
+    """
+    Apply filters and count every facet value
+
+    Each facet is counted against the other facets' filters only, so the
+    counts say how many results choosing that value would give (selected
+    categories don't zero the other categories' counts).
+
+    Returns:
+        tuple: (matching bitmap, facet counts dict)
+    """
+    categories = _category_bitmap(index, filters)
+    tags = _tag_bitmap(index, filters)
+    featured = _featured_bitmap(index, filters)
+    matches = categories & tags & featured
+
+    without_categories = tags & featured
+    without_featured = categories & tags
+    # With tagMode 'all' a tag narrows the current result; with 'any' it widens
+    # the result without the tag filter
+    tag_base = matches if filters['tagMode'] == 'all' else categories & featured
+
+    counts = {
+        'total': matches.bit_count(),
+        'categories': {
+            category: count
+            for category, bitmap in index['categories'].items()
+            if (count := (bitmap & without_categories).bit_count())
+        },
+        'tags': {
+            tag: count
+            for tag, bitmap in index['tags'].items()
+            if (count := (bitmap & tag_base).bit_count())
+        },
+        'featured': {
+            'true': (index['featured'] & without_featured).bit_count(),
+            'false': (index['not_featured'] & without_featured).bit_count()
+        }
+    }
+    return matches, counts
+
+
+def get_facet_page(snapshot, matches, batch_size, page_token=None):
+    """
+    Slice one page of matching resources, newest first
+
+    Page tokens have the same shape as the /resources tokens; a token whose
+    resource has since been removed resumes at the first resource created
+    before it.
+
+    Returns:
+        tuple: (list of resource dicts, next page token or None)
+    """
+    start = 0
+    last_key = decode_page_token(page_token) if page_token else None
+    if last_key:
+        position = snapshot['positions']['all'].get(last_key.get('resourceSlug'))
+        if position is not None:
+            start = position + 1
+        else:
+            created_at = last_key.get('createdAt', '')
+            start = next(
+                (position for position, value in enumerate(snapshot['createdAt']) if value < created_at),
+                len(snapshot['createdAt'])
+            )
+
+    # Walk the set bits from start: lowest set bit, then clear it
+    remaining = matches >> start
+    page = []
+    while remaining and len(page) < batch_size:
+        lowest = remaining & -remaining
+        page.append(start + lowest.bit_length() - 1)
+        remaining ^= lowest
+
+    next_page_token = None
+    if remaining and page:
+        last = page[-1]
+        next_page_token = encode_page_token({
+            'resourceSlug': snapshot['slugs'][last],
+            'createdAt': snapshot['createdAt'][last],
+            'resourceStatus': 'approved'
+        })
+
+    return [snapshot['resources'][position] for position in page], next_page_token
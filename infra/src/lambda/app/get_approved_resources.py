@@ -1,33 +1,47 @@
 import json
-import boto3
-import base64
-from boto3.dynamodb.conditions import Key
-from decimal import Decimal
+import os
+import time
+from app.aws_clients import get_client
+from app.catalog_snapshot import decode_page_token, encode_page_token, get_catalog_snapshot, get_snapshot_page
+from app.etag import compute_etag
+from app.facet_index import get_facet_index, get_facet_page, parse_filters, query_facets
+from app.listing_cache import cache_listing, get_cached_listing, get_catalog_version, listing_cache_key
+from app.resource_model import SUMMARY_PROJECTION, Resource, key_from_wire, key_to_wire
+from app.timing import span
 
-def decimal_default(obj):
-    """Convert Decimal to float for JSON serialization"""
-    if isinstance(obj, Decimal):
-        return float(obj)
-    raise TypeError
+# A category query applies resourceStatus = approved after Limit, so one call
+# can return few or no matches. The fallback query keeps reading until the
+# batch is full or one of these per-request budgets is used up.
+FILL_MAX_QUERIES = int(os.environ.get('LISTING_FILL_MAX_QUERIES', '5'))
+FILL_MAX_CAPACITY_UNITS = float(os.environ.get('LISTING_FILL_MAX_CAPACITY_UNITS', '25'))
+FILL_TIME_BUDGET_MS = float(os.environ.get('LISTING_FILL_TIME_BUDGET_MS', '1500'))
+# Items read per follow-up query (the first one reads batchSize)
+FILL_QUERY_LIMIT = int(os.environ.get('LISTING_FILL_QUERY_LIMIT', '100'))
+
+# Attributes of a LastEvaluatedKey for each index (table key + index keys)
+INDEX_KEY_ATTRIBUTES = {
+    'ResourceStatusIndex': ('resourceSlug', 'resourceStatus', 'createdAt'),
+    'CategoryIndex': ('resourceSlug', 'category', 'createdAt')
+}
 
 def handle_get_approved_resources(event, headers, table_name):
     """
     Get approved resources for public listing page in batches
     Returns minimal data: slug, title, description, category, tags, featured, image
+
+    Pages are sliced from the approved-catalog snapshot (see catalog_snapshot);
+    DynamoDB is only queried when the snapshot is missing or stale. Serialized
+    pages are cached per container until the catalog version changes (see listing_cache).
+
+    A 'filters' object in the body switches to the faceted listing (see
+    facet_index): several categories and tags, featured, and facet counts,
+    with the same pagination.
     """
     # Configuration variables
-    region = 'us-east-1'
-    status_gsi_name = 'ResourceStatusIndex'      # resourceStatus + createdAt
-    category_gsi_name = 'CategoryIndex'  # category + createdAt
     default_batch_size = 10
     max_batch_size = 50
     
     try:
-        print(f"Getting existing resources from table: {table_name}")
-        
-        dynamodb = boto3.resource('dynamodb', region_name=region)
-        table = dynamodb.Table(table_name)
-        
         # Parse request body for parameters
         body = {}
         if event.get('body'):
@@ -38,109 +52,84 @@ def handle_get_approved_resources(event, headers, table_name):
         
         # Get parameters from request body or query params
         query_params = event.get('queryStringParameters') or {}
-        batch_size = min(
-            int(body.get('batchSize', query_params.get('batchSize', default_batch_size))),
-            max_batch_size
-        )
+        try:
+            batch_size = max(1, min(
+                int(body.get('batchSize', query_params.get('batchSize', default_batch_size))),
+                max_batch_size
+            ))
+        except (TypeError, ValueError):
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': json.dumps({
+                    'success': False,
+                    'message': 'batchSize must be an integer'
+                })
+            }
         page_token = body.get('pageToken', query_params.get('pageToken'))
         category_filter = body.get('category', query_params.get('category', 'all'))
         
         print(f"Request params - batchSize: {batch_size}, category: {category_filter}")
         
-        # Handle pagination token
-        exclusive_start_key = None
-        if page_token:
+        filters = None
+        if 'filters' in body:
             try:
-                exclusive_start_key = json.loads(base64.b64decode(page_token).decode())
-                print(f"Using pagination token")
-            except Exception as e:
-                print(f"Invalid pagination token: {e}")
+                filters = parse_filters(body['filters'])
+            except ValueError as e:
+                return {
+                    'statusCode': 400,
+                    'headers': headers,
+                    'body': json.dumps({
+                        'success': False,
+                        'message': f'Invalid filters: {e}'
+                    })
+                }
+            if not filters['categories'] and category_filter != 'all':
+                filters['categories'] = [category_filter]
         
-        # Choose optimal GSI based on category filter
-        if category_filter != 'all':
-            # Use CategoryIndex for specific category (more efficient)
-            query_params_dynamo = {
-                'IndexName': category_gsi_name,
-                'KeyConditionExpression': Key('category').eq(category_filter),
-                'FilterExpression': Key('resourceStatus').eq('approved'),
-                'ScanIndexForward': False,  # Newest first (createdAt descending)
-                'Limit': batch_size,
-                'ProjectionExpression': (
-                    'resourceSlug, resourceName, usagePurpose, category, '
-                    'tags, featured, logoImage, resourceStatus, createdAt'
-                )
-            }
-            print(f"Using CategoryIndex for category: {category_filter}")
+        catalog_version = get_catalog_version()
+        if filters is not None:
+            cache_key = listing_cache_key(
+                'filters:' + json.dumps(filters, sort_keys=True, separators=(',', ':')), batch_size, page_token
+            )
         else:
-            # Use ResourceStatusIndex for all categories (most efficient for approved-only)
-            query_params_dynamo = {
-                'IndexName': status_gsi_name,
-                'KeyConditionExpression': Key('resourceStatus').eq('approved'),
-                'ScanIndexForward': False,  # Newest first (createdAt descending)
-                'Limit': batch_size,
-                'ProjectionExpression': (
-                    'resourceSlug, resourceName, usagePurpose, resourceUrl, category, '
-                    'tags, featured, logoImage, resourceStatus, createdAt'
-                )
+            cache_key = listing_cache_key(category_filter, batch_size, page_token)
+        cached = get_cached_listing(cache_key, catalog_version)
+        if cached:
+            response_body, etag = cached
+            print(f"Served from listing cache (catalog version {catalog_version})")
+            return {
+                'statusCode': 200,
+                'headers': {**headers, 'ETag': etag},
+                'body': response_body
             }
-            print("Using ResourceStatusIndex for all approved resources")
-        
-        if exclusive_start_key:
-            query_params_dynamo['ExclusiveStartKey'] = exclusive_start_key
-        
-        print(f"Executing DynamoDB query for approved resources")
-        
-        response = table.query(**query_params_dynamo)
-        items = response.get('Items', [])
-        
-        print(f"Retrieved {len(items)} approved resources")
-        
-        # Format resources for frontend (matching resources.json structure)
-        formatted_resources = []
-        for item in items:
-            try:
-                # Parse comma-separated tags
-                tags_list = []
-                if item.get('tags'):
-                    tags_list = [tag.strip() for tag in item['tags'].split(',') if tag.strip()]
-                
-                # Create resource object matching frontend expectations
-                resource = {
-                    'slug': item.get('resourceSlug', ''),
-                    'title': item.get('resourceName', ''),
-                    'description': item.get('usagePurpose', ''),
-                    'category': item.get('category', ''),
-                    'tags': tags_list,
-                    'featured': item.get('featured', False),
-                    'image': item.get('logoImage', '')
-                }
-                
-                # Only add resource if it has required fields
-                if resource['slug'] and resource['title']:
-                    formatted_resources.append(resource)
-                
-            except Exception as e:
-                print(f"Error formatting resource {item.get('resourceSlug', 'unknown')}: {e}")
-                continue
         
-        # Convert Decimal types for JSON serialization
-        formatted_resources = json.loads(
-            json.dumps(formatted_resources, default=decimal_default)
-        )
+        if filters is not None:
+            return get_faceted_resources(
+                headers, filters, category_filter, batch_size, page_token, catalog_version, cache_key
+            )
         
-        # Create next page token for pagination
-        next_page_token = None
-        if 'LastEvaluatedKey' in response:
-            next_page_token = base64.b64encode(
-                json.dumps(response['LastEvaluatedKey']).encode()
-            ).decode()
+        snapshot = get_catalog_snapshot(catalog_version)
+        if snapshot:
+            with span('format'):
+                formatted_resources, next_page_token = get_snapshot_page(
+                    snapshot, category_filter, batch_size, page_token
+                )
+            # The snapshot version identifies the content, so the body needn't be hashed
+            headers = {
+                **headers,
+                'ETag': compute_etag(snapshot['version'], category_filter, str(batch_size), page_token or '')
+            }
+            print(f"Served from catalog snapshot {snapshot['version']}")
+        else:
+            formatted_resources, next_page_token = query_approved_resources(
+                table_name, category_filter, batch_size, page_token
+            )
         
         print(f"Returning {len(formatted_resources)} resources")
         
-        return {
-            'statusCode': 200,
-            'headers': headers,
-            'body': json.dumps({
+        with span('serialize'):
+            response_body = json.dumps({
                 'success': True,
                 'data': {
                     'resources': formatted_resources,
@@ -153,6 +142,14 @@ def handle_get_approved_resources(event, headers, table_name):
                     }
                 }
             })
+
+        etag = headers.get('ETag') or compute_etag(response_body)
+        cache_listing(cache_key, catalog_version, response_body, etag)
+
+        return {
+            'statusCode': 200,
+            'headers': {**headers, 'ETag': etag},
+            'body': response_body
         }
         
     except Exception as e:
@@ -165,4 +162,168 @@ def handle_get_approved_resources(event, headers, table_name):
                 'message': 'Failed to retrieve existing resources',
                 'error': str(e)
             })
-        }
\ No newline at end of file
+        }
+
+
+def get_faceted_resources(headers, filters, category_filter, batch_size, page_token, catalog_version, cache_key):
+    """
+    Build one page of the faceted listing from the catalog snapshot
+
+    DynamoDB can't combine several categories and tags, so there is no index
+    query to fall back to: without a snapshot the request gets a 503 until an
+    admin action or the scheduled job rebuilds it.
+
+    Returns:
+        dict: API Gateway response
+    """
+    snapshot = get_catalog_snapshot(catalog_version)
+    if not snapshot:
+        return {
+            'statusCode': 503,
+            'headers': headers,
+            'body': json.dumps({
+                'success': False,
+                'message': 'Filtered listing is temporarily unavailable'
+            })
+        }
+
+    with span('format'):
+        index = get_facet_index(snapshot)
+        matches, facets = query_facets(index, filters)
+        formatted_resources, next_page_token = get_facet_page(snapshot, matches, batch_size, page_token)
+    print(f"Faceted listing from catalog snapshot {snapshot['version']}: {facets['total']} matches")
+
+    with span('serialize'):
+        response_body = json.dumps({
+            'success': True,
+            'data': {
+                'resources': formatted_resources,
+                'pagination': {
+                    'hasMore': next_page_token is not None,
+                    'nextPageToken': next_page_token,
+                    'batchSize': batch_size,
+                    'count': len(formatted_resources),
+                    'category': category_filter
+                },
+                'filters': filters,
+                'facets': facets
+            }
+        })
+
+    etag = compute_etag(snapshot['version'], cache_key[0], str(batch_size), page_token or '')
+    cache_listing(cache_key, catalog_version, response_body, etag)
+    return {
+        'statusCode': 200,
+        'headers': {**headers, 'ETag': etag},
+        'body': response_body
+    }
+
+
+def query_approved_resources(table_name, category_filter, batch_size, page_token):
+    """
+    Query one page of approved resources from DynamoDB (used when there is no snapshot)
+
+    Returns:
+        tuple: (list of resource dicts, next page token or None)
+    """
+    # Configuration variables
+    status_gsi_name = 'ResourceStatusIndex'      # resourceStatus + createdAt
+    category_gsi_name = 'CategoryIndex'  # category + createdAt
+
+    print(f"Getting existing resources from table: {table_name}")
+    dynamodb = get_client('dynamodb')
+
+    # Handle pagination token (plain key in the token, wire format for the query)
+    exclusive_start_key = None
+    if page_token:
+        exclusive_start_key = decode_page_token(page_token)
+        if exclusive_start_key:
+            print(f"Using pagination token")
+    
+    # Choose optimal GSI based on category filter
+    if category_filter != 'all':
+        # Use CategoryIndex for specific category (more efficient)
+        query_params_dynamo = {
+            'TableName': table_name,
+            'IndexName': category_gsi_name,
+            'KeyConditionExpression': 'category = :category',
+            'FilterExpression': 'resourceStatus = :status',
+            'ExpressionAttributeValues': {':category': {'S': category_filter}, ':status': {'S': 'approved'}},
+            'ScanIndexForward': False,  # Newest first (createdAt descending)
+            'Limit': batch_size,
+            'ProjectionExpression': SUMMARY_PROJECTION
+        }
+        print(f"Using CategoryIndex for category: {category_filter}")
+    else:
+        # Use ResourceStatusIndex for all categories (most efficient for approved-only)
+        query_params_dynamo = {
+            'TableName': table_name,
+            'IndexName': status_gsi_name,
+            'KeyConditionExpression': 'resourceStatus = :status',
+            'ExpressionAttributeValues': {':status': {'S': 'approved'}},
+            'ScanIndexForward': False,  # Newest first (createdAt descending)
+            'Limit': batch_size,
+            'ProjectionExpression': SUMMARY_PROJECTION
+        }
+        print("Using ResourceStatusIndex for all approved resources")
+    
+    query_params_dynamo['ReturnConsumedCapacity'] = 'TOTAL'
+    index_keys = INDEX_KEY_ATTRIBUTES[query_params_dynamo['IndexName']]
+    last_evaluated_key = key_to_wire(exclusive_start_key) if exclusive_start_key else None
+    
+    print(f"Executing DynamoDB query for approved resources")
+    
+    formatted_resources = []
+    last_returned_key = None
+    overflow = False
+    queries = 0
+    items_read = 0
+    capacity_units = 0.0
+    started = time.perf_counter()
+    stop_reason = 'end'
+    
+    while True:
+        if last_evaluated_key:
+            query_params_dynamo['ExclusiveStartKey'] = last_evaluated_key
+        response = dynamodb.query(**query_params_dynamo)
+        queries += 1
+        items_read += response.get('ScannedCount', 0)
+        capacity_units += response.get('ConsumedCapacity', {}).get('CapacityUnits', 0)
+        
+        # Format resources for frontend (matching resources.json structure)
+        with span('format'):
+            for item in response.get('Items', []):
+                if len(formatted_resources) == batch_size:
+                    overflow = True
+                    break
+                last_returned_key = {name: item[name] for name in index_keys if name in item}
+                resource = Resource.from_wire(item)
+                # Only add resource if it has required fields
+                if resource.slug and resource.name:
+                    formatted_resources.append(resource.summary())
+        
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if overflow or len(formatted_resources) == batch_size:
+            stop_reason = 'filled'
+            break
+        if not last_evaluated_key:
+            break
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if (queries >= FILL_MAX_QUERIES or capacity_units >= FILL_MAX_CAPACITY_UNITS
+                or elapsed_ms >= FILL_TIME_BUDGET_MS):
+            stop_reason = 'budget'
+            break
+        query_params_dynamo['Limit'] = max(batch_size, FILL_QUERY_LIMIT)
+    
+    print(f"Retrieved {len(formatted_resources)} approved resources: {queries} queries, {items_read} items read, "
+          f"{capacity_units:g} RCU consumed, stopped: {stop_reason}")
+    
+    # Create next page token for pagination: resume right after the last
+    # returned item when the last response held more matches than fit the batch
+    next_page_token = None
+    if overflow:
+        next_page_token = encode_page_token(key_from_wire(last_returned_key))
+    elif last_evaluated_key:
+        next_page_token = encode_page_token(key_from_wire(last_evaluated_key))
+    
+    return formatted_resources, next_page_token
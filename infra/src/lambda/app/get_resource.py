@@ -1,28 +1,35 @@
-import boto3
 import json
+from datetime import datetime
+from app.aws_clients import get_client
+from app.catalog_snapshot import get_catalog_snapshot, resolve_slugs
+from app.etag import compute_etag, etag_matches, not_modified_response
+from app.listing_cache import get_catalog_version
+from app.resource_model import Resource, parse_related
+from app.timing import span
 
-def parse_learning_resources(learning_resources_str):
+def get_related(resource):
     """
-    Parse pipe-separated JSON learning resources string
-    Returns list of dictionaries
+    Related resources precomputed by the related-resources job, as listing entries
+
+    The item stores only slugs; they are resolved against the in-memory
+    catalog snapshot so removed resources drop out and names are current.
+    Without a snapshot the list is empty and the page falls back to its
+    category listing.
     """
-    # print("event", event)
-    if not learning_resources_str:
+    slugs = parse_related(resource.related_text)
+    if not slugs:
         return []
-    
     try:
-        resources = []
-        for resource_json in learning_resources_str.split('|'):
-            if resource_json.strip():
-                resources.append(json.loads(resource_json))
-        return resources
-    except json.JSONDecodeError:
+        snapshot = get_catalog_snapshot(get_catalog_version())
+    except Exception as e:
+        print(f"Error loading catalog snapshot for related resources: {e}")
         return []
+    return resolve_slugs(snapshot, slugs) if snapshot else []
+
 
 def handle_get_resource(event, headers, table_name):
-    # Initialize DynamoDB client
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table(table_name)
+    # Shared low-level DynamoDB client (items are decoded by Resource.from_wire)
+    dynamodb = get_client('dynamodb')
 
     # Parse the request body to get the slug
     body = json.loads(event.get('body', '{}'))
@@ -40,7 +47,7 @@ def handle_get_resource(event, headers, table_name):
 
     try:
         # Query DynamoDB for the resource
-        response = table.get_item(Key={'resourceSlug': resource_slug})
+        response = dynamodb.get_item(TableName=table_name, Key={'resourceSlug': {'S': resource_slug}})
         item = response.get('Item')
 
         if not item:
@@ -53,8 +60,10 @@ def handle_get_resource(event, headers, table_name):
                 })
             }
 
+        resource = Resource.from_wire(item)
+
         # Only return approved resources to the public
-        if item.get('resourceStatus') != 'approved':
+        if resource.status != 'approved':
             return {
                 'statusCode': 404,
                 'headers': headers,
@@ -64,49 +73,46 @@ def handle_get_resource(event, headers, table_name):
                 })
             }
 
+        with span('related'):
+            related = get_related(resource)
+
         # Transform DynamoDB item to frontend format
-        resource_data = {
-            'slug': item.get('resourceSlug', ''),
-            'title': item.get('resourceName', ''),
-            'name': item.get('resourceName', ''),
-            'url': item.get('resourceUrl', ''),
-            'description': item.get('usagePurpose', ''),
-            'category': item.get('category', ''),
-            'tags': item.get('tags', '').split(',') if item.get('tags') else [],
-            'featured': item.get('featured', False),
-            'image': item.get('logoImage', ''),
-            'keyFeatures': item.get('keyFeatures', '').split('|') if item.get('keyFeatures') else [],
-            'useCases': item.get('useCases', '').split('|') if item.get('useCases') else [],
-            'learningResources': parse_learning_resources(item.get('learningResources', '')),
-            'submittedAt': item.get('submittedAt', ''),
-            'approvedAt': item.get('approvedAt', ''),
-            'viewCount': int(item.get('viewCount', 0))
-        }
+        with span('format'):
+            resource_data = {**resource.detail(), 'related': related}
+
+            # ETag from the stored content; viewCount changes on every view so it is left out
+            etag = compute_etag(json.dumps({**resource_data, 'viewCount': None}, sort_keys=True, default=str))
 
         # Update view count (optional - can be done asynchronously)
         try:
-            from datetime import datetime
-            current_view_count = int(item.get('viewCount', 0))
-            table.update_item(
-                Key={'resourceSlug': resource_slug},
+            dynamodb.update_item(
+                TableName=table_name,
+                Key={'resourceSlug': {'S': resource_slug}},
                 UpdateExpression='ADD viewCount :inc SET lastViewed = :timestamp',
                 ExpressionAttributeValues={
-                    ':inc': 1,
-                    ':timestamp': datetime.utcnow().isoformat() + 'Z'
+                    ':inc': {'N': '1'},
+                    ':timestamp': {'S': datetime.utcnow().isoformat() + 'Z'}
                 }
             )
-            resource_data['viewCount'] = current_view_count + 1
+            resource_data['viewCount'] = resource.view_count + 1
         except Exception as view_error:
             # Don't fail the request if view count update fails
             pass
 
-        return {
-            'statusCode': 200,
-            'headers': headers,
-            'body': json.dumps({
+        # Client already has this version (still counted as a view above)
+        if etag_matches(event, etag):
+            return not_modified_response(headers, etag)
+
+        with span('serialize'):
+            response_body = json.dumps({
                 'success': True,
                 'data': resource_data
             })
+
+        return {
+            'statusCode': 200,
+            'headers': {**headers, 'ETag': etag},
+            'body': response_body
         }
 
     except Exception as e:
@@ -1,29 +1,126 @@
 import json
 import os
-from app.admin_auth import handle_admin_auth
-from app.admin_get_submitted_resources import handle_get_submitted_resources
-from app.admin_update_resource import handle_update_resource
-from app.admin_delete_resource import handle_delete_resource
-from app.admin_approve_resource import handle_approve_resource
-from app.admin_decline_resource import handle_decline_resource
-from app.admin_get_resource import handle_admin_get_resource
-from app.get_approved_resources import handle_get_approved_resources
-from app.submit_resource import handle_submit_resource
-from app.get_resource import handle_get_resource
-from app.upload_logo import handle_upload_logo
-from app.utils import get_parameter
-from app.auth_handler import check_admin_authorization
+import base64
+import binascii
+import importlib
+from collections import namedtuple
+from functools import lru_cache
+from app.compression import compress_response
+from app.etag import apply_etag
+from app.timing import finish_request, set_route, span, start_request
+from app.utils import get_header
+
+# Allowed origins per environment (unknown environments fall back to dev)
+ALLOWED_ORIGINS = {
+    'prod': [
+        'https://kelifax.com',
+        'https://www.kelifax.com'
+    ],
+    'dev': [
+        'http://localhost:4321',
+        'http://localhost:4322',
+        'http://localhost:4323',
+        'https://dev.kelifax.com',
+        'https://www.d2zqbcv5saw2i9.cloudfront.net',
+        'https://d2zqbcv5saw2i9.cloudfront.net'
+    ]
+}
+
+CORS_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Methods': 'GET, POST, PATCH, DELETE, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, X-API-Key, Authorization, X-Amz-Date, X-Amz-Security-Token, Cookie, If-None-Match',
+    'Access-Control-Expose-Headers': 'ETag',
+    'Access-Control-Allow-Credentials': 'true',  # Allow credentials for cookie-based auth
+    'Access-Control-Max-Age': '86400'
+}
+
+# module/handler: handler function inside app.<module>, imported on first use
+# requires_admin: run check_admin_authorization before the handler
+# uses_table: handler takes (event, headers, table_name) instead of (event, headers)
+# conditional: 200 responses get an ETag and If-None-Match is answered with 304
+# batchable: public read route that may be used as an item of a /batch request
+Route = namedtuple('Route', ['module', 'handler', 'requires_admin', 'uses_table', 'conditional', 'batchable'],
+                   defaults=(False, False))
+
+# Route table keyed by (method, normalized path)
+ROUTES = {
+    ('POST', '/admin'): Route('admin_auth', 'handle_admin_auth', False, True),
+    ('POST', '/admin/submitted-resources'): Route('admin_get_submitted_resources', 'handle_get_submitted_resources', True, True),
+    ('POST', '/admin/get-resource'): Route('admin_get_resource', 'handle_admin_get_resource', True, True),
+    ('POST', '/admin/delete-resource'): Route('admin_delete_resource', 'handle_delete_resource', True, True),
+    ('POST', '/admin/approve-resource'): Route('admin_approve_resource', 'handle_approve_resource', True, True),
+    ('POST', '/admin/decline-resource'): Route('admin_decline_resource', 'handle_decline_resource', True, True),
+    ('POST', '/admin/update-resource'): Route('admin_update_resource', 'handle_update_resource', True, True),
+    ('POST', '/submit-resource'): Route('submit_resource', 'handle_submit_resource', False, True),
+    ('POST', '/get-resource'): Route('get_resource', 'handle_get_resource', False, True, True, True),
+    ('POST', '/resources'): Route('get_approved_resources', 'handle_get_approved_resources', False, True, True, True),
+    ('POST', '/search'): Route('search_resources', 'handle_search_resources', False, False, True, True),
+    ('POST', '/autocomplete'): Route('autocomplete', 'handle_autocomplete', False, False, True, True),
+    ('POST', '/export'): Route('export_resources', 'handle_export_resources', False, True),
+    ('POST', '/upload-logo'): Route('upload_logo', 'handle_upload_logo', False, False),
+    ('POST', '/batch'): Route('batch', 'handle_batch', False, True),
+}
+
+# Handlers imported so far in this container, keyed by (module, handler)
+_loaded_handlers = {}
+
+
+def load_handler(module_name, handler_name):
+    """Import app.<module_name> on first use and return its handler function"""
+    key = (module_name, handler_name)
+    handler = _loaded_handlers.get(key)
+    if handler is None:
+        module = importlib.import_module(f'app.{module_name}')
+        handler = getattr(module, handler_name)
+        _loaded_handlers[key] = handler
+    return handler
+
+
+def resolve_route(method, path):
+    """
+    Find the route for a request
+
+    The exact normalized path is tried first (one dict lookup). If it misses,
+    leading segments are dropped one at a time so paths that carry a stage or
+    base-path prefix (e.g. /dev/resources) still match, longest suffix first.
+    """
+    segments = [segment for segment in path.split('/') if segment]
+    for start in range(len(segments)):
+        route = ROUTES.get((method, '/' + '/'.join(segments[start:])))
+        if route:
+            return route
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_cors_config(env):
+    """
+    Build the CORS header sets for an environment once per container
+
+    Returns:
+        tuple: (headers by lowercase origin, default headers for unknown/missing origins)
+    """
+    allowed_origins = ALLOWED_ORIGINS.get(env, ALLOWED_ORIGINS['dev'])
+    headers_by_origin = {
+        origin.lower(): {**CORS_HEADERS, 'Access-Control-Allow-Origin': origin}
+        for origin in allowed_origins
+    }
+    # Default to first allowed origin
+    default_headers = headers_by_origin[allowed_origins[0].lower()]
+    return headers_by_origin, default_headers
+
 
 def lambda_handler(event, context):
     # print(event)
     """
     Single Lambda function to handle all Kelifax API endpoints
-    Routes: POST /resources, POST /admin, GET /resources, PATCH /resources/{slug}, DELETE /resources/{slug}
+    Routes are declared in ROUTES; handler modules are imported the first time their route is hit
     """
-    
+
     # Define allowed origins based on environment
     env = os.environ.get('ENVIRONMENT')
-    
+
     # Verify environment variable exists
     if not env:
         return {
@@ -37,46 +134,18 @@ def lambda_handler(event, context):
                 'error': 'Missing required environment variable: ENVIRONMENT'
             })
         }
-    
-    ALLOWED_ORIGINS = {
-        'prod': [
-            'https://kelifax.com',
-            'https://www.kelifax.com'
-        ],
-        'dev': [
-            'http://localhost:4321',
-            'http://localhost:4322', 
-            'http://localhost:4323',
-            'https://dev.kelifax.com',
-            'https://www.d2zqbcv5saw2i9.cloudfront.net',
-            'https://d2zqbcv5saw2i9.cloudfront.net'
-        ]
-    }
-    
-    allowed_origins = ALLOWED_ORIGINS.get(env, ALLOWED_ORIGINS['dev'])
-    
-    # Check origin header
-    origin = event.get('headers', {}).get('origin', '')
-    origin_lower = origin.lower()
-    
-    # Validate origin (case-insensitive comparison)
-    valid_origin = None
-    for allowed in allowed_origins:
-        if origin_lower == allowed.lower():
-            valid_origin = origin
-            break
-     # CORS headers for all responses (set early to ensure they're always included)
-    headers = {
-        'Content-Type': 'application/json',
-        'Access-Control-Allow-Origin': valid_origin or allowed_origins[0],  # Default to first allowed origin
-        'Access-Control-Allow-Methods': 'GET, POST, PATCH, DELETE, OPTIONS',
-        'Access-Control-Allow-Headers': 'Content-Type, X-API-Key, Authorization, X-Amz-Date, X-Amz-Security-Token, Cookie',
-        'Access-Control-Allow-Credentials': 'true',  # Allow credentials for cookie-based auth
-        'Access-Control-Max-Age': '86400'
-    }
+
+    headers_by_origin, default_headers = get_cors_config(env)
+
+    # Check origin header (case-insensitive comparison)
+    origin = get_header(event, 'Origin')
+    origin_headers = headers_by_origin.get(origin.lower())
+
+    # CORS headers for all responses (copied so handlers can't alter the shared sets)
+    headers = dict(origin_headers or default_headers)
 
     # If origin is not allowed, return 403 WITH CORS headers
-    if origin and not valid_origin:
+    if origin and not origin_headers:
         return {
             'statusCode': 403,
             'headers': headers,
@@ -86,10 +155,10 @@ def lambda_handler(event, context):
                 'origin': origin
             })
         }
-    
+
     # Get DynamoDB table name from environment
     table_name = os.environ.get('DYNAMODB_TABLE', 'kelifax-resources')
-    
+
     # Handle CORS preflight requests
     if event.get('httpMethod') == 'OPTIONS':
         return {
@@ -97,85 +166,32 @@ def lambda_handler(event, context):
             'headers': headers,
             'body': ''
         }
-    
-    method = event.get('httpMethod')
-    path = event.get('path', '')
-    
-    try:
-        # Route: POST /admin
-        if method == 'POST' and path.endswith('/admin'):
-            return handle_admin_auth(event, headers, table_name)
-
-        # Route: GET /admin/submitted-resources (Get Submitted Resources for Admin)
-        elif method == 'POST' and path.endswith('/admin/submitted-resources'):
-            is_authorized, error_response = check_admin_authorization(event, headers)
-            if not is_authorized:
-                return error_response
-            return handle_get_submitted_resources(event, headers, table_name)
-
-        # Route: POST /admin/get-resource (Get Resource by Slug for admin)
-        elif method == 'POST' and path.endswith('admin/get-resource/'):
-            is_authorized, error_response = check_admin_authorization(event, headers)
-            if not is_authorized:
-                return error_response
-            return handle_admin_get_resource(event, headers, table_name)
 
-        # Route: DELETE /admin/delete-resource (Delete Resource by Slug)
-        elif method == 'POST' and path.endswith('/admin/delete-resource'):
-            is_authorized, error_response = check_admin_authorization(event, headers)
-            if not is_authorized:
-                return error_response
-            return handle_delete_resource(event, headers, table_name)
-        
-        # Route: POST /admin/approve-resource (Approve Resource)
-        elif method == 'POST' and path.endswith('/admin/approve-resource'):
-            is_authorized, error_response = check_admin_authorization(event, headers)
-            if not is_authorized:
-                return error_response
-            return handle_approve_resource(event, headers, table_name)
-        
-        # Route: POST /admin/decline-resource (Decline Resource)
-        elif method == 'POST' and path.endswith('/admin/decline-resource'):
-            is_authorized, error_response = check_admin_authorization(event, headers)
-            if not is_authorized:
-                return error_response
-            return handle_decline_resource(event, headers, table_name)
-        
-        # Route: POST /admin/update-resource (Update Resource)
-        elif method == 'POST' and path.endswith('/admin/update-resource'):
-            is_authorized, error_response = check_admin_authorization(event, headers)
-            if not is_authorized:
-                return error_response
-            return handle_update_resource(event, headers, table_name)
-
-        # Route: POST /submit-resource (Submit Resource)
-        elif method == 'POST' and path.endswith('/submit-resource'):
-            return handle_submit_resource(event, headers, table_name)
-
-        # Route: POST /get-resource (Get Resource by Slug)
-        elif method == 'POST' and path.endswith('/get-resource'):
-            return handle_get_resource(event, headers, table_name)
-        
-        # Route: POST /resources existing resources in batches
-        elif method == 'POST' and path.endswith('/resources'):
-            return handle_get_approved_resources(event, headers, table_name)
-
-        # Route: POST /upload-logo (Upload Logo)
-        elif method == 'POST' and path.endswith('/upload-logo'):
-            return handle_upload_logo(event, headers)
-      
-        else:
+    # Binary media types make API Gateway base64-encode request bodies
+    if event.get('isBase64Encoded') and event.get('body'):
+        try:
+            body = base64.b64decode(event['body']).decode('utf-8')
+        except (binascii.Error, UnicodeDecodeError):
             return {
-                'statusCode': 404,
+                'statusCode': 400,
                 'headers': headers,
                 'body': json.dumps({
                     'success': False,
-                    'message': 'Endpoint not found'
+                    'message': 'Invalid request body encoding'
                 })
             }
-            
+        event = {**event, 'body': body, 'isBase64Encoded': False}
+
+    method = (event.get('httpMethod') or '').upper()
+    path = event.get('path') or ''
+
+    # Sampled requests get a Server-Timing header and one EMF metrics log line
+    start_request()
+
+    try:
+        response = dispatch(method, path, event, headers, table_name)
     except Exception as e:
-        return {
+        response = {
             'statusCode': 500,
             'headers': headers,
             'body': json.dumps({
@@ -183,4 +199,49 @@ def lambda_handler(event, context):
                 'message': 'Internal server error',
                 'error': str(e)
             })
-        }
\ No newline at end of file
+        }
+
+    with span('compress'):
+        response = compress_response(response, get_header(event, 'Accept-Encoding'))
+    return finish_request(response)
+
+
+def dispatch(method, path, event, headers, table_name, sub_request=False):
+    """
+    Run the handler for (method, path), checking admin authorization when the route requires it
+
+    sub_request is set for /batch items, which must not rename the route the
+    enclosing request is timed under.
+    """
+    route = resolve_route(method, path)
+    if not route:
+        return {
+            'statusCode': 404,
+            'headers': headers,
+            'body': json.dumps({
+                'success': False,
+                'message': 'Endpoint not found'
+            })
+        }
+
+    if not sub_request:
+        set_route(route.module)
+
+    if route.requires_admin:
+        with span('auth'):
+            check_admin_authorization = load_handler('auth_handler', 'check_admin_authorization')
+            is_authorized, error_response = check_admin_authorization(event, headers)
+        if not is_authorized:
+            return error_response
+
+    with span('handler'):
+        handler = load_handler(route.module, route.handler)
+        if route.uses_table:
+            response = handler(event, headers, table_name)
+        else:
+            response = handler(event, headers)
+
+    if route.conditional:
+        with span('etag'):
+            response = apply_etag(response, event)
+    return response
@@ -0,0 +1,157 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from app.aws_clients import get_client
+from app.utils import get_parameter, set_cached_parameter
+
+# Serialized /resources bodies kept per container, tagged with the catalog
+# version they were built from. Admin actions that change the approved catalog
+# write a new version to SSM (/kelifax/{env}/catalogVersion); every container
+# reads it at most every CATALOG_VERSION_CHECK_INTERVAL seconds and drops
+# entries tagged with an older version.
+CATALOG_VERSION_PARAMETER = 'catalogVersion'
+CATALOG_VERSION_CHECK_INTERVAL = int(os.environ.get('CATALOG_VERSION_CHECK_INTERVAL', '15'))
+
+LISTING_CACHE_MAX_ENTRIES = int(os.environ.get('LISTING_CACHE_MAX_ENTRIES', '256'))
+LISTING_CACHE_MAX_BYTES = int(os.environ.get('LISTING_CACHE_MAX_BYTES', str(4 * 1024 * 1024)))
+
+# Version used while the parameter doesn't exist yet
+INITIAL_CATALOG_VERSION = '0'
+
+# (category, batch_size, page_token) -> (version, body, etag)
+_listing_cache = OrderedDict()
+_listing_lock = threading.Lock()
+_listing_stats = {
+    'hits': 0,
+    'misses': 0,
+    'invalidated': 0,
+    'evictions': 0,
+    'bytes': 0
+}
+
+_catalog_version = None
+_version_lock = threading.Lock()
+
+
+def _version_parameter_name():
+    env = os.environ.get('ENVIRONMENT', 'dev')
+    return f"/kelifax/{env}/{CATALOG_VERSION_PARAMETER}"
+
+
+def get_catalog_version():
+    """
+    Get the current catalog version (read from SSM at most every CATALOG_VERSION_CHECK_INTERVAL seconds)
+
+    The read goes through the parameter cache, which keeps the last known
+    version if SSM fails.
+
+    Returns:
+        str: Catalog version
+    """
+    global _catalog_version
+    version = get_parameter(_version_parameter_name(), max_age=CATALOG_VERSION_CHECK_INTERVAL)
+    version = version or INITIAL_CATALOG_VERSION
+    if version != _catalog_version:
+        with _version_lock:
+            if version != _catalog_version:
+                print(f"Catalog version is now {version}")
+                _catalog_version = version
+    return version
+
+
+def bump_catalog_version():
+    """
+    Publish a new catalog version so every container drops its cached listings
+
+    Returns:
+        str: New version, or None if SSM could not be updated
+    """
+    global _catalog_version
+    version = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+    try:
+        get_client('ssm').put_parameter(
+            Name=_version_parameter_name(),
+            Value=version,
+            Type='String',
+            Overwrite=True
+        )
+    except Exception as e:
+        print(f"Error publishing catalog version: {e}")
+        return None
+
+    set_cached_parameter(_version_parameter_name(), version)
+    with _version_lock:
+        _catalog_version = version
+    clear_listing_cache()
+    print(f"Published catalog version {version}")
+    return version
+
+
+def listing_cache_key(category, batch_size, page_token):
+    """Normalize listing request parameters into a cache key"""
+    return (category or 'all', int(batch_size), page_token or '')
+
+
+def get_cached_listing(key, version):
+    """
+    Look up a cached listing body
+
+    Returns:
+        tuple: (body, etag) or None on a miss or when the entry is from another version
+    """
+    with _listing_lock:
+        entry = _listing_cache.get(key)
+        if entry is None:
+            _listing_stats['misses'] += 1
+            return None
+        if entry[0] != version:
+            _remove(key)
+            _listing_stats['invalidated'] += 1
+            _listing_stats['misses'] += 1
+            return None
+        _listing_cache.move_to_end(key)
+        _listing_stats['hits'] += 1
+        return entry[1], entry[2]
+
+
+def cache_listing(key, version, body, etag=None):
+    """Store a serialized listing body, evicting least recently used entries over the limits"""
+    size = len(body)
+    if size > LISTING_CACHE_MAX_BYTES:
+        return
+    with _listing_lock:
+        _remove(key)
+        _listing_cache[key] = (version, body, etag)
+        _listing_stats['bytes'] += size
+        while (len(_listing_cache) > LISTING_CACHE_MAX_ENTRIES
+               or _listing_stats['bytes'] > LISTING_CACHE_MAX_BYTES):
+            oldest = next(iter(_listing_cache))
+            _remove(oldest)
+            _listing_stats['evictions'] += 1
+
+
+def _remove(key):
+    """Drop an entry and its size (caller holds _listing_lock)"""
+    entry = _listing_cache.pop(key, None)
+    if entry is not None:
+        _listing_stats['bytes'] -= len(entry[1])
+
+
+def clear_listing_cache():
+    """Forget all cached listings"""
+    with _listing_lock:
+        _listing_cache.clear()
+        _listing_stats['bytes'] = 0
+
+
+def get_listing_cache_stats():
+    """
+    Get the listing cache counters for this container
+
+    Returns:
+        dict: hits, misses, invalidated, evictions, bytes, entries and version
+    """
+    with _listing_lock:
+        return {**_listing_stats, 'entries': len(_listing_cache), 'version': _catalog_version}
@@ -0,0 +1,254 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from app.utils import get_parameter
+from app.aws_clients import get_client
+
+# Logo lifecycle: uploads/temp/ -> logos/pending/ (submitted) -> logos/approved/ (approved)
+LOCATIONS = {
+    'temp': 'uploads/temp/',
+    'pending': 'logos/pending/',
+    'approved': 'logos/approved/'
+}
+
+# DeleteObjects accepts at most 1000 keys per call
+DELETE_OBJECTS_MAX_KEYS = 1000
+BATCH_COPY_WORKERS = 8
+
+MISSING_KEY_ERROR_CODES = ('NoSuchKey', '404', 'NotFound')
+
+# (bucket_name, prefix) parsed once per container
+_bucket_config = None
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def parse_bucket_url(bucket_url):
+    """
+    Parse an S3 URL into bucket name and key prefix
+
+    Example: 's3://kelifax-resources/dev' -> ('kelifax-resources', 'dev/')
+
+    Returns:
+        tuple: (bucket_name, prefix) or (None, None) if the URL is invalid
+    """
+    if not bucket_url or not bucket_url.startswith('s3://'):
+        return None, None
+
+    bucket_name, _, prefix = bucket_url[5:].partition('/')
+    if not bucket_name:
+        return None, None
+    # Ensure prefix ends with '/' if not empty
+    if prefix and not prefix.endswith('/'):
+        prefix += '/'
+    return bucket_name, prefix
+
+
+def get_bucket_config():
+    """
+    Get the resources bucket and prefix from /kelifax/{env}/bucketResources
+
+    Returns:
+        tuple: (bucket_name, prefix) or (None, None) if error
+
+    Example return values:
+        - Dev: ('kelifax-resources', 'dev/')
+        - Prod: ('kelifax-resources', 'prod/')
+    """
+    global _bucket_config
+    if _bucket_config is not None:
+        return _bucket_config
+
+    environment = os.environ.get('ENVIRONMENT', 'dev').lower()
+    parameter_name = f"/kelifax/{'prod' if environment == 'prod' else 'dev'}/bucketResources"
+    bucket_url = get_parameter(parameter_name)
+
+    if not bucket_url:
+        print(f"No bucket URL found for parameter {parameter_name}")
+        return None, None
+
+    bucket_config = parse_bucket_url(bucket_url)
+    if not bucket_config[0]:
+        print(f"Invalid S3 URL format: {bucket_url}")
+        return None, None
+
+    # Only cache a valid configuration so a missing parameter is retried
+    _bucket_config = bucket_config
+    return bucket_config
+
+
+def logo_key(prefix, location, logo_filename):
+    """Build the S3 key of a logo, e.g. ('dev/', 'pending', 'a.png') -> 'dev/logos/pending/a.png'"""
+    return f"{prefix}{LOCATIONS[location]}{logo_filename}"
+
+
+def is_missing_key_error(error):
+    """Check whether a ClientError means the object does not exist"""
+    return error.response.get('Error', {}).get('Code') in MISSING_KEY_ERROR_CODES
+
+
+def upload_temp_logo(logo_filename, data, content_type, metadata=None):
+    """
+    Store an uploaded logo under uploads/temp/
+
+    Returns:
+        tuple: (bucket_name, key) or (None, None) if the bucket isn't configured
+    """
+    bucket_name, prefix = get_bucket_config()
+    if not bucket_name:
+        return None, None
+
+    key = logo_key(prefix, 'temp', logo_filename)
+    get_client('s3').put_object(
+        Bucket=bucket_name,
+        Key=key,
+        Body=data,
+        ContentType=content_type,
+        Metadata=metadata or {}
+    )
+    return bucket_name, key
+
+
+def _copy_logo(bucket_name, prefix, logo_filename, source, destination):
+    """Copy one logo; a missing source makes CopyObject fail, so no HEAD is needed"""
+    source_key = logo_key(prefix, source, logo_filename)
+    try:
+        get_client('s3').copy_object(
+            CopySource={'Bucket': bucket_name, 'Key': source_key},
+            Bucket=bucket_name,
+            Key=logo_key(prefix, destination, logo_filename)
+        )
+        return True
+    except ClientError as e:
+        if is_missing_key_error(e):
+            print(f"Source logo file not found: s3://{bucket_name}/{source_key}")
+        else:
+            print(f"Error copying logo file {logo_filename}: {e}")
+        return False
+
+
+def _delete_keys(bucket_name, keys):
+    """
+    Delete keys with DeleteObjects (1000 per request)
+
+    Returns:
+        set: Keys that could not be deleted
+    """
+    s3_client = get_client('s3')
+    failed = set()
+    for start in range(0, len(keys), DELETE_OBJECTS_MAX_KEYS):
+        chunk = keys[start:start + DELETE_OBJECTS_MAX_KEYS]
+        try:
+            response = s3_client.delete_objects(
+                Bucket=bucket_name,
+                Delete={'Objects': [{'Key': key} for key in chunk], 'Quiet': True}
+            )
+            for error in response.get('Errors', []):
+                print(f"Error deleting {error.get('Key')}: {error.get('Code')} {error.get('Message')}")
+                failed.add(error.get('Key'))
+        except Exception as e:
+            print(f"Error deleting {len(chunk)} logo file(s): {e}")
+            failed.update(chunk)
+    return failed
+
+
+def delete_logos(logo_filenames, location):
+    """
+    Delete many logos from one location with batched DeleteObjects calls
+
+    Returns:
+        dict: logo filename -> True if gone, False if S3 failed
+    """
+    bucket_name, prefix = get_bucket_config()
+    if not bucket_name:
+        print("Could not get bucket configuration")
+        return {logo_filename: False for logo_filename in logo_filenames}
+
+    keys = {logo_filename: logo_key(prefix, location, logo_filename) for logo_filename in logo_filenames}
+    failed = _delete_keys(bucket_name, list(dict.fromkeys(keys.values())))
+    return {logo_filename: key not in failed for logo_filename, key in keys.items()}
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=BATCH_COPY_WORKERS, thread_name_prefix='logo-store')
+    return _executor
+
+
+def move_logos(logo_filenames, source, destination):
+    """
+    Move many logos between lifecycle locations
+
+    Copies run concurrently (S3 has no batch copy); the sources of all
+    successful copies are then removed with batched DeleteObjects calls.
+
+    Returns:
+        dict: logo filename -> True if moved, False otherwise
+    """
+    logo_filenames = list(dict.fromkeys(logo_filenames))
+    bucket_name, prefix = get_bucket_config()
+    if not bucket_name:
+        print("Could not get bucket configuration")
+        return {logo_filename: False for logo_filename in logo_filenames}
+
+    def copy(logo_filename):
+        return _copy_logo(bucket_name, prefix, logo_filename, source, destination)
+
+    # A single logo (the admin actions) is copied inline rather than on the pool
+    if len(logo_filenames) == 1:
+        copied = [copy(logo_filenames[0])]
+    else:
+        copied = list(_get_executor().map(copy, logo_filenames))
+
+    results = dict(zip(logo_filenames, copied))
+    source_keys = {
+        logo_key(prefix, source, logo_filename): logo_filename
+        for logo_filename, ok in results.items() if ok
+    }
+    # A failed delete leaves a stray source copy behind, but the logo did reach its destination
+    for key in _delete_keys(bucket_name, list(source_keys)):
+        print(f"Logo {source_keys[key]} moved but its source copy was not removed")
+    return results
+
+
+def move_logo(logo_filename, source, destination):
+    """
+    Move one logo between lifecycle locations ('temp', 'pending', 'approved')
+
+    Two requests: CopyObject (fails when the source is missing) then DeleteObjects.
+
+    Returns:
+        bool: True if moved, False if the source is missing or S3 failed
+    """
+    try:
+        moved = move_logos([logo_filename], source, destination)[logo_filename]
+    except Exception as e:
+        print(f"Error moving logo file {logo_filename}: {e}")
+        return False
+    if moved:
+        print(f"Successfully moved logo {logo_filename} from {LOCATIONS[source]} to {LOCATIONS[destination]}")
+    return moved
+
+
+def delete_logo(logo_filename, location):
+    """
+    Delete one logo from a lifecycle location
+
+    Deleting a missing key succeeds, so this is a single request and deleting
+    a missing logo counts as success.
+
+    Returns:
+        bool: True if the logo is gone, False if S3 failed
+    """
+    try:
+        deleted = delete_logos([logo_filename], location)[logo_filename]
+    except Exception as e:
+        print(f"Error deleting logo file {logo_filename} from {location}: {e}")
+        return False
+    if deleted:
+        print(f"Deleted logo {logo_filename} from {LOCATIONS[location]}")
+    return deleted
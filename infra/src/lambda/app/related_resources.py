@@ -0,0 +1,215 @@
+import json
+import math
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from botocore.exceptions import ClientError
+from app.aws_clients import get_client
+from app.catalog_snapshot import read_approved_resources
+from app.resource_model import split_features, split_tags
+from app.search_index import tokenize
+
+# Batch job (its own Lambda function, run on a schedule) that precomputes the
+# related resources shown on each resource page. Every approved resource is a
+# TF-IDF vector over its tags, category, key features and use cases; the
+# slugs of its top cosine neighbours are written to the item's
+# relatedResources attribute. /get-resource resolves them against the
+# in-memory catalog snapshot, so removed resources drop out and names stay
+# current between runs, with no extra queries.
+#
+# The similarity matrix is never held whole: rows are multiplied against the
+# full matrix one block at a time, and the block height is chosen so a block
+# of scores fits in RELATED_BLOCK_MEMORY_MB. The vocabulary is capped so the
+# TF-IDF matrix fits in RELATED_MATRIX_MEMORY_MB.
+RELATED_PROJECTION = (
+    'resourceSlug, resourceName, category, tags, keyFeatures, useCases, relatedResources'
+)
+
+RELATED_COUNT = int(os.environ.get('RELATED_COUNT', '6'))
+# Neighbours scoring below this cosine similarity are not worth showing
+RELATED_MIN_SCORE = float(os.environ.get('RELATED_MIN_SCORE', '0.05'))
+RELATED_MAX_FEATURES = int(os.environ.get('RELATED_MAX_FEATURES', '4096'))
+RELATED_MATRIX_MEMORY_MB = int(os.environ.get('RELATED_MATRIX_MEMORY_MB', '512'))
+RELATED_BLOCK_MEMORY_MB = int(os.environ.get('RELATED_BLOCK_MEMORY_MB', '256'))
+RELATED_WRITE_WORKERS = int(os.environ.get('RELATED_WRITE_WORKERS', '8'))
+
+# Tags and the category are curated, so they count for more than a word
+# from the free-text key features and use cases
+TAG_WEIGHT = 3
+CATEGORY_WEIGHT = 2
+
+# Bytes per score in a block: float32 scores plus the int64 indices argpartition returns
+_BLOCK_BYTES_PER_SCORE = 4 + 8
+
+
+def resource_terms(resource):
+    """Weighted term counts of one resource (tags and category are single terms)"""
+    terms = Counter()
+    for tag in split_tags(resource.tags_text):
+        terms[f'tag:{tag.lower()}'] += TAG_WEIGHT
+    if resource.category:
+        terms[f'category:{resource.category.lower()}'] += CATEGORY_WEIGHT
+    for text in split_features(resource.key_features_text) + split_features(resource.use_cases_text):
+        terms.update(tokenize(text))
+    return terms
+
+
+def build_tfidf_matrix(documents, max_features=RELATED_MAX_FEATURES):
+    """
+    Build the L2-normalized TF-IDF matrix for a list of term Counters
+
+    Terms found in a single document can't relate two resources and are
+    dropped; of the rest, the max_features most common are kept.
+
+    Returns:
+        numpy.ndarray: float32 matrix, one row per document (all-zero when
+                       a document shares no term with any other)
+    """
+    document_frequency = Counter()
+    for terms in documents:
+        document_frequency.update(terms.keys())
+
+    shared = [term for term, frequency in document_frequency.items() if frequency > 1]
+    shared.sort(key=lambda term: (-document_frequency[term], term))
+    vocabulary = {term: column for column, term in enumerate(shared[:max_features])}
+
+    total = len(documents)
+    idf = np.array(
+        [math.log((1 + total) / (1 + document_frequency[term])) + 1 for term in vocabulary],
+        dtype=np.float32
+    )
+
+    matrix = np.zeros((total, len(vocabulary)), dtype=np.float32)
+    for row, terms in enumerate(documents):
+        for term, count in terms.items():
+            column = vocabulary.get(term)
+            if column is not None:
+                # Sublinear tf: a word repeated across features shouldn't dominate
+                matrix[row, column] = 1 + math.log(count)
+
+    matrix *= idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def top_neighbours(matrix, count=RELATED_COUNT, min_score=RELATED_MIN_SCORE,
+                   block_memory=RELATED_BLOCK_MEMORY_MB * 1024 * 1024):
+    """
+    Top cosine neighbours of every row, computed one block of rows at a time
+
+    Args:
+        matrix (numpy.ndarray): L2-normalized rows (cosine similarity is the dot product)
+        count (int): Neighbours per row
+        min_score (float): Lowest similarity kept
+        block_memory (int): Bytes a block of scores may use
+
+    Returns:
+        list: For each row, a list of (row index, score) best first
+    """
+    total = matrix.shape[0]
+    count = min(count, total - 1)
+    if count <= 0:
+        return [[] for _ in range(total)]
+
+    block_size = max(1, block_memory // (total * _BLOCK_BYTES_PER_SCORE))
+    neighbours = []
+    for start in range(0, total, block_size):
+        end = min(start + block_size, total)
+        # matrix.T is a view; BLAS reads it transposed without a copy
+        scores = matrix[start:end] @ matrix.T
+        # A resource is not related to itself
+        scores[np.arange(end - start), np.arange(start, end)] = -1.0
+
+        candidates = np.argpartition(scores, -count, axis=1)[:, -count:]
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        # Best first; equal scores in row order so reruns give the same lists
+        order = np.lexsort((candidates, -candidate_scores), axis=1)
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+        for row_candidates, row_scores in zip(candidates.tolist(), candidate_scores.tolist()):
+            neighbours.append([
+                (candidate, score) for candidate, score in zip(row_candidates, row_scores)
+                if score >= min_score
+            ])
+    return neighbours
+
+
+def _store_related(table_name, slug, related_text):
+    """
+    Write one resource's related list
+
+    Returns:
+        bool: False if the resource is no longer approved
+    """
+    try:
+        get_client('dynamodb').update_item(
+            TableName=table_name,
+            Key={'resourceSlug': {'S': slug}},
+            UpdateExpression='SET relatedResources = :related',
+            ConditionExpression='resourceStatus = :approved',
+            ExpressionAttributeValues={
+                ':related': {'S': related_text},
+                ':approved': {'S': 'approved'}
+            }
+        )
+        return True
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            return False
+        raise
+
+
+def rebuild_related_resources(table_name):
+    """
+    Recompute related resources for the whole approved catalog
+
+    Only items whose related list changed are written.
+
+    Returns:
+        dict: Job statistics
+    """
+    started = time.perf_counter()
+    resources = [
+        resource for resource in read_approved_resources(table_name, RELATED_PROJECTION)
+        if resource.slug and resource.name
+    ]
+    # Stable row order, so ties between neighbours resolve the same way every run
+    resources.sort(key=lambda resource: resource.slug)
+    read_ms = (time.perf_counter() - started) * 1000
+
+    documents = [resource_terms(resource) for resource in resources]
+    memory_features = (RELATED_MATRIX_MEMORY_MB * 1024 * 1024) // (max(len(resources), 1) * 4)
+    matrix = build_tfidf_matrix(documents, min(RELATED_MAX_FEATURES, memory_features))
+    neighbours = top_neighbours(matrix)
+    compute_ms = (time.perf_counter() - started) * 1000 - read_ms
+
+    changes = []
+    for resource, resource_neighbours in zip(resources, neighbours):
+        related_text = json.dumps([resources[row].slug for row, _ in resource_neighbours])
+        if related_text != resource.related_text:
+            changes.append((resource.slug, related_text))
+
+    with ThreadPoolExecutor(max_workers=RELATED_WRITE_WORKERS, thread_name_prefix='related-write') as executor:
+        stored = list(executor.map(lambda change: _store_related(table_name, *change), changes))
+
+    stats = {
+        'resources': len(resources),
+        'features': matrix.shape[1],
+        'updated': sum(stored),
+        'skipped': len(stored) - sum(stored),
+        'readMs': round(read_ms),
+        'computeMs': round(compute_ms),
+        'totalMs': round((time.perf_counter() - started) * 1000)
+    }
+    print(f"Related resources: {json.dumps(stats)}")
+    return stats
+
+
+def lambda_handler(event, context):
+    """Scheduled entry point of the related-resources job"""
+    table_name = os.environ.get('DYNAMODB_TABLE', 'kelifax-resources')
+    return rebuild_related_resources(table_name)
@@ -0,0 +1,200 @@
+import json
+
+# DynamoDB attribute -> Resource slot, read straight from the low-level client
+# wire format ({'S': ...}, {'N': ...}, {'BOOL': ...}). An attribute that is
+# missing or stored with a different type gets the default.
+# (slot, attribute, wire type, default)
+RESOURCE_SCHEMA = (
+    ('slug', 'resourceSlug', 'S', ''),
+    ('name', 'resourceName', 'S', ''),
+    ('url', 'resourceUrl', 'S', ''),
+    ('description', 'usagePurpose', 'S', ''),
+    ('category', 'category', 'S', ''),
+    ('tags_text', 'tags', 'S', ''),
+    ('featured', 'featured', 'BOOL', False),
+    ('image', 'logoImage', 'S', ''),
+    ('key_features_text', 'keyFeatures', 'S', ''),
+    ('use_cases_text', 'useCases', 'S', ''),
+    ('learning_resources_text', 'learningResources', 'S', ''),
+    ('search_text', 'searchText', 'S', ''),
+    ('related_text', 'relatedResources', 'S', ''),
+    ('status', 'resourceStatus', 'S', ''),
+    ('created_at', 'createdAt', 'S', ''),
+    ('submitted_at', 'submittedAt', 'S', ''),
+    ('approved_at', 'approvedAt', 'S', ''),
+    ('view_count', 'viewCount', 'N', 0),
+    ('submitter_email', 'submitterEmail', 'S', ''),
+    ('submitter_first_name', 'submitterFirstName', 'S', ''),
+    ('submitter_last_name', 'submitterLastName', 'S', ''),
+    ('submitter_company', 'submitterCompany', 'S', ''),
+)
+
+# Attributes needed for the listing summary (GSI queries and the catalog snapshot)
+SUMMARY_PROJECTION = (
+    'resourceSlug, resourceName, usagePurpose, category, '
+    'tags, featured, logoImage, resourceStatus, createdAt'
+)
+
+# Attributes needed for the admin pending queue (details are fetched on demand)
+SUBMISSION_SUMMARY_PROJECTION = (
+    'resourceSlug, resourceName, resourceUrl, usagePurpose, category, tags, featured, '
+    'logoImage, resourceStatus, createdAt, submittedAt, '
+    'submitterEmail, submitterFirstName, submitterLastName, submitterCompany'
+)
+
+
+def parse_number(text):
+    """Convert a DynamoDB N value to int (or float when it has a fraction/exponent)"""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def split_tags(tags_text):
+    """Comma-separated tags -> list, trimmed and without empty entries"""
+    if not tags_text:
+        return []
+    return [tag.strip() for tag in tags_text.split(',') if tag.strip()]
+
+
+def split_features(features_text):
+    """Pipe-separated key features / use cases -> list"""
+    return features_text.split('|') if features_text else []
+
+
+def parse_learning_resources(learning_resources_str):
+    """
+    Parse pipe-separated JSON learning resources string
+    Returns list of dictionaries
+    """
+    if not learning_resources_str:
+        return []
+
+    try:
+        resources = []
+        for resource_json in learning_resources_str.split('|'):
+            if resource_json.strip():
+                resources.append(json.loads(resource_json))
+        return resources
+    except json.JSONDecodeError:
+        return []
+
+
+def parse_related(related_text):
+    """
+    Parse the JSON list of related resource slugs written by the related-resources job
+    Returns list of slugs
+    """
+    if not related_text:
+        return []
+
+    try:
+        slugs = json.loads(related_text)
+    except json.JSONDecodeError:
+        return []
+    return [slug for slug in slugs if isinstance(slug, str)] if isinstance(slugs, list) else []
+
+
+class Resource:
+    """
+    A resource item decoded once from DynamoDB, with one method per API view
+
+    Build it with Resource.from_wire(item) from a low-level client item.
+    """
+
+    __slots__ = tuple(slot for slot, _, _, _ in RESOURCE_SCHEMA)
+
+    def summary(self):
+        """Listing entry for /resources (matching resources.json structure)"""
+        return {
+            'slug': self.slug,
+            'title': self.name,
+            'description': self.description,
+            'category': self.category,
+            'tags': split_tags(self.tags_text),
+            'featured': self.featured,
+            'image': self.image
+        }
+
+    def detail(self):
+        """Public resource page data for /get-resource"""
+        return {
+            'slug': self.slug,
+            'title': self.name,
+            'name': self.name,
+            'url': self.url,
+            'description': self.description,
+            'category': self.category,
+            'tags': split_tags(self.tags_text),
+            'featured': self.featured,
+            'image': self.image,
+            'keyFeatures': split_features(self.key_features_text),
+            'useCases': split_features(self.use_cases_text),
+            'learningResources': parse_learning_resources(self.learning_resources_text),
+            'submittedAt': self.submitted_at,
+            'approvedAt': self.approved_at,
+            'viewCount': self.view_count
+        }
+
+    def admin_detail(self):
+        """Resource data for /admin/get-resource (detail plus status)"""
+        return {**self.detail(), 'status': self.status or 'submitted'}
+
+    def submission_summary(self):
+        """Pending queue entry for /admin/submitted-resources (no key features, use cases or learning resources)"""
+        return {
+            'resourceSlug': self.slug,
+            'resourceStatus': self.status,
+            'title': self.name,
+            'description': self.description,
+            'url': self.url,
+            'tags': split_tags(self.tags_text),
+            'category': self.category,
+            'featured': self.featured,
+            'createdAt': self.created_at,
+            'submissionTimestamp': self.submitted_at,
+            'submitterEmail': self.submitter_email,
+            'submitterName': f"{self.submitter_first_name} {self.submitter_last_name}".strip(),
+            'submitterCompany': self.submitter_company,
+            'logoImage': self.image
+        }
+
+
+def _compile_decoder(schema):
+    """
+    Generate the wire-format decoder for a schema (once, at import)
+
+    The generated function does one dict lookup and one type check per
+    attribute, with no per-field function calls or type dispatch:
+
+        value = item.get('resourceSlug')
+        resource.slug = value['S'] if value is not None and 'S' in value else ''
+    """
+    lines = ['def from_wire(item):', '    resource = _new(Resource)']
+    for slot, attribute, wire_type, default in schema:
+        lines.append(f'    value = item.get({attribute!r})')
+        if wire_type == 'N':
+            read = f"parse_number(value['N'])"
+        else:
+            read = f"value[{wire_type!r}]"
+        lines.append(f'    resource.{slot} = {read} if value is not None and {wire_type!r} in value else {default!r}')
+    lines.append('    return resource')
+
+    namespace = {'_new': object.__new__, 'Resource': Resource, 'parse_number': parse_number}
+    exec('\n'.join(lines), namespace)
+    return namespace['from_wire']
+
+
+_from_wire = _compile_decoder(RESOURCE_SCHEMA)
+Resource.from_wire = staticmethod(_from_wire)
+
+
+def key_to_wire(key):
+    """Plain string key ({'resourceSlug': 'x', ...}) -> wire format ExclusiveStartKey"""
+    return {name: {'S': value} for name, value in key.items()}
+
+
+def key_from_wire(key):
+    """Wire format LastEvaluatedKey -> plain string key (the pageToken shape)"""
+    return {name: value['S'] for name, value in key.items()}
@@ -0,0 +1,376 @@
+import gzip
+import heapq
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from botocore.exceptions import ClientError
+from app.aws_clients import get_client
+from app.catalog_snapshot import read_approved_resources
+from app.logo_store import get_bucket_config, is_missing_key_error
+from app.resource_model import SUMMARY_PROJECTION, split_tags
+
+# Inverted index over the approved catalog for /search, stored gzipped next to
+# the catalog snapshot ({prefix}catalog/search-index.json.gz). Documents are
+# searchText (name, category, tags, key features), usagePurpose and tags;
+# postings are flat [docId, tf, docId, tf, ...] lists scored with BM25.
+# Approve/delete patch the stored index in place, and the scheduled catalog
+# refresh (app.catalog_refresh) rebuilds it from DynamoDB. Public reads only
+# load it; while it is missing or older than SEARCH_INDEX_MAX_AGE there is none.
+SEARCH_INDEX_LOCATION = 'catalog/search-index.json.gz'
+SEARCH_INDEX_FORMAT = 1
+
+SEARCH_INDEX_CHECK_INTERVAL = int(os.environ.get('SEARCH_INDEX_CHECK_INTERVAL', '30'))
+SEARCH_INDEX_MAX_AGE = int(os.environ.get('SEARCH_INDEX_MAX_AGE', '86400'))
+
+SEARCH_PROJECTION = SUMMARY_PROJECTION + ', searchText'
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_QUERY_TERMS = 16
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into', 'is', 'it',
+    'its', 'of', 'on', 'or', 'that', 'the', 'to', 'with', 'your', 'you'
+))
+
+# Loaded index (None until the first check), when it was last revalidated
+# and the catalog version (see listing_cache) seen at that time
+_index = None
+_checked_at = None
+_checked_version = None
+_index_lock = threading.Lock()
+
+
+def tokenize(text):
+    """Lowercase text -> search terms (alphanumeric runs, stopwords dropped)"""
+    return [term for term in TOKEN_RE.findall(text.lower()) if term not in STOPWORDS]
+
+
+def document_terms(resource):
+    """Term frequencies of one resource's searchable text"""
+    # Items submitted before searchText existed fall back to name and category
+    search_text = resource.search_text or f"{resource.name} {resource.category}"
+    text = ' '.join((search_text, resource.description, ' '.join(split_tags(resource.tags_text))))
+    return Counter(tokenize(text))
+
+
+def _add_document(document, resource):
+    """Append a resource to a stored index document"""
+    terms = document_terms(resource)
+    doc_id = len(document['docs'])
+    document['docs'].append({'resource': resource.summary(), 'length': sum(terms.values())})
+    postings = document['postings']
+    for term, frequency in terms.items():
+        postings.setdefault(term, []).extend((doc_id, frequency))
+
+
+def _remove_document(document, slug):
+    """
+    Remove a resource from a stored index document
+
+    Later doc ids shift down by one so ids stay positions in 'docs'.
+
+    Returns:
+        bool: True if the resource was in the index
+    """
+    doc_id = next((i for i, doc in enumerate(document['docs']) if doc['resource']['slug'] == slug), None)
+    if doc_id is None:
+        return False
+    del document['docs'][doc_id]
+
+    postings = document['postings']
+    for term in list(postings):
+        flat = postings[term]
+        kept = []
+        for i in range(0, len(flat), 2):
+            posting_doc = flat[i]
+            if posting_doc != doc_id:
+                kept.append(posting_doc - 1 if posting_doc > doc_id else posting_doc)
+                kept.append(flat[i + 1])
+        if kept:
+            postings[term] = kept
+        else:
+            del postings[term]
+    return True
+
+
+def _new_document():
+    now = int(time.time())
+    return {
+        'format': SEARCH_INDEX_FORMAT,
+        'builtAt': now,
+        'updatedAt': now,
+        'updatedAtIso': datetime.utcnow().isoformat() + 'Z',
+        'docs': [],
+        'postings': {}
+    }
+
+
+def _prepare(document, etag):
+    """
+    Build the in-memory form of an index document
+
+    Precomputes the BM25 length normalization of every document so a query
+    only does one multiply-add per posting.
+    """
+    docs = document['docs']
+    average_length = (sum(doc['length'] for doc in docs) / len(docs)) if docs else 0.0
+    norms = [
+        BM25_K1 * (1 - BM25_B + BM25_B * doc['length'] / average_length) if average_length else BM25_K1
+        for doc in docs
+    ]
+    return {
+        'etag': etag,
+        'document': document,
+        'builtAt': document['builtAt'],
+        'resources': [doc['resource'] for doc in docs],
+        'postings': document['postings'],
+        'norms': norms
+    }
+
+
+def _index_key():
+    bucket_name, prefix = get_bucket_config()
+    if not bucket_name:
+        return None, None
+    return bucket_name, f"{prefix}{SEARCH_INDEX_LOCATION}"
+
+
+def _store(document, if_match=None):
+    """
+    Write an index document to S3
+
+    Args:
+        document (dict): Index document
+        if_match (str): Only overwrite the object with this ETag (S3 conditional write)
+
+    Returns:
+        str: ETag of the stored object
+    """
+    bucket_name, key = _index_key()
+    if not bucket_name:
+        raise RuntimeError('Could not get bucket configuration for the search index')
+    body = gzip.compress(json.dumps(document, separators=(',', ':')).encode('utf-8'))
+    request = {
+        'Bucket': bucket_name,
+        'Key': key,
+        'Body': body,
+        'ContentType': 'application/json',
+        'ContentEncoding': 'gzip'
+    }
+    if if_match:
+        request['IfMatch'] = if_match
+    response = get_client('s3').put_object(**request)
+    print(f"Stored search index: {len(document['docs'])} resources, "
+          f"{len(document['postings'])} terms, {len(body)} bytes")
+    return response.get('ETag')
+
+
+def _load():
+    """
+    Revalidate the cached index against S3 (conditional GET)
+
+    Returns:
+        dict or None: The current index, or None if there is none
+    """
+    bucket_name, key = _index_key()
+    if not bucket_name:
+        return None
+
+    request = {'Bucket': bucket_name, 'Key': key}
+    if _index:
+        request['IfNoneMatch'] = _index['etag']
+    try:
+        response = get_client('s3').get_object(**request)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('304', 'NotModified'):
+            return _index
+        if is_missing_key_error(e):
+            print(f"No search index at s3://{bucket_name}/{key}")
+            return None
+        raise
+
+    document = json.loads(gzip.decompress(response['Body'].read()))
+    if document.get('format') != SEARCH_INDEX_FORMAT:
+        print(f"Ignoring search index with format {document.get('format')}")
+        return None
+    index = _prepare(document, response.get('ETag'))
+    print(f"Loaded search index ({len(index['resources'])} resources, {len(index['postings'])} terms)")
+    return index
+
+
+def rebuild_search_index(table_name, changed_slug=None, changed_resource=None):
+    """
+    Build the search index from every approved resource in DynamoDB and store it
+
+    GSI reads are eventually consistent, so the admin action that triggered
+    the rebuild passes the resource it just changed (see rebuild_catalog_snapshot).
+    The new index is used by this container even if it could not be stored.
+
+    Returns:
+        dict: The in-memory index
+    """
+    global _index, _checked_at
+    resources = read_approved_resources(table_name, SEARCH_PROJECTION)
+    if changed_slug:
+        resources = [resource for resource in resources if resource.slug != changed_slug]
+    if changed_resource and changed_resource.status == 'approved':
+        resources.append(changed_resource)
+
+    document = _new_document()
+    for resource in resources:
+        # Only index resources that have the required fields
+        if resource.slug and resource.name:
+            _add_document(document, resource)
+
+    etag = None
+    try:
+        etag = _store(document)
+    except Exception as e:
+        print(f"Error storing search index: {e}")
+
+    index = _prepare(document, etag)
+    with _index_lock:
+        _index = index
+        _checked_at = time.monotonic() if etag else None
+    return index
+
+
+def update_search_index(table_name, changed_slug, changed_resource=None):
+    """
+    Patch one resource in the stored search index
+
+    The changed slug is removed and changed_resource (a Resource) is added
+    back if it is approved. The write is conditional on the ETag that was
+    read, so a concurrent update makes this one fall back to a full rebuild
+    instead of losing the other change.
+
+    Returns:
+        bool: True if the stored index is up to date
+    """
+    global _index, _checked_at
+    try:
+        with _index_lock:
+            current = _load()
+        if current is None or not current['etag'] or time.time() - current['builtAt'] > SEARCH_INDEX_MAX_AGE:
+            rebuild_search_index(table_name, changed_slug, changed_resource)
+            return _index is not None and _index['etag'] is not None
+
+        # Work on a copy: the loaded document is shared with running searches
+        document = json.loads(json.dumps(current['document']))
+        document['updatedAt'] = int(time.time())
+        document['updatedAtIso'] = datetime.utcnow().isoformat() + 'Z'
+        _remove_document(document, changed_slug)
+        if changed_resource and changed_resource.status == 'approved' and changed_resource.slug and changed_resource.name:
+            _add_document(document, changed_resource)
+
+        try:
+            etag = _store(document, if_match=current['etag'])
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('PreconditionFailed', '412', 'ConditionalRequestConflict'):
+                print("Search index changed while updating it; rebuilding")
+                rebuild_search_index(table_name, changed_slug, changed_resource)
+                return _index is not None and _index['etag'] is not None
+            raise
+
+        index = _prepare(document, etag)
+        with _index_lock:
+            _index = index
+            _checked_at = time.monotonic()
+        print(f"Updated search index for {changed_slug}")
+        return True
+
+    except Exception as e:
+        print(f"Error updating search index: {e}")
+        invalidate_search_index()
+        return False
+
+
+def invalidate_search_index():
+    """Delete the stored index and drop the in-memory copy"""
+    global _index, _checked_at
+    with _index_lock:
+        _index = None
+        _checked_at = None
+    try:
+        bucket_name, key = _index_key()
+        if bucket_name:
+            get_client('s3').delete_object(Bucket=bucket_name, Key=key)
+    except Exception as e:
+        print(f"Error deleting search index: {e}")
+
+
+def get_search_index(catalog_version=None):
+    """
+    Get the search index, revalidated like the catalog snapshot
+
+    The in-memory copy is revalidated at most every SEARCH_INDEX_CHECK_INTERVAL
+    seconds, or right away when catalog_version changed since the last check.
+    It is never rebuilt here (see rebuild_search_index).
+
+    Returns:
+        dict or None: Search index, or None when it is missing or older than SEARCH_INDEX_MAX_AGE
+    """
+    global _index, _checked_at, _checked_version
+
+    def needs_check():
+        return (_checked_at is None
+                or time.monotonic() - _checked_at >= SEARCH_INDEX_CHECK_INTERVAL
+                or (catalog_version is not None and catalog_version != _checked_version))
+
+    if needs_check():
+        with _index_lock:
+            if needs_check():
+                try:
+                    _index = _load()
+                except Exception as e:
+                    print(f"Error loading search index: {e}")
+                _checked_at = time.monotonic()
+                _checked_version = catalog_version
+
+    index = _index
+    if index is None or time.time() - index['builtAt'] > SEARCH_INDEX_MAX_AGE:
+        return None
+    return index
+
+
+def search(index, query, limit):
+    """
+    Rank resources for a query with BM25 (a resource matches any query term)
+
+    Args:
+        index (dict): Search index
+        query (str): Free text query
+        limit (int): Number of top results to return
+
+    Returns:
+        tuple: (total number of matches, list of (score, resource dict) best first)
+    """
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    postings = index['postings']
+    norms = index['norms']
+    total_docs = len(norms)
+
+    scores = {}
+    for term in terms:
+        flat = postings.get(term)
+        if not flat:
+            continue
+        document_frequency = len(flat) // 2
+        idf = math.log(1 + (total_docs - document_frequency + 0.5) / (document_frequency + 0.5))
+        weight = idf * (BM25_K1 + 1)
+        for i in range(0, len(flat), 2):
+            doc_id = flat[i]
+            frequency = flat[i + 1]
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight * frequency / (frequency + norms[doc_id])
+
+    # Equal scores are ordered by doc id so results are stable
+    best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+    resources = index['resources']
+    return len(scores), [(score, resources[doc_id]) for doc_id, score in best]
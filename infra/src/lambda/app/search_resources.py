@@ -0,0 +1,120 @@
+import json
+from app.catalog_snapshot import decode_page_token, encode_page_token
+from app.listing_cache import get_catalog_version
+from app.search_index import get_search_index, search
+from app.timing import span
+
+DEFAULT_BATCH_SIZE = 10
+MAX_BATCH_SIZE = 50
+# Deepest result a page token can reach
+MAX_RESULTS = 500
+MAX_QUERY_LENGTH = 200
+
+
+def handle_search_resources(event, headers):
+    """
+    Full-text search over every approved resource, ranked with BM25
+
+    Body: {"query": "...", "batchSize": 10, "pageToken": "..."}. Results have
+    the /resources listing shape plus a relevance score. Without a search
+    index (not built yet) the request gets a 503.
+    """
+    try:
+        body = json.loads(event.get('body') or '{}')
+    except json.JSONDecodeError:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({
+                'success': False,
+                'message': 'Invalid JSON in request body'
+            })
+        }
+
+    query = str(body.get('query') or '').strip()[:MAX_QUERY_LENGTH]
+    if not query:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({
+                'success': False,
+                'message': 'query is required'
+            })
+        }
+
+    try:
+        batch_size = max(1, min(int(body.get('batchSize', DEFAULT_BATCH_SIZE)), MAX_BATCH_SIZE))
+    except (TypeError, ValueError):
+        batch_size = DEFAULT_BATCH_SIZE
+
+    # Page tokens hold the offset into the ranked results
+    offset = 0
+    page_token = body.get('pageToken')
+    if page_token:
+        token = decode_page_token(page_token)
+        if not token or not isinstance(token.get('offset'), int) or token['offset'] < 0:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': json.dumps({
+                    'success': False,
+                    'message': 'Invalid pageToken'
+                })
+            }
+        offset = token['offset']
+    limit = min(offset + batch_size, MAX_RESULTS)
+
+    try:
+        with span('index'):
+            index = get_search_index(get_catalog_version())
+        if index is None:
+            return {
+                'statusCode': 503,
+                'headers': headers,
+                'body': json.dumps({
+                    'success': False,
+                    'message': 'Search is temporarily unavailable'
+                })
+            }
+        with span('search'):
+            total, ranked = search(index, query, limit)
+        page = ranked[offset:limit]
+        print(f"Search {query!r}: {total} matches, returning {len(page)} from offset {offset}")
+
+        next_page_token = None
+        if limit < min(total, MAX_RESULTS):
+            next_page_token = encode_page_token({'offset': limit})
+
+        with span('serialize'):
+            response_body = json.dumps({
+                'success': True,
+                'data': {
+                    'query': query,
+                    'total': total,
+                    'resources': [{**resource, 'score': round(score, 4)} for score, resource in page],
+                    'pagination': {
+                        'hasMore': next_page_token is not None,
+                        'nextPageToken': next_page_token,
+                        'batchSize': batch_size,
+                        'count': len(page)
+                    }
+                }
+            })
+
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': response_body
+        }
+
+    except Exception as e:
+        print(f"Error in handle_search_resources: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': json.dumps({
+                'success': False,
+                'message': 'Search failed',
+                'error': str(e)
+            })
+        }
@@ -1,10 +1,9 @@
 import json
 from datetime import datetime
-import boto3
 import uuid
 import re
-import os
-from app.utils import get_parameter
+from app.aws_clients import get_client
+from app.logo_store import move_logo
 
 def handle_submit_resource(event, headers, table_name):
     """Handle resource submission according to RESOURCE-SUBMISSION-SPECIFICATION.md"""
@@ -84,7 +83,7 @@ def handle_submit_resource(event, headers, table_name):
     dynamo_item = create_dynamo_item(body, resource_slug)
     
     # Save to DynamoDB
-    dynamodb = boto3.client('dynamodb')
+    dynamodb = get_client('dynamodb')
     
     try:
         # Check if resource slug already exists
@@ -110,7 +109,7 @@ def handle_submit_resource(event, headers, table_name):
         # Handle logo file management if logoImage exists
         logo_processed = False
         if resource.get('logoImage'):
-            logo_processed = move_logo_to_pending(resource['logoImage'])
+            logo_processed = move_logo(resource['logoImage'], 'temp', 'pending')
         
     except Exception as e:
         return {
@@ -177,110 +176,6 @@ def create_search_text(resource_name, tags, category, features):
     return ' '.join(filter(None, search_parts))
 
 
-def get_bucket_config():
-    """
-    Get S3 bucket configuration from parameter store based on environment
-    
-    Returns:
-        tuple: (bucket_name, prefix) or (None, None) if error
-        
-    Example return values:
-        - Dev: ('kelifax-resources', 'dev/')  
-        - Prod: ('kelifax-resources', 'prod/')
-    """
-    try:
-        # Get environment from OS environment variable
-        environment = os.environ.get('ENVIRONMENT', 'dev').lower()
-        
-        # Determine parameter name based on environment
-        if environment == 'prod':
-            parameter_name = '/kelifax/prod/bucketResources'
-        else:
-            parameter_name = '/kelifax/dev/bucketResources'
-        
-        # Get bucket URL from parameter store
-        bucket_url = get_parameter(parameter_name)
-        
-        if not bucket_url:
-            print(f"Could not retrieve bucket configuration from parameter: {parameter_name}")
-            return None, None
-            
-        # Parse S3 URL: s3://kelifax-resources/dev/ -> bucket_name='kelifax-resources', prefix='dev/'
-        if bucket_url.startswith('s3://'):
-            # Remove s3:// prefix
-            bucket_path = bucket_url[5:]
-            
-            # Split bucket name and prefix
-            if '/' in bucket_path:
-                bucket_name = bucket_path.split('/')[0]
-                prefix = '/'.join(bucket_path.split('/')[1:])
-                
-                # Ensure prefix ends with '/' if not empty
-                if prefix and not prefix.endswith('/'):
-                    prefix += '/'
-                    
-                return bucket_name, prefix
-            else:
-                # No prefix in URL
-                return bucket_path, ''
-        else:
-            print(f"Invalid S3 URL format: {bucket_url}")
-            return None, None
-            
-    except Exception as e:
-        print(f"Error getting bucket configuration: {e}")
-        return None, None
-
-
-def move_logo_to_pending(logo_filename):
-    """
-    Move logo file from uploads/temp/ to logos/pending/
-    
-    Args:
-        logo_filename (str): The logo filename (e.g., "Amazing_Dev_Tool.png")
-        
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    try:
-        bucket_name, prefix = get_bucket_config()
-        
-        if not bucket_name:
-            print("Could not get bucket configuration - skipping logo processing")
-            return False
-            
-        s3_client = boto3.client('s3')
-        
-        # Construct source and destination keys
-        source_key = f"{prefix}uploads/temp/{logo_filename}"
-        dest_key = f"{prefix}logos/pending/{logo_filename}"
-        
-        # Check if source file exists
-        try:
-            s3_client.head_object(Bucket=bucket_name, Key=source_key)
-        except s3_client.exceptions.NoSuchKey:
-            print(f"Source logo file not found: s3://{bucket_name}/{source_key}")
-            return False
-        
-        # Copy file to pending location
-        copy_source = {'Bucket': bucket_name, 'Key': source_key}
-        s3_client.copy_object(
-            CopySource=copy_source,
-            Bucket=bucket_name,
-            Key=dest_key
-        )
-        
-        # Delete original file from temp location
-        s3_client.delete_object(Bucket=bucket_name, Key=source_key)
-        
-        print(f"Successfully moved logo from {source_key} to {dest_key}")
-        return True
-        
-    except Exception as e:
-        print(f"Error moving logo file {logo_filename}: {e}")
-        return False
-
-
 def create_dynamo_item(form_data, resource_slug):
     """
     Convert form submission to DynamoDB item format
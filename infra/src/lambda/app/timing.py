@@ -0,0 +1,174 @@
+import json
+import os
+import random
+import threading
+import time
+from contextvars import ContextVar, copy_context
+
+# Fraction of requests that are timed (0 disables timing, 1 times every request)
+SAMPLE_RATE = float(os.environ.get('TIMING_SAMPLE_RATE', '0'))
+METRICS_NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'Kelifax/API')
+
+_current_timer = ContextVar('kelifax_request_timer', default=None)
+
+
+class RequestTimer:
+    """Per-request phase durations (summed when a phase runs more than once)"""
+
+    __slots__ = ('route', 'started', 'phases', '_lock')
+
+    def __init__(self):
+        self.route = 'unknown'
+        self.started = time.perf_counter()
+        self.phases = {}
+        # Batch sub-requests record into the same timer from several threads
+        self._lock = threading.Lock()
+
+    def record(self, name, duration_ms):
+        with self._lock:
+            total, count = self.phases.get(name, (0.0, 0))
+            self.phases[name] = (total + duration_ms, count + 1)
+
+
+class _Span:
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.timer.record(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def start_request():
+    """Start timing the current request if it is sampled"""
+    if SAMPLE_RATE <= 0 or (SAMPLE_RATE < 1 and random.random() >= SAMPLE_RATE):
+        _current_timer.set(None)
+        return None
+    timer = RequestTimer()
+    _current_timer.set(timer)
+    return timer
+
+
+def set_route(route_name):
+    """Name the route being timed (used as the metric dimension)"""
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.route = route_name
+
+
+def run_untimed(function, *args):
+    """
+    Run a function in a copy of the current context with timing switched off
+
+    Used for batch items: their work is timed once as a whole by the caller,
+    so their own spans and route must not land on the batch request's timer.
+    """
+    def untimed():
+        _current_timer.set(None)
+        return function(*args)
+    return copy_context().run(untimed)
+
+
+def span(name):
+    """
+    Time a block as one phase of the current request
+
+    Example:
+        with span('format'):
+            resources = [format_resource(item) for item in items]
+
+    Returns a shared no-op context manager when the request isn't sampled.
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        return _NOOP_SPAN
+    return _Span(timer, name)
+
+
+def finish_request(response):
+    """
+    Add the Server-Timing header and log one CloudWatch EMF line for a timed request
+
+    Returns:
+        dict: The same response
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        return response
+    _current_timer.set(None)
+
+    total_ms = (time.perf_counter() - timer.started) * 1000
+    phases = dict(timer.phases)
+
+    headers = response.setdefault('headers', {})
+    entries = [f'{name};dur={duration:.1f}' for name, (duration, _) in phases.items()]
+    entries.append(f'total;dur={total_ms:.1f}')
+    headers['Server-Timing'] = ', '.join(entries)
+    # Let the browser expose Server-Timing to the calling origin
+    if headers.get('Access-Control-Allow-Origin'):
+        headers['Timing-Allow-Origin'] = headers['Access-Control-Allow-Origin']
+
+    metrics = [{'Name': 'total', 'Unit': 'Milliseconds'}]
+    metrics.extend({'Name': name, 'Unit': 'Milliseconds'} for name in phases)
+    log_line = {
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': METRICS_NAMESPACE,
+                'Dimensions': [['Route']],
+                'Metrics': metrics
+            }]
+        },
+        'Route': timer.route,
+        'StatusCode': response.get('statusCode'),
+        'total': round(total_ms, 3),
+        'phaseCounts': {name: count for name, (_, count) in phases.items()}
+    }
+    for name, (duration, _) in phases.items():
+        log_line[name] = round(duration, 3)
+    print(json.dumps(log_line))
+    return response
+
+
+def _before_aws_call(model=None, context=None, **kwargs):
+    if context is not None and _current_timer.get() is not None:
+        context['kelifax_timing_start'] = time.perf_counter()
+
+
+def _after_aws_call(model=None, context=None, **kwargs):
+    if context is None:
+        return
+    started = context.pop('kelifax_timing_start', None)
+    timer = _current_timer.get()
+    if started is not None and timer is not None:
+        name = f'{model.service_model.service_name}.{model.name}'
+        timer.record(name, (time.perf_counter() - started) * 1000)
+
+
+def instrument_client(client):
+    """Time every API call made through a botocore client (no-op for stand-ins without events)"""
+    events = getattr(getattr(client, 'meta', None), 'events', None)
+    if events is not None:
+        events.register('before-call.*.*', _before_aws_call, unique_id='kelifax-timing-before')
+        events.register('after-call.*.*', _after_aws_call, unique_id='kelifax-timing-after')
+    return client
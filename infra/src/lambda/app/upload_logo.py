@@ -1,11 +1,10 @@
 import json
 import base64
 import binascii
-import boto3
 import os
 from datetime import datetime
 import uuid
-from app.utils import get_parameter
+from app.logo_store import upload_temp_logo
 
 def handle_upload_logo(event, headers):
     """Handle logo upload with file size validation"""
@@ -51,45 +50,29 @@ def handle_upload_logo(event, headers):
                 })
             }
         
-        # Get environment variable for ENV (dev/prod)
-        env = os.environ.get('ENVIRONMENT', 'dev')
-        
-        # Get bucket configuration from Parameter Store
-        bucket_path = get_parameter(f'/kelifax/{env}/bucketResources')
-        if not bucket_path:
-            return {
-                'statusCode': 500,
-                'headers': headers,
-                'body': json.dumps({
-                    'success': False,
-                    'message': f'Failed to get bucket configuration for environment: {env}'
-                })
-            }
-        
-        # Extract bucket name from s3://bucket-name/path/ format
-        bucket_name = bucket_path.replace('s3://', '').split('/')[0]
-        base_path = bucket_path.replace(f's3://{bucket_name}/', '')
-        
-        # Use the exact file name as received
-        # S3 key with full path
-        s3_key = f"{base_path}uploads/temp/{file_name}"
-        
         # Get file extension for content type
         file_extension = file_name.split('.')[-1].lower() if '.' in file_name else 'png'
         
-        # Upload to S3
-        s3_client = boto3.client('s3')
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=s3_key,
-            Body=image_data,
-            ContentType=f'image/{file_extension}',
-            Metadata={
+        # Upload to uploads/temp/ in the resources bucket (exact file name as received)
+        bucket_name, s3_key = upload_temp_logo(
+            file_name,
+            image_data,
+            f'image/{file_extension}',
+            metadata={
                 'original_filename': file_name,
                 'upload_timestamp': str(datetime.now().isoformat()),
                 'file_size': str(len(image_data))
             }
         )
+        if not bucket_name:
+            return {
+                'statusCode': 500,
+                'headers': headers,
+                'body': json.dumps({
+                    'success': False,
+                    'message': f"Failed to get bucket configuration for environment: {os.environ.get('ENVIRONMENT', 'dev')}"
+                })
+            }
         
         # Generate the S3 URL
         s3_url = f"https://{bucket_name}.s3.amazonaws.com/{s3_key}"
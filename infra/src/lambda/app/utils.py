@@ -1,26 +1,230 @@
-import boto3
+import os
+import threading
+import time
+from app.aws_clients import get_client
 
-def get_parameter(name, decrypt=False):
+# Cached values are fresh for PARAMETER_TTL_SECONDS; after that they are still
+# served for up to PARAMETER_STALE_SECONDS more while a background thread
+# refreshes them. Missing parameters are remembered for MISSING_PARAMETER_TTL_SECONDS.
+PARAMETER_TTL_SECONDS = int(os.environ.get('PARAMETER_CACHE_TTL', '300'))
+PARAMETER_STALE_SECONDS = int(os.environ.get('PARAMETER_CACHE_STALE', '3600'))
+MISSING_PARAMETER_TTL_SECONDS = int(os.environ.get('PARAMETER_CACHE_MISSING_TTL', '60'))
+
+# GetParameters accepts at most 10 names per call
+GET_PARAMETERS_MAX_NAMES = 10
+
+# name -> (value or None when the parameter doesn't exist, fetched_at)
+_parameter_cache = {}
+_parameter_lock = threading.Lock()
+_refreshing = set()
+_prefetched = False
+# When the last prefetch read the whole /kelifax/{env}/ path
+_prefetched_at = None
+_parameter_stats = {
+    'hits': 0,
+    'staleHits': 0,
+    'negativeHits': 0,
+    'misses': 0,
+    'refreshes': 0,
+    'fetchedParameters': 0,
+    'ssmCalls': 0,
+    'errors': 0
+}
+
+
+def _count(stat, amount=1):
+    with _parameter_lock:
+        _parameter_stats[stat] += amount
+
+
+def _store_parameters(values):
+    fetched_at = time.monotonic()
+    with _parameter_lock:
+        for name, value in values.items():
+            _parameter_cache[name] = (value, fetched_at)
+        _parameter_stats['fetchedParameters'] += len(values)
+    print(f"Fetched {len(values)} SSM parameter(s); cache stats: {get_parameter_cache_stats()}")
+
+
+def _fetch_parameters(names):
     """
-    Get parameter value from Parameter Store
+    Fetch parameters with GetParameters and store them in the cache
+
+    Names SSM reports as invalid are cached as missing. Values are always
+    requested decrypted so String and SecureString parameters share one cache entry.
+
+    Returns:
+        dict: name -> value (None for missing parameters)
+    """
+    names = list(dict.fromkeys(names))
+    ssm = get_client('ssm')
+    values = {}
+    for start in range(0, len(names), GET_PARAMETERS_MAX_NAMES):
+        chunk = names[start:start + GET_PARAMETERS_MAX_NAMES]
+        response = ssm.get_parameters(Names=chunk, WithDecryption=True)
+        _count('ssmCalls')
+        for parameter in response.get('Parameters', []):
+            values[parameter['Name']] = parameter['Value']
+        for name in response.get('InvalidParameters', []):
+            values[name] = None
+
+    _store_parameters(values)
+    return values
+
+
+def prefetch_parameters(env=None):
+    """
+    Load every parameter under /kelifax/{env}/ with GetParametersByPath
+
+    Returns:
+        bool: True if the whole path was read
+    """
+    global _prefetched, _prefetched_at
+    env = env or os.environ.get('ENVIRONMENT', 'dev')
+    _prefetched = True
+    ssm = get_client('ssm')
+    values = {}
+    request = {'Path': f'/kelifax/{env}/', 'Recursive': True, 'WithDecryption': True}
+    try:
+        while True:
+            response = ssm.get_parameters_by_path(**request)
+            _count('ssmCalls')
+            for parameter in response.get('Parameters', []):
+                values[parameter['Name']] = parameter['Value']
+            if not response.get('NextToken'):
+                break
+            request['NextToken'] = response['NextToken']
+    except Exception as e:
+        _count('errors')
+        print(f"Error prefetching parameters: {e}")
+        return False
+
+    _store_parameters(values)
+    _prefetched_at = time.monotonic()
+    return True
+
+
+def _refresh_in_background(name):
+    def refresh():
+        try:
+            _fetch_parameters([name])
+            _count('refreshes')
+        except Exception as e:
+            _count('errors')
+            print(f"Error refreshing parameter {name}: {e}")
+        finally:
+            with _parameter_lock:
+                _refreshing.discard(name)
+
+    with _parameter_lock:
+        if name in _refreshing:
+            return
+        _refreshing.add(name)
+    threading.Thread(target=refresh, name='ssm-refresh', daemon=True).start()
+
+
+def get_parameter(name, decrypt=False, max_age=None):
+    """
+    Get parameter value from Parameter Store (cached per container)
+    
+    The first lookup of a /kelifax/{env}/ parameter prefetches the whole path
+    in one call. Expired values are served stale while being refreshed, and
+    kept if SSM fails, so a throttled SSM doesn't fail requests.
     
     Args:
         name (str): Parameter name (e.g., '/app/database/host')
-        decrypt (bool): Set True for SecureString parameters
+        decrypt (bool): Set True for SecureString parameters (values are always fetched decrypted)
+        max_age (int): Refetch values (and missing markers) older than this many
+                       seconds before returning them, instead of serving them stale
         
     Returns:
-        str: Parameter value or None if error
+        str: Parameter value or None if missing or error
     """
+    entry = _parameter_cache.get(name)
+
+    env = os.environ.get('ENVIRONMENT', 'dev')
+    if entry is None and name.startswith(f'/kelifax/{env}/'):
+        if not _prefetched:
+            prefetch_parameters(env)
+            entry = _parameter_cache.get(name)
+        if entry is None and _prefetched_at is not None:
+            # The prefetch read the whole path, so the parameter didn't exist then
+            entry = (None, _prefetched_at)
+
+    if entry is not None:
+        value, fetched_at = entry
+        age = time.monotonic() - fetched_at
+        if max_age is not None:
+            if age < max_age:
+                _count('negativeHits' if value is None else 'hits')
+                return value
+        elif value is None:
+            if age < MISSING_PARAMETER_TTL_SECONDS:
+                _count('negativeHits')
+                return None
+        elif age < PARAMETER_TTL_SECONDS:
+            _count('hits')
+            return value
+        elif age < PARAMETER_TTL_SECONDS + PARAMETER_STALE_SECONDS:
+            _count('staleHits')
+            _refresh_in_background(name)
+            return value
+
+    _count('misses')
     try:
-        ssm = boto3.client('ssm')
-        
-        response = ssm.get_parameter(
-            Name=name,
-            WithDecryption=decrypt
-        )
-        
-        return response['Parameter']['Value']
-        
+        return _fetch_parameters([name]).get(name)
     except Exception as e:
+        _count('errors')
         print(f"Error getting parameter {name}: {e}")
-        return None
\ No newline at end of file
+        # Better an old value than none while SSM is failing
+        return entry[0] if entry is not None else None
+
+
+def get_parameter_cache_stats():
+    """
+    Get the parameter cache counters for this container
+    
+    Returns:
+        dict: hits, staleHits, negativeHits, misses, refreshes, fetchedParameters, ssmCalls, errors and cached (entry count)
+    """
+    return {**_parameter_stats, 'cached': len(_parameter_cache)}
+
+
+def clear_parameter_cache():
+    """Forget all cached parameters (the next lookup prefetches again)"""
+    global _prefetched, _prefetched_at
+    with _parameter_lock:
+        _parameter_cache.clear()
+        _prefetched = False
+        _prefetched_at = None
+
+
+def set_cached_parameter(name, value):
+    """Cache a value this container just wrote to Parameter Store"""
+    with _parameter_lock:
+        _parameter_cache[name] = (value, time.monotonic())
+
+
+def get_header(event, name, default=''):
+    """
+    Get a request header from an API Gateway event (case-insensitive)
+    
+    Args:
+        event (dict): API Gateway proxy event
+        name (str): Header name (e.g., 'Accept-Encoding')
+        default (str): Value returned when the header is missing
+        
+    Returns:
+        str: Header value or default
+    """
+    headers = event.get('headers') or {}
+    value = headers.get(name)
+    if value is None:
+        name_lower = name.lower()
+        value = headers.get(name_lower)
+        if value is None:
+            for key, header_value in headers.items():
+                if key.lower() == name_lower:
+                    return header_value
+            return default
+    return value
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Check the API Gateway authorizer's RS256 verification against a local JWKS
+
+Generates an RSA keypair, serves its JWKS from a local HTTP server (the
+authorizer's JWKS_URL override), points the authorizer's SSM client at the
+SSM stand-in from local_aws.py and runs the real lambda_handler on signed
+tokens: valid, expired, wrong audience, tampered and unknown kid. It also
+reports how often the JWKS was downloaded, the token cache counters, and
+warm authorization time with and without a token cache hit.
+
+Requires PyJWT[crypto] and boto3 installed locally.
+
+Usage:
+    python infra/tools/authorizer_jwks_check.py
+    python infra/tools/authorizer_jwks_check.py -n 2000     # more warm verifications for timing
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+AUTHORIZER_DIR = os.path.join(os.path.dirname(TOOLS_DIR), 'src', 'lambda-authorizer', 'app')
+
+sys.path.insert(0, AUTHORIZER_DIR)
+sys.path.insert(0, TOOLS_DIR)
+
+ENVIRONMENT = 'dev'
+USER_POOL_ID = 'us-east-1_LocalPool'
+CLIENT_ID = 'local-client-id'
+KID = 'local-key-1'
+METHOD_ARN = 'arn:aws:execute-api:us-east-1:123456789012:abcdef/dev/POST/admin/submitted-resources'
+
+
+class JWKSHandler(BaseHTTPRequestHandler):
+    """Serves server.jwks and counts downloads"""
+
+    def do_GET(self):
+        self.server.fetches += 1
+        payload = json.dumps(self.server.jwks).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_jwks_server(jwks):
+    server = HTTPServer(('127.0.0.1', 0), JWKSHandler)
+    server.jwks = jwks
+    server.fetches = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_token(private_key, kid=KID, **overrides):
+    import jwt
+
+    now = int(time.time())
+    claims = {
+        'sub': 'local-user',
+        'email': 'admin@kelifax.com',
+        'cognito:username': 'local-admin',
+        'cognito:groups': ['admin'],
+        'token_use': 'id',
+        'aud': CLIENT_ID,
+        'iss': f'https://cognito-idp.us-east-1.amazonaws.com/{USER_POOL_ID}',
+        'iat': now,
+        'exp': now + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, private_key, algorithm='RS256', headers={'kid': kid})
+
+
+def authorize(lambda_function, token):
+    event = {
+        'methodArn': METHOD_ARN,
+        'headers': {'Cookie': f'other=1; cognito_{ENVIRONMENT}_id_token={token}'}
+    }
+    return lambda_function.lambda_handler(event, None)['context']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify the authorizer against a locally generated keypair')
+    parser.add_argument('-n', type=int, default=500, help='warm verifications to time (default: 500)')
+    args = parser.parse_args()
+
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from jwt.algorithms import RSAAlgorithm
+    from local_aws import LocalSSMClient
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update(kid=KID, alg='RS256', use='sig')
+    server = start_jwks_server({'keys': [jwk]})
+
+    os.environ.update(
+        ENVIRONMENT=ENVIRONMENT,
+        VERIFY_JWT_SIGNATURE='true',
+        JWKS_URL=f'http://127.0.0.1:{server.server_port}/.well-known/jwks.json',
+        AWS_DEFAULT_REGION='us-east-1',
+    )
+
+    import builtins
+    real_print = builtins.print
+    builtins.print = lambda *a, **k: None  # the authorizer logs every step
+    try:
+        import lambda_function
+        lambda_function._ssm_client = LocalSSMClient({
+            f'/kelifax/{ENVIRONMENT}/cognito-user-pool-id': USER_POOL_ID,
+            f'/kelifax/{ENVIRONMENT}/client_id': CLIENT_ID,
+            f'/kelifax/{ENVIRONMENT}/cognito_domain': 'local.auth.us-east-1.amazoncognito.com',
+        })
+
+        valid = make_token(private_key)
+        tampered = valid[:-4] + ('AAAA' if not valid.endswith('AAAA') else 'BBBB')
+        cases = [
+            ('valid token', valid, 'true', ''),
+            ('expired token', make_token(private_key, exp=int(time.time()) - 60), 'false', 'Token expired'),
+            ('wrong audience', make_token(private_key, aud='someone-else'), 'false', 'Invalid token audience'),
+            ('tampered signature', tampered, 'false', 'Invalid token format'),
+            ('unknown kid', make_token(private_key, kid='rotated-key'), 'false', 'Invalid token format'),
+            ('unknown kid again (rate limited)', make_token(private_key, kid='rotated-key-2'), 'false', 'Invalid token format'),
+        ]
+
+        results = []
+        for name, token, authenticated, auth_error in cases:
+            context = authorize(lambda_function, token)
+            ok = context['authenticated'] == authenticated and context['authError'] == auth_error
+            results.append((name, ok, context['authenticated'], context['authError']))
+
+        # Full verification (token cache cleared each time) vs. repeated token (cache hit)
+        verify_timings, cached_timings = [], []
+        for _ in range(args.n):
+            with lambda_function._token_cache_lock:
+                lambda_function._token_cache.clear()
+                lambda_function._token_cache_stats.update(entries=0, bytes=0)
+            started = time.perf_counter()
+            authorize(lambda_function, valid)
+            verify_timings.append((time.perf_counter() - started) * 1000)
+        hits_before = lambda_function.get_token_cache_stats()['hits']
+        for _ in range(args.n):
+            started = time.perf_counter()
+            authorize(lambda_function, valid)
+            cached_timings.append((time.perf_counter() - started) * 1000)
+        cache_stats = lambda_function.get_token_cache_stats()
+    finally:
+        builtins.print = real_print
+        server.shutdown()
+
+    failed = False
+    for name, ok, authenticated, auth_error in results:
+        failed |= not ok
+        print(f"[{'OK' if ok else 'FAIL'}] {name}: authenticated={authenticated} authError={auth_error!r}")
+
+    # One download for the first token; unknown kids within the rate limit reuse the cache
+    fetch_ok = server.fetches == 1
+    failed |= not fetch_ok
+    print(f"[{'OK' if fetch_ok else 'FAIL'}] JWKS downloaded {server.fetches} time(s)")
+    hits_ok = cache_stats['hits'] - hits_before == args.n
+    failed |= not hits_ok
+    print(f"[{'OK' if hits_ok else 'FAIL'}] token cache: {cache_stats}")
+
+    for label, timings in (('RS256 verification', verify_timings), ('token cache hit', cached_timings)):
+        print(f'Warm authorization, {label}: median {statistics.median(timings):.3f} ms, '
+              f'p99 {sorted(timings)[int(len(timings) * 0.99) - 1]:.3f} ms over {args.n} calls')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
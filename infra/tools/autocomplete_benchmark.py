@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Check /autocomplete lookup latency against its p99 target
+
+Builds a catalog of --resources synthetic resources from the seed items
+(infra/src/dynamodb/*.json): names, tags and categories are recombined from
+the seed vocabulary, view counts follow a long-tailed distribution and about
+one in ten is featured. It then builds the autocomplete index the way a
+container does and times complete() for prefixes of one to six characters
+taken from real completions, weighted towards the short prefixes a user types
+first.
+
+Exits 1 if the p99 lookup time is over --max-p99-ms.
+
+Usage:
+    python infra/tools/autocomplete_benchmark.py
+    python infra/tools/autocomplete_benchmark.py --resources 20000 -n 50000
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+INFRA_DIR = os.path.dirname(TOOLS_DIR)
+sys.path.insert(0, os.path.join(INFRA_DIR, 'src', 'lambda'))
+
+from app.autocomplete_index import build_autocomplete_index, complete  # noqa: E402
+from app.resource_model import Resource  # noqa: E402
+
+# p99 target for one lookup, in milliseconds
+DEFAULT_MAX_P99_MS = 5.0
+
+
+def load_seed_summaries():
+    summaries = []
+    for path in sorted(glob.glob(os.path.join(INFRA_DIR, 'src', 'dynamodb', '*.json'))):
+        with open(path) as f:
+            for requests in json.load(f).values():
+                for request in requests:
+                    if 'PutRequest' in request:
+                        summaries.append(Resource.from_wire(request['PutRequest']['Item']).summary())
+    return [summary for summary in summaries if summary['slug'] and summary['title']]
+
+
+def synthetic_snapshot(seeds, count, rng):
+    """A snapshot-shaped dict (resources and viewCounts) with count resources"""
+    words = sorted({word for seed in seeds for word in seed['title'].split()})
+    tags = sorted({tag for seed in seeds for tag in seed['tags']})
+    categories = sorted({seed['category'] for seed in seeds if seed['category']})
+
+    resources = []
+    view_counts = []
+    for number in range(count):
+        title = ' '.join(rng.sample(words, rng.randint(1, min(3, len(words))))) + f' {number}'
+        resources.append({
+            'slug': f'resource-{number}',
+            'title': title,
+            'description': '',
+            'category': rng.choice(categories),
+            'tags': rng.sample(tags, min(len(tags), rng.randint(2, 6))),
+            'featured': rng.random() < 0.1,
+            'image': ''
+        })
+        view_counts.append(int(rng.paretovariate(1.2)) - 1)
+    return {'version': 'benchmark', 'builtAt': 0, 'resources': resources, 'viewCounts': view_counts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time autocomplete lookups over a synthetic catalog')
+    parser.add_argument('--resources', type=int, default=5000, help='catalog size (default: 5000)')
+    parser.add_argument('-n', '--lookups', type=int, default=20000, help='lookups to time (default: 20000)')
+    parser.add_argument('--limit', type=int, default=8, help='suggestions per lookup (default: 8)')
+    parser.add_argument('--max-p99-ms', type=float, default=DEFAULT_MAX_P99_MS,
+                        help=f'fail above this p99 (default: {DEFAULT_MAX_P99_MS})')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    snapshot = synthetic_snapshot(load_seed_summaries(), args.resources, rng)
+
+    started = time.perf_counter()
+    index = build_autocomplete_index(snapshot)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"{args.resources} resources, {len(index['keys'])} completions, index built in {build_ms:.0f} ms")
+
+    keys = index['keys']
+    prefix_lengths = [1, 2, 2, 3, 3, 3, 4, 4, 5, 6]
+    prefixes = [rng.choice(keys)[:rng.choice(prefix_lengths)] for _ in range(args.lookups)]
+
+    timings_ms = []
+    for prefix in prefixes:
+        started = time.perf_counter()
+        complete(index, prefix, args.limit)
+        timings_ms.append((time.perf_counter() - started) * 1000)
+
+    timings_ms.sort()
+    p50 = statistics.median(timings_ms)
+    p99 = timings_ms[int(0.99 * (len(timings_ms) - 1))]
+    print(f"{args.lookups} lookups: p50 {p50:.3f} ms, p99 {p99:.3f} ms, max {timings_ms[-1]:.3f} ms")
+
+    ok = p99 <= args.max_p99_ms
+    print(f"[{'OK' if ok else 'FAIL'}] p99 {p99:.3f} ms (target {args.max_p99_ms} ms)")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Check the cache-headers origin-response function against CloudFront event fixtures
+
+Builds origin-response events in the shape CloudFront sends them (same layout
+as the AWS "cloudfront-response" test event) for the paths the site serves and
+runs the real lambda_handler on each. Checks the Cache-Control it sets, that
+error responses are left alone and that /admin pages are never cacheable.
+
+Usage:
+    python infra/tools/cache_headers_check.py
+    python infra/tools/cache_headers_check.py -v     # print every event's resulting headers
+"""
+import argparse
+import copy
+import importlib.util
+import json
+import os
+import sys
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+EDGE_FILE = os.path.join(os.path.dirname(TOOLS_DIR), 'src', 'cache-headers-lambda-edge', 'app', 'lambda_function.py')
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+LOGO = 'public, max-age=86400, stale-while-revalidate=604800'
+HTML = 'public, max-age=0, s-maxage=300, stale-while-revalidate=86400'
+STATIC = 'public, max-age=3600, stale-while-revalidate=86400'
+NO_STORE = 'private, no-store, max-age=0'
+
+
+def origin_response_event(uri, status='200', headers=None):
+    """CloudFront origin-response event for one request/response pair"""
+    response_headers = {
+        'content-type': [{'key': 'Content-Type', 'value': 'text/html'}],
+        'last-modified': [{'key': 'Last-Modified', 'value': 'Thu, 01 Oct 2026 10:00:00 GMT'}],
+        'etag': [{'key': 'ETag', 'value': '"3e5b6f2c0a"'}],
+        'server': [{'key': 'Server', 'value': 'AmazonS3'}],
+    }
+    response_headers.update(headers or {})
+    return {
+        'Records': [{
+            'cf': {
+                'config': {
+                    'distributionDomainName': 'd111111abcdef8.cloudfront.net',
+                    'distributionId': 'EDFDVBD6EXAMPLE',
+                    'eventType': 'origin-response',
+                    'requestId': '4TyzHTaYWb1GX1qTfsHhEqV6HUDd_BzoBZnwfnvQc_1oF26ClkoUSEQ=='
+                },
+                'request': {
+                    'clientIp': '203.0.113.178',
+                    'headers': {
+                        'host': [{'key': 'Host', 'value': 'dev.kelifax.com'}],
+                        'user-agent': [{'key': 'User-Agent', 'value': 'Amazon CloudFront'}]
+                    },
+                    'method': 'GET',
+                    'querystring': '',
+                    'uri': uri
+                },
+                'response': {
+                    'headers': response_headers,
+                    'status': status,
+                    'statusDescription': 'OK' if status == '200' else 'Origin status'
+                }
+            }
+        }]
+    }
+
+
+def expires_header():
+    return {'expires': [{'key': 'Expires', 'value': 'Thu, 01 Jan 1970 00:00:00 GMT'}]}
+
+
+def origin_cache_control(value):
+    return {'cache-control': [{'key': 'Cache-Control', 'value': value}]}
+
+
+# (name, event, expected Cache-Control or None if the origin's headers must be kept)
+FIXTURES = [
+    ('hashed JS bundle', origin_response_event('/_astro/hoisted.B1x9kQ2a.js'), IMMUTABLE),
+    ('hashed CSS, origin sent no-cache',
+     origin_response_event('/_astro/index.Cv3dQ1.css', headers=origin_cache_control('no-cache')), IMMUTABLE),
+    ('public logo', origin_response_event('/logos/canva.png'), LOGO),
+    ('approved logo from S3', origin_response_event('/prod/logos/approved/figma.png', headers=expires_header()), LOGO),
+    ('pending logo is not an approved logo', origin_response_event('/dev/logos/pending/figma.png'), STATIC),
+    ('home page', origin_response_event('/'), HTML),
+    ('resource page', origin_response_event('/resource/canva'), HTML),
+    ('category page with trailing slash', origin_response_event('/resources/design/'), HTML),
+    ('index.html', origin_response_event('/about/index.html'), HTML),
+    ('robots.txt', origin_response_event('/robots.txt'), STATIC),
+    ('manifest.json', origin_response_event('/manifest.json'), STATIC),
+    ('admin root', origin_response_event('/admin'), NO_STORE),
+    ('admin subpage', origin_response_event('/admin/submissions'), NO_STORE),
+    ('admin page, origin sent max-age',
+     origin_response_event('/admin/index.html', headers=origin_cache_control('public, max-age=600')), NO_STORE),
+    ('admin error page', origin_response_event('/admin/missing', status='404'), NO_STORE),
+    ('callback', origin_response_event('/callback'), NO_STORE),
+    ('not-admin prefix', origin_response_event('/administrators-guide'), HTML),
+    ('304 revalidation of a bundle', origin_response_event('/_astro/hoisted.B1x9kQ2a.js', status='304'), IMMUTABLE),
+    ('404 page keeps origin headers', origin_response_event('/resource/missing', status='404'), None),
+    ('503 bundle keeps origin headers',
+     origin_response_event('/_astro/hoisted.B1x9kQ2a.js', status='503', headers=origin_cache_control('no-store')), None),
+]
+
+
+def load_edge_module():
+    spec = importlib.util.spec_from_file_location('cache_headers_lambda_function', EDGE_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def check(edge, event, expected):
+    """Run one fixture; returns a list of problems (empty if it passed)"""
+    original = copy.deepcopy(event['Records'][0]['cf']['response'])
+    response = edge.lambda_handler(event, None)
+    headers = response.get('headers', {})
+    problems = []
+
+    if expected is None:
+        if response != original:
+            problems.append('response was modified')
+        return problems, headers
+
+    values = [h['value'] for h in headers.get('cache-control', [])]
+    if values != [expected]:
+        problems.append(f'cache-control {values!r}, expected {expected!r}')
+    if 'expires' in headers:
+        problems.append('expires header left in place')
+    if expected == NO_STORE and ('etag' in headers or 'last-modified' in headers):
+        problems.append('validators left on an uncacheable page')
+    if response.get('status') != original.get('status'):
+        problems.append('status changed')
+    return problems, headers
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the cache-headers edge function on CloudFront event fixtures')
+    parser.add_argument('-v', '--verbose', action='store_true', help="print each fixture's resulting headers")
+    args = parser.parse_args()
+
+    import builtins
+    real_print = builtins.print
+    builtins.print = lambda *a, **k: None  # the function logs the rule it applied
+    try:
+        edge = load_edge_module()
+        results = [(name, *check(edge, event, expected)) for name, event, expected in FIXTURES]
+    finally:
+        builtins.print = real_print
+
+    failed = False
+    for name, problems, headers in results:
+        failed |= bool(problems)
+        print(f"[{'FAIL' if problems else 'OK'}] {name}" + (f": {'; '.join(problems)}" if problems else ''))
+        if args.verbose:
+            print(f'    {json.dumps(headers)}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Check the edge function's pooled token-exchange connection against a local TLS server
+
+Starts an HTTPS stand-in for the Cognito /oauth2/token endpoint (self-signed
+certificate for localhost, HTTP/1.1 keep-alive), points the edge function's
+SSL context at that certificate and calls exchange_code_for_tokens several
+times. Checks that:
+
+- warm calls reuse one TCP/TLS connection
+- a connection the server dropped is re-established transparently
+- non-200 answers return None
+
+Prints the connect/TLS/response timings the function logs. Requires the
+cryptography package to create the certificate.
+
+Usage:
+    python infra/tools/edge_token_exchange_check.py            # app-dev
+    python infra/tools/edge_token_exchange_check.py --env prod
+"""
+import argparse
+import datetime
+import importlib.util
+import ipaddress
+import json
+import os
+import ssl
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+EDGE_DIR = os.path.join(os.path.dirname(TOOLS_DIR), 'src', 'cognito-lambda-edge')
+
+
+def write_self_signed_cert(directory):
+    """Create a localhost certificate and key; returns (cert_path, key_path)"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'localhost')])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([
+            x509.DNSName('localhost'), x509.IPAddress(ipaddress.ip_address('127.0.0.1'))
+        ]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_path = os.path.join(directory, 'cert.pem')
+    key_path = os.path.join(directory, 'key.pem')
+    with open(cert_path, 'wb') as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, 'wb') as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL,
+                                  serialization.NoEncryption()))
+    return cert_path, key_path
+
+
+class TokenHandler(BaseHTTPRequestHandler):
+    """Cognito token endpoint stand-in; answers with server.status"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; don't let Nagle delay the body
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.connections.append(self.connection)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        status = self.server.status
+        payload = json.dumps(
+            {'id_token': 'local-id-token', 'access_token': 'local-access-token', 'token_type': 'Bearer'}
+            if status == 200 else {'error': 'invalid_grant'}
+        ).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_tls_server(cert_path, key_path):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), TokenHandler)
+    server.daemon_threads = True
+    server.status = 200
+    server.connections = []
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def load_edge_module(env):
+    path = os.path.join(EDGE_DIR, f'app-{env}', 'lambda_function.py')
+    spec = importlib.util.spec_from_file_location(f'edge_{env}_lambda_function', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exercise the edge token exchange against a local TLS server')
+    parser.add_argument('--env', choices=['dev', 'prod'], default='dev', help='which edge function copy to load')
+    parser.add_argument('-n', type=int, default=5, help='warm calls to make (default: 5)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path, key_path = write_self_signed_cert(directory)
+        server = start_tls_server(cert_path, key_path)
+        edge = load_edge_module(args.env)
+        edge._ssl_context = ssl.create_default_context(cafile=cert_path)
+
+        hostname = f'localhost:{server.server_port}'
+        post_data = 'grant_type=authorization_code&code=local-code&client_id=local&redirect_uri=https%3A%2F%2Flocalhost%2Fcallback'
+        checks = []
+
+        tokens = [edge.exchange_code_for_tokens(post_data, hostname) for _ in range(args.n)]
+        checks.append(('tokens returned', all(t and t.get('id_token') == 'local-id-token' for t in tokens)))
+        checks.append((f'{args.n} calls over one connection', len(server.connections) == 1))
+
+        # Server drops the idle keep-alive connection; the next call must reconnect
+        for connection in server.connections:
+            connection.shutdown(2)
+        token = edge.exchange_code_for_tokens(post_data, hostname)
+        checks.append(('reconnect after server closed the connection',
+                       bool(token) and len(server.connections) == 2))
+
+        server.status = 400
+        checks.append(('HTTP 400 returns None', edge.exchange_code_for_tokens(post_data, hostname) is None))
+        server.shutdown()
+
+    failed = False
+    for name, ok in checks:
+        failed |= not ok
+        print(f"[{'OK' if ok else 'FAIL'}] {name}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
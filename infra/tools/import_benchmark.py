@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Cold-start import-time benchmark for the Kelifax Lambdas
+
+Imports each Lambda entry point in a fresh interpreter (python -X importtime)
+several times, reports the per-module breakdown and compares the median total
+against the per-Lambda budget in import-budget.json. Budgets are scaled by
+how much slower than the recording host this machine imports a fixed set of
+standard-library modules, so a slower build host doesn't fail the check when
+nothing has regressed.
+
+By default boto3/botocore/jwt are replaced with tiny stub modules so the
+benchmark runs offline and measures only our own code; pass --real-deps to
+import the installed packages instead.
+
+Usage:
+    python infra/tools/import_benchmark.py                 # all Lambdas, check budget
+    python infra/tools/import_benchmark.py api -n 50 --top 25
+    python infra/tools/import_benchmark.py --update-budget # rewrite budget from current run
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+INFRA_DIR = os.path.dirname(TOOLS_DIR)
+BUDGET_FILE = os.path.join(TOOLS_DIR, 'import-budget.json')
+
+# Lambda name -> (directory added to sys.path, entry module)
+LAMBDAS = {
+    'api': ('src/lambda', 'app.lambda_function'),
+    'authorizer': ('src/lambda-authorizer/app', 'lambda_function'),
+    'cognito-edge': ('src/cognito-lambda-edge/app-prod', 'lambda_function'),
+    'cache-headers-edge': ('src/cache-headers-lambda-edge/app', 'lambda_function'),
+}
+
+BEGIN_MARKER = '--kelifax-import-begin--'
+
+# Fixed standard-library import used to gauge how fast this host is. It is
+# timed like a Lambda entry point (fresh interpreter, median of --runs) and
+# doesn't depend on our code, so it only changes with the machine and Python.
+# --update-budget stores its median as reference.median_ms; each check
+# multiplies every budget by max(1, current median / recorded median).
+REFERENCE_IMPORT = 'decimal, email.message, http.client, json, urllib.request'
+
+# Offline stand-ins for third-party modules, written to a temp dir that is put
+# ahead of site-packages. They only need to survive module-level code.
+STUB_MODULES = {
+    'boto3/__init__.py': (
+        'from boto3 import session\n'
+        'def client(*args, **kwargs):\n'
+        '    return session.Session().client(*args, **kwargs)\n'
+        'def resource(*args, **kwargs):\n'
+        '    return session.Session().resource(*args, **kwargs)\n'
+    ),
+    'boto3/session.py': (
+        'class Session:\n'
+        '    def __init__(self, *args, **kwargs):\n'
+        '        pass\n'
+        '    def client(self, *args, **kwargs):\n'
+        '        raise RuntimeError("boto3 is stubbed by import_benchmark")\n'
+        '    resource = client\n'
+    ),
+    'boto3/dynamodb/__init__.py': '',
+    'boto3/dynamodb/conditions.py': (
+        'class _Condition:\n'
+        '    def __init__(self, name):\n'
+        '        self.name = name\n'
+        '    def __getattr__(self, op):\n'
+        '        return lambda *args: self\n'
+        'Key = Attr = _Condition\n'
+    ),
+    'boto3/dynamodb/types.py': (
+        'class TypeDeserializer:\n'
+        '    def deserialize(self, value):\n'
+        '        return value\n'
+        'class TypeSerializer(TypeDeserializer):\n'
+        '    serialize = TypeDeserializer.deserialize\n'
+    ),
+    'botocore/__init__.py': '',
+    'botocore/config.py': (
+        'class Config:\n'
+        '    def __init__(self, **kwargs):\n'
+        '        self.__dict__.update(kwargs)\n'
+    ),
+    'botocore/exceptions.py': (
+        'class ClientError(Exception):\n'
+        '    pass\n'
+    ),
+    'jwt/__init__.py': (
+        'from jwt import algorithms\n'
+        'class InvalidTokenError(Exception):\n'
+        '    pass\n'
+        'class PyJWKClientError(Exception):\n'
+        '    pass\n'
+        'def decode(*args, **kwargs):\n'
+        '    raise InvalidTokenError("jwt is stubbed by import_benchmark")\n'
+        'get_unverified_header = decode\n'
+    ),
+    'jwt/algorithms.py': (
+        'class RSAAlgorithm:\n'
+        '    @staticmethod\n'
+        '    def from_jwk(jwk):\n'
+        '        return jwk\n'
+    ),
+}
+
+
+def write_stubs(directory):
+    """Write the stub packages into directory"""
+    for relative_path, source in STUB_MODULES.items():
+        path = os.path.join(directory, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(source)
+
+
+def run_import(lambda_dir, module, stub_dir):
+    """
+    Import module once in a fresh interpreter
+
+    Returns:
+        tuple: (wall-clock import ms, {module: (self_us, cumulative_us)})
+    """
+    python_path = [lambda_dir]
+    if stub_dir:
+        python_path.insert(0, stub_dir)
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(python_path)
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    env.setdefault('ENVIRONMENT', 'dev')
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+    code = (
+        'import sys, time\n'
+        f'sys.stderr.write({BEGIN_MARKER!r} + "\\n")\n'
+        'start = time.perf_counter()\n'
+        f'import {module}\n'
+        'print((time.perf_counter() - start) * 1000)\n'
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=lambda_dir, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'Importing {module} failed:\n{result.stderr[-2000:]}')
+
+    timings = {}
+    started = False
+    for line in result.stderr.splitlines():
+        if line == BEGIN_MARKER:
+            started = True
+            continue
+        if not started or not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+
+    return float(result.stdout.strip().splitlines()[-1]), timings
+
+
+def benchmark(name, runs, stub_dir):
+    """Import one Lambda entry point `runs` times and aggregate the medians"""
+    relative_dir, module = LAMBDAS[name]
+    lambda_dir = os.path.join(INFRA_DIR, relative_dir)
+
+    wall_ms = []
+    per_module = {}
+    for _ in range(runs):
+        elapsed_ms, timings = run_import(lambda_dir, module, stub_dir)
+        wall_ms.append(elapsed_ms)
+        for mod, (self_us, cumulative_us) in timings.items():
+            samples = per_module.setdefault(mod, ([], []))
+            samples[0].append(self_us)
+            samples[1].append(cumulative_us)
+
+    modules = {
+        mod: (statistics.median(selfs) / 1000, statistics.median(cumulatives) / 1000)
+        for mod, (selfs, cumulatives) in per_module.items()
+    }
+    return {
+        'lambda': name,
+        'module': module,
+        'runs': runs,
+        'median_ms': statistics.median(wall_ms),
+        'p90_ms': sorted(wall_ms)[int(0.9 * (len(wall_ms) - 1))],
+        'imported_modules': len(modules),
+        'modules': modules,
+    }
+
+
+def reference_median(runs):
+    """Median wall-clock ms of REFERENCE_IMPORT in a fresh interpreter"""
+    return statistics.median(run_import(TOOLS_DIR, REFERENCE_IMPORT, None)[0] for _ in range(runs))
+
+
+def host_factor(budget, reference_ms):
+    """
+    How much slower this host is than the one the budget was recorded on
+
+    Never below 1, so a fast host still gets the recorded budget.
+    """
+    recorded_ms = budget.get('reference', {}).get('median_ms')
+    if not recorded_ms or reference_ms is None:
+        return 1.0
+    return max(1.0, reference_ms / recorded_ms)
+
+
+def print_report(result, top):
+    print(f"\n== {result['lambda']} ({result['module']}) - {result['runs']} runs ==")
+    print(f"import wall time: median {result['median_ms']:.2f} ms, p90 {result['p90_ms']:.2f} ms, "
+          f"{result['imported_modules']} modules")
+    print(f"{'self ms':>10} {'cumul ms':>10}  module")
+    ranked = sorted(result['modules'].items(), key=lambda entry: entry[1][1], reverse=True)
+    for mod, (self_ms, cumulative_ms) in ranked[:top]:
+        print(f'{self_ms:10.2f} {cumulative_ms:10.2f}  {mod}')
+
+
+def load_budget():
+    try:
+        with open(BUDGET_FILE) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold-start import-time benchmark for the Kelifax Lambdas')
+    parser.add_argument('lambdas', nargs='*', help=f"Lambdas to benchmark: {', '.join(LAMBDAS)} (default: all)")
+    parser.add_argument('-n', '--runs', type=int, default=20, help='fresh interpreters per Lambda (default: 20)')
+    parser.add_argument('--top', type=int, default=15, help='modules to show per Lambda (default: 15)')
+    parser.add_argument('--real-deps', action='store_true', help='import installed boto3/jwt instead of stubs')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('--update-budget', action='store_true', help='write current medians plus headroom as the new budget')
+    parser.add_argument('--headroom', type=float, default=0.5, help='budget headroom for --update-budget (default: 0.5 = +50%%)')
+    args = parser.parse_args()
+
+    names = args.lambdas or list(LAMBDAS)
+    unknown = [name for name in names if name not in LAMBDAS]
+    if unknown:
+        parser.error(f"unknown Lambda(s): {', '.join(unknown)}")
+    with tempfile.TemporaryDirectory() as stub_dir:
+        if not args.real_deps:
+            write_stubs(stub_dir)
+        results = [benchmark(name, args.runs, None if args.real_deps else stub_dir) for name in names]
+
+    budget = load_budget()
+    mode = 'real' if args.real_deps else 'stubbed'
+    reference_ms = reference_median(args.runs) if args.update_budget or 'reference' in budget else None
+
+    if args.update_budget:
+        budget['reference'] = {'median_ms': round(reference_ms, 2)}
+        for result in results:
+            budget.setdefault(result['lambda'], {})[f'{mode}_max_ms'] = round(result['median_ms'] * (1 + args.headroom), 1)
+        with open(BUDGET_FILE, 'w') as f:
+            json.dump(budget, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'Budget written to {BUDGET_FILE}')
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print_report(result, args.top)
+
+    print()
+    factor = host_factor(budget, reference_ms)
+    if reference_ms is not None:
+        print(f"reference import: median {reference_ms:.2f} ms, budgets scaled by {factor:.2f}")
+    over_budget = False
+    for result in results:
+        limit = budget.get(result['lambda'], {}).get(f'{mode}_max_ms')
+        if limit is None:
+            print(f"[SKIP] {result['lambda']}: no {mode} budget")
+            continue
+        limit = round(limit * factor, 1)
+        status = 'OK' if result['median_ms'] <= limit else 'OVER'
+        over_budget = over_budget or status == 'OVER'
+        print(f"[{status}] {result['lambda']}: median {result['median_ms']:.2f} ms (budget {limit} ms)")
+
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
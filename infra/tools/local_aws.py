@@ -0,0 +1,756 @@
+"""
+In-memory stand-ins for the AWS services used by the Kelifax API Lambda
+
+Implements the subset of the DynamoDB (client and Table resource), S3 and SSM
+APIs that the handlers call, so app.lambda_function can run on one machine
+without AWS. Register them with app.aws_clients:
+
+    from local_aws import create_stand_ins, install_stand_ins
+    install_stand_ins(create_stand_ins(table_name, seed_files=[...]))
+
+Only what the handlers need is supported: string key/filter/update
+expressions (=, <>, <, <=, >, >=, BETWEEN, IN, begins_with, contains,
+attribute_exists/not_exists, AND/OR/NOT), the table's primary key and its two
+GSIs (ResourceStatusIndex, CategoryIndex), Limit/ExclusiveStartKey paging
+and parallel scan segments.
+"""
+import hashlib
+import json
+import re
+import threading
+import zlib
+from decimal import Decimal
+
+from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import ConditionExpressionBuilder
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+TABLE_HASH_KEY = 'resourceSlug'
+
+# Index name -> (hash key, range key)
+TABLE_INDEXES = {
+    'ResourceStatusIndex': ('resourceStatus', 'createdAt'),
+    'CategoryIndex': ('category', 'createdAt'),
+}
+
+
+def client_error(code, message, operation, status=400):
+    return ClientError(
+        {'Error': {'Code': code, 'Message': message}, 'ResponseMetadata': {'HTTPStatusCode': status}},
+        operation
+    )
+
+
+# ---------------------------------------------------------------------------
+# DynamoDB expression evaluation
+# ---------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(r'\s*(<>|<=|>=|[=<>(),]|[#:]?[A-Za-z_][\w.\-]*|\[\d+\])')
+
+
+def _tokenize(expression):
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _TOKEN_RE.match(expression, position)
+        if not match:
+            raise ValueError(f'Cannot parse expression near: {expression[position:]!r}')
+        tokens.append(match.group(1))
+        position = match.end()
+        while position < len(expression) and expression[position].isspace():
+            position += 1
+    return tokens
+
+
+def _plain(value):
+    """Wire attribute value -> comparable Python value"""
+    if value is None:
+        return None
+    (kind, raw), = value.items()
+    if kind == 'N':
+        return Decimal(raw)
+    if kind in ('SS', 'NS'):
+        return set(raw)
+    return raw
+
+
+class _ExpressionParser:
+    """Recursive-descent parser producing a predicate over wire-format items"""
+
+    def __init__(self, expression, names, values):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.names = names or {}
+        self.values = values or {}
+
+    def parse(self):
+        predicate = self._or()
+        if self.position != len(self.tokens):
+            raise ValueError(f'Unexpected token {self.tokens[self.position]!r}')
+        return predicate
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _take(self, expected=None):
+        token = self._peek()
+        if expected is not None and (token is None or token.upper() != expected):
+            raise ValueError(f'Expected {expected}, got {token!r}')
+        self.position += 1
+        return token
+
+    def _or(self):
+        left = self._and()
+        while (self._peek() or '').upper() == 'OR':
+            self._take()
+            right = self._and()
+            left = (lambda l, r: lambda item: l(item) or r(item))(left, right)
+        return left
+
+    def _and(self):
+        left = self._not()
+        while (self._peek() or '').upper() == 'AND':
+            self._take()
+            right = self._not()
+            left = (lambda l, r: lambda item: l(item) and r(item))(left, right)
+        return left
+
+    def _not(self):
+        if (self._peek() or '').upper() == 'NOT':
+            self._take()
+            inner = self._not()
+            return lambda item: not inner(item)
+        return self._comparison()
+
+    def _operand(self):
+        token = self._take()
+        if token.startswith(':'):
+            value = _plain(self.values[token])
+            return lambda item: value
+        name = self.names.get(token, token)
+        return lambda item: _plain(item.get(name))
+
+    def _path(self):
+        token = self._take()
+        return self.names.get(token, token)
+
+    def _comparison(self):
+        token = self._peek()
+        if token == '(':
+            self._take()
+            inner = self._or()
+            self._take(')')
+            return inner
+
+        function = (token or '').lower()
+        if function in ('attribute_exists', 'attribute_not_exists'):
+            self._take()
+            self._take('(')
+            name = self._path()
+            self._take(')')
+            if function == 'attribute_exists':
+                return lambda item: name in item
+            return lambda item: name not in item
+        if function in ('begins_with', 'contains'):
+            self._take()
+            self._take('(')
+            left = self._operand()
+            self._take(',')
+            right = self._operand()
+            self._take(')')
+            if function == 'begins_with':
+                return lambda item: isinstance(left(item), str) and left(item).startswith(right(item))
+            return lambda item: left(item) is not None and right(item) in left(item)
+
+        left = self._operand()
+        operator = self._take().upper()
+        if operator == 'BETWEEN':
+            low = self._operand()
+            self._take('AND')
+            high = self._operand()
+            return lambda item: left(item) is not None and low(item) <= left(item) <= high(item)
+        if operator == 'IN':
+            self._take('(')
+            options = [self._operand()]
+            while self._peek() == ',':
+                self._take()
+                options.append(self._operand())
+            self._take(')')
+            return lambda item: any(left(item) == option(item) for option in options)
+
+        right = self._operand()
+
+        def compare(item):
+            a, b = left(item), right(item)
+            if operator == '=':
+                return a == b
+            if operator == '<>':
+                return a != b
+            if a is None or b is None or type(a) is not type(b):
+                return False
+            return {'<': a < b, '<=': a <= b, '>': a > b, '>=': a >= b}[operator]
+        return compare
+
+
+def compile_condition(expression, names=None, values=None):
+    """Compile a DynamoDB condition/filter/key expression into item -> bool"""
+    if not expression:
+        return lambda item: True
+    return _ExpressionParser(expression, names, values).parse()
+
+
+def _split_top_level(text, separator=','):
+    parts, depth, current = [], 0, ''
+    for char in text:
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        if char == separator and depth == 0:
+            parts.append(current)
+            current = ''
+        else:
+            current += char
+    parts.append(current)
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _update_value(expression, item, names, values):
+    """Evaluate the right-hand side of a SET action"""
+    expression = expression.strip()
+    for operator in ('+', '-'):
+        parts = _split_top_level(expression, operator)
+        if len(parts) == 2:
+            a = _plain(_update_value(parts[0], item, names, values))
+            b = _plain(_update_value(parts[1], item, names, values))
+            return {'N': str(a + b if operator == '+' else a - b)}
+    match = re.match(r'if_not_exists\s*\((.*)\)$', expression)
+    if match:
+        path, default = _split_top_level(match.group(1))
+        existing = item.get(names.get(path, path))
+        return existing if existing is not None else _update_value(default, item, names, values)
+    if expression.startswith(':'):
+        return values[expression]
+    return item.get(names.get(expression, expression))
+
+
+def apply_update(item, expression, names=None, values=None):
+    """Apply a SET/ADD/REMOVE update expression to a wire-format item in place"""
+    names = names or {}
+    values = values or {}
+    clauses = re.split(r'\b(SET|ADD|REMOVE|DELETE)\b', expression, flags=re.IGNORECASE)
+    action = None
+    for clause in clauses:
+        clause = clause.strip()
+        if not clause:
+            continue
+        if clause.upper() in ('SET', 'ADD', 'REMOVE', 'DELETE'):
+            action = clause.upper()
+            continue
+        for part in _split_top_level(clause):
+            if action == 'SET':
+                path, value = part.split('=', 1)
+                path = path.strip()
+                item[names.get(path, path)] = _update_value(value, item, names, values)
+            elif action == 'ADD':
+                path, value = part.split(None, 1)
+                name = names.get(path, path)
+                increment = values[value.strip()]
+                if 'N' in increment:
+                    current = _plain(item.get(name)) or Decimal(0)
+                    item[name] = {'N': str(current + Decimal(increment['N']))}
+                else:
+                    (kind, members), = increment.items()
+                    item[name] = {kind: sorted(set(item.get(name, {}).get(kind, [])) | set(members))}
+            elif action == 'REMOVE':
+                item.pop(names.get(part, part), None)
+            elif action == 'DELETE':
+                path, value = part.split(None, 1)
+                name = names.get(path, path)
+                (kind, members), = values[value.strip()].items()
+                remaining = sorted(set(item.get(name, {}).get(kind, [])) - set(members))
+                if remaining:
+                    item[name] = {kind: remaining}
+                else:
+                    item.pop(name, None)
+
+
+def _project(item, projection, names):
+    if not projection:
+        return item
+    attributes = [names.get(part, part) for part in _split_top_level(projection)]
+    return {name: item[name] for name in attributes if name in item}
+
+
+def _item_size(item):
+    return len(json.dumps(item))
+
+
+# ---------------------------------------------------------------------------
+# DynamoDB
+# ---------------------------------------------------------------------------
+
+class LocalDynamoDBClient:
+    """Low-level DynamoDB client stand-in (wire-format items)"""
+
+    def __init__(self):
+        self._tables = {}
+        self._lock = threading.RLock()
+
+    def load_items(self, table_name, items):
+        """Seed a table with wire-format items"""
+        with self._lock:
+            table = self._tables.setdefault(table_name, {})
+            for item in items:
+                table[item[TABLE_HASH_KEY]['S']] = json.loads(json.dumps(item))
+
+    def load_batch_file(self, table_name, path):
+        """Seed from a batch-write-item JSON file (infra/src/dynamodb/data.json format)"""
+        with open(path) as f:
+            data = json.load(f)
+        requests = next(iter(data.values()))
+        self.load_items(table_name, [request['PutRequest']['Item'] for request in requests])
+
+    def _table(self, table_name):
+        return self._tables.setdefault(table_name, {})
+
+    @staticmethod
+    def _capacity(table_name, evaluated_bytes, request):
+        if request.get('ReturnConsumedCapacity') in ('TOTAL', 'INDEXES'):
+            units = max(0.5, -(-evaluated_bytes // 4096) * 0.5)
+            return {'ConsumedCapacity': {'TableName': table_name, 'CapacityUnits': units}}
+        return {}
+
+    def get_item(self, TableName, Key, ProjectionExpression=None, ExpressionAttributeNames=None, **kwargs):
+        with self._lock:
+            item = self._table(TableName).get(Key[TABLE_HASH_KEY]['S'])
+            if item is None:
+                return {}
+            return {'Item': json.loads(json.dumps(_project(item, ProjectionExpression, ExpressionAttributeNames or {})))}
+
+    def batch_get_item(self, RequestItems, **kwargs):
+        responses = {}
+        for table_name, request in RequestItems.items():
+            found = []
+            for key in request['Keys']:
+                result = self.get_item(table_name, key, request.get('ProjectionExpression'),
+                                       request.get('ExpressionAttributeNames'))
+                if 'Item' in result:
+                    found.append(result['Item'])
+            responses[table_name] = found
+        return {'Responses': responses, 'UnprocessedKeys': {}}
+
+    def _check_condition(self, existing, kwargs, operation):
+        expression = kwargs.get('ConditionExpression')
+        if expression and not compile_condition(
+                expression, kwargs.get('ExpressionAttributeNames'), kwargs.get('ExpressionAttributeValues'))(existing or {}):
+            raise client_error('ConditionalCheckFailedException', 'The conditional request failed', operation)
+
+    def put_item(self, TableName, Item, **kwargs):
+        with self._lock:
+            table = self._table(TableName)
+            key = Item[TABLE_HASH_KEY]['S']
+            self._check_condition(table.get(key), kwargs, 'PutItem')
+            table[key] = json.loads(json.dumps(Item))
+            return {}
+
+    def update_item(self, TableName, Key, UpdateExpression, ExpressionAttributeNames=None,
+                    ExpressionAttributeValues=None, ReturnValues='NONE', **kwargs):
+        with self._lock:
+            table = self._table(TableName)
+            key = Key[TABLE_HASH_KEY]['S']
+            self._check_condition(table.get(key), {**kwargs,
+                                                   'ExpressionAttributeNames': ExpressionAttributeNames,
+                                                   'ExpressionAttributeValues': ExpressionAttributeValues}, 'UpdateItem')
+            item = table.setdefault(key, json.loads(json.dumps(Key)))
+            apply_update(item, UpdateExpression, ExpressionAttributeNames, ExpressionAttributeValues)
+            if ReturnValues == 'ALL_NEW':
+                return {'Attributes': json.loads(json.dumps(item))}
+            return {}
+
+    def delete_item(self, TableName, Key, **kwargs):
+        with self._lock:
+            table = self._table(TableName)
+            key = Key[TABLE_HASH_KEY]['S']
+            self._check_condition(table.get(key), kwargs, 'DeleteItem')
+            old = table.pop(key, None)
+            if kwargs.get('ReturnValues') == 'ALL_OLD' and old:
+                return {'Attributes': old}
+            return {}
+
+    def _page(self, table_name, items, key_names, request):
+        """Apply ExclusiveStartKey, Limit, filter and projection to an ordered item list"""
+        names = request.get('ExpressionAttributeNames') or {}
+        values = request.get('ExpressionAttributeValues') or {}
+        start_key = request.get('ExclusiveStartKey')
+        if start_key:
+            start_slug = start_key[TABLE_HASH_KEY]['S']
+            slugs = [item[TABLE_HASH_KEY]['S'] for item in items]
+            items = items[slugs.index(start_slug) + 1:] if start_slug in slugs else []
+
+        limit = request.get('Limit')
+        evaluated = items[:limit] if limit else items
+        matches = compile_condition(request.get('FilterExpression'), names, values)
+        result = [item for item in evaluated if matches(item)]
+
+        response = {
+            'Count': len(result),
+            'ScannedCount': len(evaluated),
+        }
+        if request.get('Select') != 'COUNT':
+            response['Items'] = [
+                json.loads(json.dumps(_project(item, request.get('ProjectionExpression'), names)))
+                for item in result
+            ]
+        if limit and len(items) > limit:
+            last = evaluated[-1]
+            response['LastEvaluatedKey'] = {name: last[name] for name in key_names if name in last}
+        response.update(self._capacity(table_name, sum(_item_size(item) for item in evaluated), request))
+        return response
+
+    def query(self, TableName, KeyConditionExpression, IndexName=None, ScanIndexForward=True, **kwargs):
+        with self._lock:
+            items = list(self._table(TableName).values())
+        if IndexName:
+            hash_key, range_key = TABLE_INDEXES[IndexName]
+            key_names = [TABLE_HASH_KEY, hash_key, range_key]
+        else:
+            hash_key, range_key = TABLE_HASH_KEY, None
+            key_names = [TABLE_HASH_KEY]
+
+        matches = compile_condition(KeyConditionExpression, kwargs.get('ExpressionAttributeNames'),
+                                    kwargs.get('ExpressionAttributeValues'))
+        # GSIs are sparse: only items carrying the index keys appear
+        items = [item for item in items if hash_key in item and (range_key is None or range_key in item)]
+        items = [item for item in items if matches(item)]
+        items.sort(key=lambda item: (_plain(item.get(range_key)) if range_key else '', item[TABLE_HASH_KEY]['S']),
+                   reverse=not ScanIndexForward)
+        return self._page(TableName, items, key_names, kwargs)
+
+    def scan(self, TableName, Segment=None, TotalSegments=None, IndexName=None, **kwargs):
+        with self._lock:
+            items = sorted(self._table(TableName).values(), key=lambda item: item[TABLE_HASH_KEY]['S'])
+        if TotalSegments:
+            items = [
+                item for item in items
+                if zlib.crc32(item[TABLE_HASH_KEY]['S'].encode()) % TotalSegments == Segment
+            ]
+        return self._page(TableName, items, [TABLE_HASH_KEY], kwargs)
+
+    def get_paginator(self, operation_name):
+        return _Paginator(getattr(self, operation_name))
+
+
+class _Paginator:
+    def __init__(self, method):
+        self._method = method
+
+    def paginate(self, **kwargs):
+        while True:
+            page = self._method(**kwargs)
+            yield page
+            if 'LastEvaluatedKey' not in page:
+                return
+            kwargs['ExclusiveStartKey'] = page['LastEvaluatedKey']
+
+
+class LocalDynamoDBTable:
+    """boto3 Table resource stand-in backed by LocalDynamoDBClient"""
+
+    _serializer = TypeSerializer()
+    _deserializer = TypeDeserializer()
+
+    def __init__(self, client, name):
+        self._client = client
+        self.name = name
+        self.table_name = name
+
+    def _to_wire(self, values):
+        return {key: self._serializer.serialize(value) for key, value in values.items()}
+
+    def _from_wire(self, item):
+        return {key: self._deserializer.deserialize(value) for key, value in item.items()}
+
+    def _build(self, kwargs):
+        """Convert resource-style arguments (conditions, Python values) to client arguments"""
+        request = dict(kwargs)
+        names = dict(request.pop('ExpressionAttributeNames', None) or {})
+        values = self._to_wire(request.pop('ExpressionAttributeValues', None) or {})
+        builder = ConditionExpressionBuilder()
+        for field, is_key in (('KeyConditionExpression', True), ('FilterExpression', False),
+                              ('ConditionExpression', False)):
+            condition = request.get(field)
+            if condition is not None and not isinstance(condition, str):
+                built = builder.build_expression(condition, is_key_condition=is_key)
+                request[field] = built.condition_expression
+                names.update(built.attribute_name_placeholders)
+                values.update(self._to_wire(built.attribute_value_placeholders))
+        for field in ('Key', 'Item', 'ExclusiveStartKey'):
+            if field in request:
+                request[field] = self._to_wire(request[field])
+        if names:
+            request['ExpressionAttributeNames'] = names
+        if values:
+            request['ExpressionAttributeValues'] = values
+        return request
+
+    def _convert(self, response):
+        response = dict(response)
+        for field in ('Item', 'Attributes', 'LastEvaluatedKey'):
+            if field in response:
+                response[field] = self._from_wire(response[field])
+        if 'Items' in response:
+            response['Items'] = [self._from_wire(item) for item in response['Items']]
+        return response
+
+    def get_item(self, **kwargs):
+        return self._convert(self._client.get_item(TableName=self.name, **self._build(kwargs)))
+
+    def put_item(self, **kwargs):
+        return self._convert(self._client.put_item(TableName=self.name, **self._build(kwargs)))
+
+    def update_item(self, **kwargs):
+        return self._convert(self._client.update_item(TableName=self.name, **self._build(kwargs)))
+
+    def delete_item(self, **kwargs):
+        return self._convert(self._client.delete_item(TableName=self.name, **self._build(kwargs)))
+
+    def query(self, **kwargs):
+        return self._convert(self._client.query(TableName=self.name, **self._build(kwargs)))
+
+    def scan(self, **kwargs):
+        return self._convert(self._client.scan(TableName=self.name, **self._build(kwargs)))
+
+
+class LocalDynamoDBResource:
+    """boto3 dynamodb resource stand-in"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def Table(self, name):
+        return LocalDynamoDBTable(self._client, name)
+
+
+# ---------------------------------------------------------------------------
+# S3
+# ---------------------------------------------------------------------------
+
+class _StreamingBody:
+    def __init__(self, data):
+        self._data = data
+
+    def read(self, amount=None):
+        data, self._data = (self._data, b'') if amount is None else (self._data[:amount], self._data[amount:])
+        return data
+
+    def close(self):
+        pass
+
+
+class _S3Exceptions:
+    class NoSuchKey(ClientError):
+        pass
+
+    class NoSuchBucket(ClientError):
+        pass
+
+    ClientError = ClientError
+
+
+class LocalS3Client:
+    """S3 client stand-in keeping objects in memory"""
+
+    exceptions = _S3Exceptions
+
+    def __init__(self, base_url='http://localhost:3001/_local_s3'):
+        self._objects = {}
+        self._lock = threading.Lock()
+        self.base_url = base_url
+
+    def _missing(self, key, operation):
+        return _S3Exceptions.NoSuchKey(
+            {'Error': {'Code': 'NoSuchKey', 'Message': f'The specified key does not exist: {key}'},
+             'ResponseMetadata': {'HTTPStatusCode': 404}},
+            operation
+        )
+
+    def _get(self, bucket, key, operation):
+        obj = self._objects.get((bucket, key))
+        if obj is None:
+            raise self._missing(key, operation)
+        return obj
+
+    def put_object(self, Bucket, Key, Body=b'', ContentType='binary/octet-stream', Metadata=None,
+                   ContentEncoding=None, CacheControl=None, **kwargs):
+        data = Body.encode('utf-8') if isinstance(Body, str) else bytes(Body)
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        with self._lock:
+            if 'IfMatch' in kwargs:
+                current = self._objects.get((Bucket, Key))
+                if current is None or current['ETag'] != kwargs['IfMatch']:
+                    raise client_error('PreconditionFailed', 'At least one of the pre-conditions you specified '
+                                       'did not hold', 'PutObject', 412)
+            self._objects[(Bucket, Key)] = {
+                'Body': data, 'ContentType': ContentType, 'Metadata': dict(Metadata or {}),
+                'ContentEncoding': ContentEncoding, 'CacheControl': CacheControl, 'ETag': etag,
+            }
+        return {'ETag': etag}
+
+    def _describe(self, obj):
+        description = {
+            'ContentLength': len(obj['Body']), 'ContentType': obj['ContentType'],
+            'Metadata': dict(obj['Metadata']), 'ETag': obj['ETag'],
+        }
+        for field in ('ContentEncoding', 'CacheControl'):
+            if obj.get(field):
+                description[field] = obj[field]
+        return description
+
+    def head_object(self, Bucket, Key, **kwargs):
+        with self._lock:
+            obj = self._objects.get((Bucket, Key))
+        if obj is None:
+            raise client_error('404', 'Not Found', 'HeadObject', 404)
+        return self._describe(obj)
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None, **kwargs):
+        with self._lock:
+            obj = self._get(Bucket, Key, 'GetObject')
+        if IfNoneMatch and IfNoneMatch == obj['ETag']:
+            raise client_error('304', 'Not Modified', 'GetObject', 304)
+        return {**self._describe(obj), 'Body': _StreamingBody(obj['Body'])}
+
+    def copy_object(self, CopySource, Bucket, Key, **kwargs):
+        with self._lock:
+            source = self._get(CopySource['Bucket'], CopySource['Key'], 'CopyObject')
+            self._objects[(Bucket, Key)] = dict(source)
+        return {'CopyObjectResult': {'ETag': source['ETag']}}
+
+    def delete_object(self, Bucket, Key, **kwargs):
+        with self._lock:
+            self._objects.pop((Bucket, Key), None)
+        return {}
+
+    def delete_objects(self, Bucket, Delete, **kwargs):
+        deleted = []
+        with self._lock:
+            for entry in Delete['Objects']:
+                self._objects.pop((Bucket, entry['Key']), None)
+                deleted.append({'Key': entry['Key']})
+        return {'Deleted': deleted}
+
+    def list_objects_v2(self, Bucket, Prefix='', **kwargs):
+        with self._lock:
+            keys = sorted(key for bucket, key in self._objects if bucket == Bucket and key.startswith(Prefix))
+            contents = [{'Key': key, 'Size': len(self._objects[(Bucket, key)]['Body'])} for key in keys]
+        return {'Contents': contents, 'KeyCount': len(contents), 'IsTruncated': False}
+
+    def generate_presigned_url(self, ClientMethod, Params, ExpiresIn=3600, **kwargs):
+        return f"{self.base_url}/{Params['Bucket']}/{Params['Key']}"
+
+    def read(self, bucket, key):
+        """Raw object bytes (used by the local server to serve presigned URLs)"""
+        with self._lock:
+            return self._get(bucket, key, 'GetObject')['Body']
+
+
+# ---------------------------------------------------------------------------
+# SSM Parameter Store
+# ---------------------------------------------------------------------------
+
+class _SSMExceptions:
+    class ParameterNotFound(ClientError):
+        pass
+
+    ClientError = ClientError
+
+
+class LocalSSMClient:
+    """SSM Parameter Store stand-in"""
+
+    exceptions = _SSMExceptions
+
+    def __init__(self, parameters=None):
+        self._parameters = {}
+        self._lock = threading.Lock()
+        for name, value in (parameters or {}).items():
+            self.put_parameter(Name=name, Value=value, Overwrite=True)
+
+    def _parameter(self, name):
+        entry = self._parameters[name]
+        return {'Name': name, 'Value': entry['Value'], 'Type': entry['Type'], 'Version': entry['Version']}
+
+    def get_parameter(self, Name, WithDecryption=False, **kwargs):
+        with self._lock:
+            if Name not in self._parameters:
+                raise _SSMExceptions.ParameterNotFound(
+                    {'Error': {'Code': 'ParameterNotFound', 'Message': Name}}, 'GetParameter')
+            return {'Parameter': self._parameter(Name)}
+
+    def get_parameters(self, Names, WithDecryption=False, **kwargs):
+        with self._lock:
+            found = [self._parameter(name) for name in Names if name in self._parameters]
+            invalid = [name for name in Names if name not in self._parameters]
+        return {'Parameters': found, 'InvalidParameters': invalid}
+
+    def get_parameters_by_path(self, Path, Recursive=False, WithDecryption=False, **kwargs):
+        prefix = Path.rstrip('/') + '/'
+        with self._lock:
+            found = [
+                self._parameter(name) for name in sorted(self._parameters)
+                if name.startswith(prefix) and (Recursive or '/' not in name[len(prefix):])
+            ]
+        return {'Parameters': found}
+
+    def put_parameter(self, Name, Value, Type='String', Overwrite=False, **kwargs):
+        with self._lock:
+            existing = self._parameters.get(Name)
+            if existing and not Overwrite:
+                raise client_error('ParameterAlreadyExists', Name, 'PutParameter')
+            version = existing['Version'] + 1 if existing else 1
+            self._parameters[Name] = {'Value': Value, 'Type': Type, 'Version': version}
+        return {'Version': version}
+
+
+# ---------------------------------------------------------------------------
+# Wiring
+# ---------------------------------------------------------------------------
+
+def create_stand_ins(table_name, environment='dev', seed_files=(), bucket_url='s3://kelifax-resources/dev/',
+                     admin_password='admin', s3_base_url='http://localhost:3001/_local_s3'):
+    """
+    Build a fresh set of stand-ins
+
+    Returns:
+        dict: {'dynamodb': client, 's3': client, 'ssm': client, 'dynamodb_resource': resource}
+    """
+    dynamodb = LocalDynamoDBClient()
+    for path in seed_files:
+        dynamodb.load_batch_file(table_name, path)
+
+    ssm = LocalSSMClient({
+        f'/kelifax/{environment}/bucketResources': bucket_url,
+        f'/kelifax/{environment}/adminUsername': 'admin',
+        f'/kelifax/{environment}/adminPassword': admin_password,
+    })
+
+    return {
+        'dynamodb': dynamodb,
+        's3': LocalS3Client(s3_base_url),
+        'ssm': ssm,
+        'dynamodb_resource': LocalDynamoDBResource(dynamodb),
+    }
+
+
+def install_stand_ins(stand_ins):
+    """Register stand-ins with app.aws_clients so the handlers use them"""
+    from app import aws_clients
+
+    aws_clients.reset_clients()
+    for service_name, stand_in in stand_ins.items():
+        if service_name == 'dynamodb_resource':
+            aws_clients.set_resource('dynamodb', stand_in)
+        else:
+            aws_clients.set_client(service_name, stand_in)
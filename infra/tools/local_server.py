@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Local HTTP server that runs the real API Lambda handler
+
+Translates HTTP requests into API Gateway (REST, proxy integration) events,
+calls app.lambda_function.lambda_handler and turns the proxy response back
+into HTTP. AWS services are replaced by in-memory stand-ins (local_aws.py by
+default, or any factory passed with --stand-ins), so the Astro site and load
+generators can hit the handler code on one machine.
+
+Usage:
+    python infra/tools/local_server.py                          # :3001, 8 threads
+    python infra/tools/local_server.py --workers 4 --mode process --port 8080
+    python infra/tools/local_server.py --admin                  # pretend every request is an authenticated admin
+    python infra/tools/local_server.py --stand-ins mymodule:make_stand_ins
+
+Point the site at it with PUBLIC_USE_API=true PUBLIC_API_URL=http://localhost:3001.
+
+In process mode each worker has its own copy of the stand-ins (seeded the
+same way), so writes made through one worker are not seen by the others.
+"""
+import argparse
+import base64
+import importlib
+import json
+import os
+import signal
+import socket
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+INFRA_DIR = os.path.dirname(TOOLS_DIR)
+LAMBDA_DIR = os.path.join(INFRA_DIR, 'src', 'lambda')
+DEFAULT_SEEDS = [
+    os.path.join(INFRA_DIR, 'src', 'dynamodb', 'data.json'),
+    os.path.join(INFRA_DIR, 'src', 'dynamodb', 'data-update.json'),
+]
+
+sys.path.insert(0, LAMBDA_DIR)
+sys.path.insert(0, TOOLS_DIR)
+
+# Authorizer context injected with --admin (mirrors the Lambda authorizer's output)
+ADMIN_AUTHORIZER_CONTEXT = {
+    'authenticated': 'true',
+    'userId': 'local-admin',
+    'email': 'admin@kelifax.com',
+    'username': 'local-admin',
+    'tokenUse': 'id',
+    'groups': '["admin"]',
+    'authError': ''
+}
+
+LOCAL_S3_PATH = '/_local_s3/'
+
+
+class LambdaContext:
+    """Minimal stand-in for the Lambda context object"""
+
+    function_name = 'kelifax-local-function'
+    function_version = '$LATEST'
+    memory_limit_in_mb = 256
+
+    def __init__(self, timeout_seconds=30):
+        self.aws_request_id = str(uuid.uuid4())
+        self._deadline = time.monotonic() + timeout_seconds
+
+    def get_remaining_time_in_millis(self):
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def build_event(method, raw_path, headers, body, stage, admin):
+    """HTTP request -> API Gateway REST proxy event"""
+    url = urlsplit(raw_path)
+    query = parse_qs(url.query, keep_blank_values=True)
+
+    header_values = {}
+    for name, value in headers.items():
+        header_values.setdefault(name, []).append(value)
+
+    event = {
+        'resource': url.path,
+        'path': url.path,
+        'httpMethod': method,
+        'headers': {name: values[-1] for name, values in header_values.items()},
+        'multiValueHeaders': header_values,
+        'queryStringParameters': {key: values[-1] for key, values in query.items()} or None,
+        'multiValueQueryStringParameters': query or None,
+        'pathParameters': None,
+        'stageVariables': None,
+        'requestContext': {
+            'requestId': str(uuid.uuid4()),
+            'stage': stage,
+            'httpMethod': method,
+            'path': f'/{stage}{url.path}',
+            'requestTimeEpoch': int(time.time() * 1000),
+            'identity': {'sourceIp': '127.0.0.1'},
+            'authorizer': dict(ADMIN_AUTHORIZER_CONTEXT) if admin else {'authenticated': 'false', 'authError': 'No token found'},
+        },
+        'body': None,
+        'isBase64Encoded': False,
+    }
+
+    if body:
+        try:
+            event['body'] = body.decode('utf-8')
+        except UnicodeDecodeError:
+            event['body'] = base64.b64encode(body).decode('ascii')
+            event['isBase64Encoded'] = True
+    return event
+
+
+class ProxyRequestHandler(BaseHTTPRequestHandler):
+    """Serves every method by invoking the Lambda handler"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'KelifaxLocal/1.0'
+
+    def _handle(self):
+        if self.path.startswith(LOCAL_S3_PATH):
+            return self._serve_s3_object()
+
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        event = build_event(self.command, self.path, dict(self.headers.items()), body,
+                            self.server.config.stage, self.server.config.admin)
+
+        started = time.perf_counter()
+        try:
+            response = self.server.lambda_handler(event, LambdaContext())
+        except Exception as e:
+            response = {'statusCode': 502, 'headers': {'Content-Type': 'application/json'},
+                        'body': json.dumps({'message': 'Lambda handler raised', 'error': str(e)})}
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        payload = response.get('body') or ''
+        payload = base64.b64decode(payload) if response.get('isBase64Encoded') else payload.encode('utf-8')
+
+        self.send_response(int(response.get('statusCode', 200)))
+        for name, value in (response.get('headers') or {}).items():
+            self.send_header(name, str(value))
+        for name, values in (response.get('multiValueHeaders') or {}).items():
+            for value in values:
+                self.send_header(name, str(value))
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('X-Local-Handler-Ms', f'{elapsed_ms:.2f}')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(payload)
+
+    def _serve_s3_object(self):
+        """Serve objects from the S3 stand-in (targets of generate_presigned_url)"""
+        bucket, _, key = self.path[len(LOCAL_S3_PATH):].partition('/')
+        try:
+            data = self.server.stand_ins['s3'].read(bucket, urlsplit(key).path)
+            status = 200
+        except Exception:
+            data, status = b'Not Found', 404
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_HEAD = _handle
+
+    def log_message(self, format, *args):
+        if self.server.config.verbose:
+            super().log_message(format, *args)
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that handles connections on a fixed-size thread pool"""
+
+    def __init__(self, server_address, handler_class, workers, bind_and_activate=True):
+        super().__init__(server_address, handler_class, bind_and_activate)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='lambda-worker')
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
+
+def load_stand_ins(config):
+    """Create the stand-ins via the configured factory ('module:function')"""
+    module_name, _, function_name = config.stand_ins.partition(':')
+    factory = getattr(importlib.import_module(module_name), function_name or 'create_stand_ins')
+    return factory(
+        config.table,
+        environment=config.env,
+        seed_files=config.seed,
+        bucket_url=config.bucket_url,
+        s3_base_url=f'http://{config.host}:{config.port}{LOCAL_S3_PATH.rstrip("/")}',
+    )
+
+
+def make_server(config, sock=None):
+    """Build a server with its own stand-ins and a loaded Lambda handler"""
+    from local_aws import install_stand_ins
+    from app.lambda_function import lambda_handler
+
+    stand_ins = load_stand_ins(config)
+    install_stand_ins(stand_ins)
+
+    threads = config.threads if config.mode == 'process' else config.workers
+    server = PooledHTTPServer((config.host, config.port), ProxyRequestHandler, threads,
+                              bind_and_activate=sock is None)
+    if sock is not None:
+        server.socket = sock
+    server.config = config
+    server.stand_ins = stand_ins
+    server.lambda_handler = lambda_handler
+    return server
+
+
+def serve_processes(config):
+    """Pre-fork config.workers processes that accept on one shared listening socket"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((config.host, config.port))
+    sock.listen(128 * config.workers)
+
+    children = []
+    for _ in range(config.workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            server = make_server(config, sock)
+            try:
+                server.serve_forever()
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+    finally:
+        sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the Kelifax API Lambda behind a local HTTP server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3001)
+    parser.add_argument('--mode', choices=['thread', 'process'], default='thread',
+                        help='thread: one process with a thread pool; process: pre-forked worker processes')
+    parser.add_argument('--workers', type=int, default=8, help='pool threads (thread mode) or processes (process mode)')
+    parser.add_argument('--threads', type=int, default=4, help='threads per worker process in process mode')
+    parser.add_argument('--env', default='dev', help='value of ENVIRONMENT (default: dev)')
+    parser.add_argument('--table', default='kelifax-local-resources', help='DynamoDB table name')
+    parser.add_argument('--stage', default='dev', help='API Gateway stage reported in the event')
+    parser.add_argument('--seed', action='append', help='batch-write JSON file(s) to load (default: infra/src/dynamodb/*.json)')
+    parser.add_argument('--bucket-url', default=None, help='bucketResources parameter (default: s3://kelifax-resources/<env>/)')
+    parser.add_argument('--stand-ins', default='local_aws:create_stand_ins',
+                        help="factory 'module:function' returning {'dynamodb', 's3', 'ssm', 'dynamodb_resource'}")
+    parser.add_argument('--admin', action='store_true', help='inject an authenticated admin authorizer context')
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    config = parser.parse_args()
+
+    config.seed = config.seed if config.seed is not None else DEFAULT_SEEDS
+    config.bucket_url = config.bucket_url or f's3://kelifax-resources/{config.env}/'
+    os.environ['ENVIRONMENT'] = config.env
+    os.environ['DYNAMODB_TABLE'] = config.table
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+    print(f'Kelifax API on http://{config.host}:{config.port} '
+          f'({config.mode} mode, {config.workers} workers, table {config.table})')
+
+    if config.mode == 'process':
+        serve_processes(config)
+        return
+
+    server = make_server(config)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Measure the per-item cost of decoding DynamoDB items into API views
+
+Loads the seed items (infra/src/dynamodb/*.json, already in low-level client
+wire format) and times, per item:
+
+- the previous listing path: TypeDeserializer (what the boto3 Table resource
+  does), building the summary dict, then a json.dumps/json.loads round trip
+  to turn Decimals into floats
+- the previous detail path: TypeDeserializer plus the detail dict
+- app.resource_model: Resource.from_wire plus summary(), detail(),
+  admin_detail() and submission_summary()
+
+It also checks that the new views produce the same data as the old code.
+
+Usage:
+    python infra/tools/resource_codec_benchmark.py
+    python infra/tools/resource_codec_benchmark.py -n 20000
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import timeit
+from decimal import Decimal
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+INFRA_DIR = os.path.dirname(TOOLS_DIR)
+sys.path.insert(0, os.path.join(INFRA_DIR, 'src', 'lambda'))
+
+
+def load_seed_items():
+    items = []
+    for path in sorted(glob.glob(os.path.join(INFRA_DIR, 'src', 'dynamodb', '*.json'))):
+        with open(path) as f:
+            for requests in json.load(f).values():
+                items.extend(request['PutRequest']['Item'] for request in requests if 'PutRequest' in request)
+    return items
+
+
+def decimal_default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+def legacy_summary(deserializer, wire_items):
+    """The listing formatting as it was before resource_model"""
+    formatted = []
+    for wire_item in wire_items:
+        item = {name: deserializer.deserialize(value) for name, value in wire_item.items()}
+        tags_list = []
+        if item.get('tags'):
+            tags_list = [tag.strip() for tag in item['tags'].split(',') if tag.strip()]
+        resource = {
+            'slug': item.get('resourceSlug', ''),
+            'title': item.get('resourceName', ''),
+            'description': item.get('usagePurpose', ''),
+            'category': item.get('category', ''),
+            'tags': tags_list,
+            'featured': item.get('featured', False),
+            'image': item.get('logoImage', '')
+        }
+        if resource['slug'] and resource['title']:
+            formatted.append(resource)
+    return json.loads(json.dumps(formatted, default=decimal_default))
+
+
+def legacy_detail(deserializer, wire_item, parse_learning_resources):
+    """The get_resource formatting as it was before resource_model"""
+    item = {name: deserializer.deserialize(value) for name, value in wire_item.items()}
+    return {
+        'slug': item.get('resourceSlug', ''),
+        'title': item.get('resourceName', ''),
+        'name': item.get('resourceName', ''),
+        'url': item.get('resourceUrl', ''),
+        'description': item.get('usagePurpose', ''),
+        'category': item.get('category', ''),
+        'tags': item.get('tags', '').split(',') if item.get('tags') else [],
+        'featured': item.get('featured', False),
+        'image': item.get('logoImage', ''),
+        'keyFeatures': item.get('keyFeatures', '').split('|') if item.get('keyFeatures') else [],
+        'useCases': item.get('useCases', '').split('|') if item.get('useCases') else [],
+        'learningResources': parse_learning_resources(item.get('learningResources', '')),
+        'submittedAt': item.get('submittedAt', ''),
+        'approvedAt': item.get('approvedAt', ''),
+        'viewCount': int(item.get('viewCount', 0))
+    }
+
+
+def per_item_us(function, items, number):
+    seconds = min(timeit.repeat(function, number=number, repeat=5))
+    return seconds / (number * len(items)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark DynamoDB item decoding into API views')
+    parser.add_argument('-n', type=int, default=5000, help='passes over the seed items per timing (default: 5000)')
+    args = parser.parse_args()
+
+    from boto3.dynamodb.types import TypeDeserializer
+    from app.resource_model import Resource, parse_learning_resources
+
+    deserializer = TypeDeserializer()
+    items = load_seed_items()
+    if not items:
+        print('No seed items found')
+        return 1
+
+    # Same output (tags in the detail view are now trimmed like everywhere else)
+    same_summary = legacy_summary(deserializer, items) == [Resource.from_wire(item).summary() for item in items]
+    same_detail = all(
+        {**legacy_detail(deserializer, item, parse_learning_resources), 'tags': None}
+        == {**Resource.from_wire(item).detail(), 'tags': None}
+        for item in items
+    )
+    print(f"[{'OK' if same_summary else 'FAIL'}] summary view matches the previous listing output")
+    print(f"[{'OK' if same_detail else 'FAIL'}] detail view matches the previous get_resource output")
+
+    timings = [
+        ('listing, previous (deserialize + dict + JSON round trip)',
+         lambda: legacy_summary(deserializer, items)),
+        ('listing, Resource.from_wire + summary()',
+         lambda: [Resource.from_wire(item).summary() for item in items]),
+        ('decode only, TypeDeserializer',
+         lambda: [{name: deserializer.deserialize(value) for name, value in item.items()} for item in items]),
+        ('decode only, Resource.from_wire',
+         lambda: [Resource.from_wire(item) for item in items]),
+        ('detail, previous (deserialize + dict)',
+         lambda: [legacy_detail(deserializer, item, parse_learning_resources) for item in items]),
+        ('detail, Resource.from_wire + detail()',
+         lambda: [Resource.from_wire(item).detail() for item in items]),
+        ('admin, Resource.from_wire + admin_detail()',
+         lambda: [Resource.from_wire(item).admin_detail() for item in items]),
+        ('admin, Resource.from_wire + submission_summary()',
+         lambda: [Resource.from_wire(item).submission_summary() for item in items]),
+    ]
+
+    number = max(1, args.n // 10)
+    print(f'Per-item cost over {len(items)} seed items ({number} passes, best of 5):')
+    for name, function in timings:
+        print(f'  {per_item_us(function, items, number):8.2f} us  {name}')
+    return 0 if same_summary and same_detail else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
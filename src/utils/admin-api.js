@@ -28,22 +28,38 @@ async function adminApiRequest(endpoint, data = {}) {
 }
 
 /**
- * Get all submitted resources awaiting approval
- * @returns {Promise<Array>} - Array of submitted resources
+ * Get one page of submitted resources awaiting approval (oldest first)
+ * Entries are summaries; load a resource's key features, use cases and
+ * learning resources with getResourceByName when it is opened.
+ * @param {object} options - Request options
+ * @param {number} options.batchSize - Resources per page (default: 25, max: 100)
+ * @param {string} options.pageToken - Token from the previous page (optional)
+ * @param {string} options.category - Only this category (optional)
+ * @param {string} options.createdAfter - Only resources created at or after this ISO timestamp (optional)
+ * @param {string} options.createdBefore - Only resources created at or before this ISO timestamp (optional)
+ * @returns {Promise<object>} - { resources, pagination }
  */
-export async function getSubmittedResources() {
+export async function getSubmittedResources(options = {}) {
   try {
-    const response = await adminApiRequest('/admin/submitted-resources', {
-      resourceStatus: 'pending'
-    });
+    const { batchSize = 25, pageToken = null, category = null, createdAfter = null, createdBefore = null } = options;
+    const requestBody = { resourceStatus: 'pending', batchSize };
+    if (pageToken) requestBody.pageToken = pageToken;
+    if (category) requestBody.category = category;
+    if (createdAfter) requestBody.createdAfter = createdAfter;
+    if (createdBefore) requestBody.createdBefore = createdBefore;
+
+    const response = await adminApiRequest('/admin/submitted-resources', requestBody);
     
     // Extract the data array from the API response
     if (response && response.success && Array.isArray(response.data)) {
-      return response.data;
+      return {
+        resources: response.data,
+        pagination: response.pagination || { hasMore: false, nextPageToken: null }
+      };
     }
     
-    // If response structure is unexpected, return empty array
-    return [];
+    // If response structure is unexpected, return an empty page
+    return { resources: [], pagination: { hasMore: false, nextPageToken: null } };
   } catch (error) {
     console.error('Error fetching submitted resources:', error);
     throw error;
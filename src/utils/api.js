@@ -5,6 +5,12 @@ import { API_CONFIG, FEATURES, ENV } from './config.js';
 
 const API_BASE_URL = API_CONFIG.BASE_URL;
 
+// Endpoints that answer If-None-Match with 304 Not Modified
+const CONDITIONAL_ENDPOINTS = ['/resources', '/get-resource', '/search', '/autocomplete'];
+
+// Last response per conditional request (endpoint + body), revalidated by ETag
+const etagCache = new Map();
+
 /**
  * Generic API request function
  * @param {string} endpoint - API endpoint
@@ -39,9 +45,20 @@ async function apiRequest(endpoint, options = {}) {
     },
   };
 
+  // POST responses aren't kept by the browser cache, so revalidate ours explicitly
+  const cacheKey = CONDITIONAL_ENDPOINTS.includes(endpoint) ? `${endpoint}|${config.body || ''}` : null;
+  const cached = cacheKey ? etagCache.get(cacheKey) : null;
+  if (cached) {
+    config.headers['If-None-Match'] = cached.etag;
+  }
+
   try {
     const response = await fetch(url, config);
     
+    if (response.status === 304 && cached) {
+      return cached.data;
+    }
+
     if (!response.ok) {
       const errorText = await response.text();
       if (FEATURES.ENABLE_DEBUG_LOGGING) {
@@ -56,6 +73,12 @@ async function apiRequest(endpoint, options = {}) {
     }
 
     const data = await response.json();
+
+    const etag = cacheKey ? response.headers.get('ETag') : null;
+    if (etag) {
+      etagCache.set(cacheKey, { etag, data });
+    }
+
     return data;
   } catch (error) {
     if (FEATURES.ENABLE_DEBUG_LOGGING) {
@@ -112,6 +135,102 @@ export async function getExistingResources(options = {}) {
   throw new Error('API is disabled. Please enable API access to load resources.');
 }
 
+/**
+ * Get approved resources matching several filters, with facet counts
+ * @param {object} options - Request options
+ * @param {object} options.filters - { categories: [], tags: [], tagMode: 'all' | 'any', featured: true | false | null }
+ * @param {number} options.batchSize - Number of resources per batch (default: 10, max: 50)
+ * @param {string} options.pageToken - Token for pagination (optional)
+ * @returns {Promise<object>} - { resources, pagination, facets } where facets holds
+ *   total plus counts per category, tag and featured value
+ */
+export async function getFilteredResources(options = {}) {
+  const { filters = {}, batchSize = 10, pageToken = null } = options;
+
+  if (!API_CONFIG.USE_API) {
+    throw new Error('API is disabled. Please enable API access to load resources.');
+  }
+
+  const requestBody = {
+    batchSize: Math.min(batchSize, 50), // Enforce max batch size
+    filters
+  };
+  if (pageToken) {
+    requestBody.pageToken = pageToken;
+  }
+
+  const response = await apiRequest('/resources', {
+    method: 'POST',
+    body: JSON.stringify(requestBody)
+  });
+
+  if (response.success && response.data) {
+    return {
+      resources: response.data.resources || [],
+      pagination: response.data.pagination || {},
+      facets: response.data.facets || {}
+    };
+  }
+  throw new Error(response.message || 'Failed to fetch resources');
+}
+
+/**
+ * Full-text search over every approved resource (ranked, best match first)
+ * @param {string} query - Search text
+ * @param {object} options - Request options
+ * @param {number} options.batchSize - Number of results per page (default: 10, max: 50)
+ * @param {string} options.pageToken - Token for the next page of results (optional)
+ * @returns {Promise<object>} - { resources, pagination, total } where each resource carries a score
+ */
+export async function searchResources(query, options = {}) {
+  const { batchSize = 10, pageToken = null } = options;
+
+  if (!API_CONFIG.USE_API) {
+    throw new Error('API is disabled. Please enable API access to search resources.');
+  }
+
+  const requestBody = { query, batchSize: Math.min(batchSize, 50) };
+  if (pageToken) {
+    requestBody.pageToken = pageToken;
+  }
+
+  const response = await apiRequest('/search', {
+    method: 'POST',
+    body: JSON.stringify(requestBody)
+  });
+
+  if (response.success && response.data) {
+    return {
+      resources: response.data.resources || [],
+      pagination: response.data.pagination || {},
+      total: response.data.total || 0
+    };
+  }
+  throw new Error(response.message || 'Search failed');
+}
+
+/**
+ * Type-ahead suggestions for the search box (resource names, tags and categories)
+ * @param {string} query - Text typed so far
+ * @param {number} limit - Maximum number of suggestions (default: 8, max: 20)
+ * @returns {Promise<Array>} - Suggestions { text, type: 'resource' | 'tag' | 'category', slug?, weight }, most popular first
+ */
+export async function getAutocompleteSuggestions(query, limit = 8) {
+  if (!API_CONFIG.USE_API) {
+    return [];
+  }
+
+  const response = await apiRequest('/autocomplete', {
+    method: 'POST',
+    body: JSON.stringify({ query, limit: Math.min(limit, 20) })
+  });
+
+  if (response.success && response.data) {
+    return response.data.suggestions || [];
+  }
+  throw new Error(response.message || 'Failed to get suggestions');
+}
+
 /**
  * Fetch resources with optional admin privileges (legacy function for admin use)
  * @param {object} filters - Optional filters (resourceStatus, category, etc.)
@@ -149,8 +268,7 @@ export async function getResources(filters = {}, authToken = null) {
   // For non-admin usage, always use API
   if (API_CONFIG.USE_API) {
     try {
-      const result = await getExistingResources({ batchSize: 100 });
-      return result.resources;
+      return await exportResources();
     } catch (error) {
       console.error('Failed to fetch resources from API:', error);
       throw error;
@@ -207,6 +325,75 @@ export async function getResourceDetails(slug) {
   throw new Error('API is disabled. Please enable API access to load resource details.');
 }
 
+/**
+ * Export every approved resource (used at build time for static pages and the sitemap)
+ * /export answers with gzip-compressed NDJSON, or a 303 to a temporary S3
+ * location for large catalogs, which fetch follows on its own.
+ * @returns {Promise<Array<object>>} - Resource details (same fields as /get-resource), newest first
+ */
+export async function exportResources() {
+  const response = await fetch(`${API_BASE_URL}/export`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      'X-Api-Key': API_CONFIG.API_KEY,
+    },
+    body: '{}'
+  });
+
+  if (!response.ok) {
+    throw new Error(`Export request failed: ${response.status} ${response.statusText}`);
+  }
+
+  // Without Content-Encoding the body is the .ndjson.gz file itself
+  const contentType = response.headers.get('Content-Type') || '';
+  const text = contentType.includes('application/gzip')
+    ? await new Response(response.body.pipeThrough(new DecompressionStream('gzip'))).text()
+    : await response.text();
+
+  return text.split('\n').filter((line) => line.trim()).map((line) => JSON.parse(line));
+}
+
+/**
+ * Run several public read requests in one round trip
+ * @param {Array<object>} requests - Items like { id, path: '/get-resource', body: { slug } } (max 25)
+ * @returns {Promise<Array<object>>} - One { id, status, etag, body } per request, in order
+ */
+export async function batchRequests(requests) {
+  if (!API_CONFIG.USE_API) {
+    throw new Error('API is disabled. Please enable API access to load resources.');
+  }
+
+  const response = await apiRequest('/batch', {
+    method: 'POST',
+    body: JSON.stringify({ requests })
+  });
+
+  if (response.success && response.data) {
+    return response.data.results || [];
+  }
+  throw new Error(response.message || 'Batch request failed');
+}
+
+/**
+ * Get details for several resources with a single /batch call
+ * @param {Array<string>} slugs - Resource slugs
+ * @returns {Promise<object>} - Resource details keyed by slug (missing resources are left out)
+ */
+export async function getResourceDetailsBatch(slugs) {
+  const results = await batchRequests(
+    slugs.map((slug) => ({ id: slug, path: '/get-resource', body: { slug } }))
+  );
+
+  const details = {};
+  for (const result of results) {
+    if (result.status === 200 && result.body && result.body.success) {
+      details[result.id] = result.body.data;
+    }
+  }
+  return details;
+}
+
 /**
  * Submit a new resource suggestion
  * @param {object} resourceData - Resource data to submit